@@ -0,0 +1,213 @@
+"""
+Shared, bounded executor for the TUI's short background jobs.
+
+The Explorer and the Editor used to start a raw thread for every piece of
+background work: one per probe completion (converted-output check), one per
+uncached DTS>AC3 badge row while drawing, one per editor open and one per donor
+alignment. Scrolling quickly through a large converted folder could start
+hundreds of concurrent ffprobes. All of these now go through one executor:
+
+- At most MAX_WORKERS jobs run at a time; the rest wait in a priority queue
+  (PRIORITY_INTERACTIVE before PRIORITY_VISIBLE before PRIORITY_BACKGROUND,
+  first come first served within a priority).
+- Jobs submitted with a key are de-duplicated while one with the same key is
+  queued or running; a duplicate with a more urgent priority promotes it.
+- Jobs carry an owner (usually the view that submitted them). Queued jobs of
+  an owner can be cancelled when the view is left for good; running jobs see
+  Job.cancelled and may stop early.
+- The queue is bounded (MAX_PENDING); on overflow the least urgent, newest job
+  is dropped.
+- stats() reports queue depth per priority and lifetime counters.
+
+Long-running work with its own worker pool (bulk donor analysis, conversions,
+the probe scanner) keeps its dedicated threads.
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Any, Callable, Hashable, Optional
+
+PRIORITY_INTERACTIVE = 0  # the user is waiting for it (editor init, donor alignment)
+PRIORITY_VISIBLE = 1      # affects rows on screen (badges)
+PRIORITY_BACKGROUND = 2   # nice to have (converted-output checks)
+
+MAX_WORKERS = 4
+MAX_PENDING = 2048
+
+
+class Job:
+    """One submitted call. cancelled may be polled by long-running functions."""
+
+    __slots__ = ("fn", "args", "kwargs", "priority", "key", "owner", "seq", "cancelled", "running")
+
+    def __init__(self, fn, args, kwargs, priority, key, owner, seq):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.owner = owner
+        self.seq = seq
+        self.cancelled = False
+        self.running = False
+
+
+class BackgroundExecutor:
+    """Priority queue served by a bounded pool of daemon threads (started on demand)."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS, max_pending: int = MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._cond = threading.Condition()
+        self._heap: list[tuple[int, int, Job]] = []  # (priority, seq, job); stale entries skipped
+        self._by_key: dict[Hashable, Job] = {}        # queued or running jobs with a key
+        self._pending = 0                             # live (not cancelled, not started) jobs in _heap
+        self._active: set[Job] = set()                # running jobs
+        self._seq = itertools.count()
+        self._workers: list[threading.Thread] = []
+        self._idle = 0
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0,
+                         "deduplicated": 0, "dropped": 0}
+        self.peak_pending = 0
+
+    def submit(self, fn: Callable[..., Any], *args, priority: int = PRIORITY_BACKGROUND,
+               key: Optional[Hashable] = None, owner: Any = None, **kwargs) -> Optional[Job]:
+        """
+        Queue fn(*args, **kwargs). Returns the Job, the already queued or running
+        job with the same key, or None when the queue was full of more urgent work.
+        """
+        with self._cond:
+            if key is not None:
+                existing = self._by_key.get(key)
+                if existing is not None and not existing.cancelled:
+                    self.counters["deduplicated"] += 1
+                    if priority < existing.priority and not existing.running:
+                        existing.priority = priority
+                        heapq.heappush(self._heap, (priority, existing.seq, existing))
+                    return existing
+
+            job = Job(fn, args, kwargs, priority, key, owner, next(self._seq))
+            if self._pending >= self.max_pending and not self._drop_one(job):
+                self.counters["dropped"] += 1
+                return None
+            heapq.heappush(self._heap, (priority, job.seq, job))
+            if key is not None:
+                self._by_key[key] = job
+            self._pending += 1
+            self.peak_pending = max(self.peak_pending, self._pending)
+            self.counters["submitted"] += 1
+
+            if self._idle == 0 and len(self._workers) < self.max_workers:
+                t = threading.Thread(target=self._worker, name=f"trackremux-bg-{len(self._workers)}", daemon=True)
+                self._workers.append(t)
+                t.start()
+            self._cond.notify()
+            return job
+
+    def _drop_one(self, incoming: Job) -> bool:
+        """Make room for incoming by dropping the least urgent, newest queued job (caller holds the lock)."""
+        victim = None
+        for prio, seq, job in self._heap:
+            if job.cancelled or job.running or prio != job.priority:
+                continue
+            if victim is None or (prio, seq) > (victim.priority, victim.seq):
+                victim = job
+        # incoming is the newest job, so it loses every tie in priority
+        if victim is None or victim.priority <= incoming.priority:
+            return False
+        self._discard(victim)
+        self.counters["dropped"] += 1
+        return True
+
+    def _discard(self, job: Job) -> None:
+        """Mark a queued job cancelled (caller holds the lock); its heap entry is skipped later."""
+        job.cancelled = True
+        self._pending -= 1
+        if job.key is not None and self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+
+    def cancel(self, owner: Any) -> int:
+        """Cancel every job of owner. Queued ones never run; running ones see Job.cancelled. Returns the count."""
+        return self._cancel_where(lambda job: job.owner is owner)
+
+    def cancel_except(self, owners) -> int:
+        """Cancel the jobs of every owner not in owners (jobs without an owner are kept)."""
+        keep = {id(o) for o in owners}
+        return self._cancel_where(lambda job: job.owner is not None and id(job.owner) not in keep)
+
+    def _cancel_where(self, predicate: Callable[[Job], bool]) -> int:
+        count = 0
+        with self._cond:
+            seen = set()
+            for _, _, job in self._heap:
+                if job.cancelled or job.running or id(job) in seen or not predicate(job):
+                    continue
+                seen.add(id(job))
+                self._discard(job)
+                count += 1
+            for job in self._active:
+                if not job.cancelled and predicate(job):
+                    job.cancelled = True
+                    count += 1
+            self.counters["cancelled"] += count
+            # Drop the stale entries now instead of letting a large heap linger
+            if count:
+                self._heap = [e for e in self._heap if not e[2].cancelled]
+                heapq.heapify(self._heap)
+        return count
+
+    def _next_job(self) -> Job:
+        """Block until a live job is queued and take it (caller holds the lock)."""
+        while True:
+            while self._heap:
+                prio, _, job = heapq.heappop(self._heap)
+                # Skip cancelled jobs and the old entries of promoted ones
+                if job.cancelled or job.running or prio != job.priority:
+                    continue
+                job.running = True
+                self._pending -= 1
+                return job
+            self._idle += 1
+            self._cond.wait()
+            self._idle -= 1
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                self._active.add(job)
+            ok = True
+            try:
+                job.fn(*job.args, **job.kwargs)
+            except Exception:
+                ok = False  # Background jobs must never take the UI down
+            with self._cond:
+                self._active.discard(job)
+                job.running = False
+                if job.key is not None and self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+                self.counters["completed" if ok else "failed"] += 1
+
+    def stats(self) -> dict:
+        """Queue depth per priority, running jobs, worker count and lifetime counters."""
+        with self._cond:
+            by_priority: dict[int, int] = {}
+            seen = set()
+            for prio, _, job in self._heap:
+                if job.cancelled or job.running or prio != job.priority or id(job) in seen:
+                    continue
+                seen.add(id(job))
+                by_priority[prio] = by_priority.get(prio, 0) + 1
+            return {
+                "pending": self._pending,
+                "pending_by_priority": by_priority,
+                "running": len(self._active),
+                "workers": len(self._workers),
+                "peak_pending": self.peak_pending,
+                **self.counters,
+            }
+
+
+# Shared instance: one bounded pool for all views
+background = BackgroundExecutor()
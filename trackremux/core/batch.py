@@ -1,7 +1,7 @@
 import re
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from .models import MediaFile
 
@@ -47,6 +47,24 @@ class BatchDetector:
         re.compile(r"(.*?)[ ._-]+(\d{2})(?:[ ._\[v]|Dir|$)", re.IGNORECASE),  # Name 02
     ]
 
+    @classmethod
+    def episode_key(cls, filename: str) -> Optional[Tuple[int, int]]:
+        """
+        (season, episode) parsed from a file name with the series PATTERNS.
+        Season is 0 when the name carries only an episode number (Ep01, anime style).
+        """
+        for pat_idx, pat in enumerate(cls.PATTERNS):
+            m = pat.search(filename)
+            if not m:
+                continue
+            try:
+                if pat_idx <= 1:
+                    return int(m.group(2)), int(m.group(3))
+                return 0, int(m.group(2))
+            except (IndexError, ValueError):
+                return None
+        return None
+
     @staticmethod
     def get_fingerprint(media: MediaFile) -> str:
         """
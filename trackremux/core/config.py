@@ -31,6 +31,18 @@ class AppConfig:
     discard_commentaries: bool = False
     discard_descriptions: bool = False
     discard_sdh: bool = False
+    # Queue stall watchdog: seconds without progress before ffmpeg is killed (0 = off)
+    stall_timeout: int = 600
+    # Stalls tolerated per task before it is marked failed
+    stall_max_retries: int = 3
+    # Donor deep analysis: stop once a candidate reaches this sync confidence (0 = always exhaustive)
+    donor_stop_confidence: float = 0.85
+    # Parallel donor alignment processes (0 = auto)
+    donor_workers: int = 0
+    # Fingerprint the main audio track of every scanned file in the background (donor pre-filter)
+    fingerprint_library: bool = True
+    # Measure per-stream sizes from packets when scanning (full scan of small files, sampled otherwise)
+    measure_bitrates: bool = False
 
     # ------------------------------------------------------------------ #
     # Persistence                                                          #
@@ -57,6 +69,12 @@ class AppConfig:
             f"discard_commentaries = {str(self.discard_commentaries).lower()}\n",
             f"discard_descriptions = {str(self.discard_descriptions).lower()}\n",
             f"discard_sdh = {str(self.discard_sdh).lower()}\n",
+            f"stall_timeout = {self.stall_timeout}\n",
+            f"stall_max_retries = {self.stall_max_retries}\n",
+            f"donor_stop_confidence = {self.donor_stop_confidence}\n",
+            f"donor_workers = {self.donor_workers}\n",
+            f"fingerprint_library = {str(self.fingerprint_library).lower()}\n",
+            f"measure_bitrates = {str(self.measure_bitrates).lower()}\n",
         ]
         with open(CONFIG_PATH, "w", encoding="utf-8") as fh:
             fh.writelines(lines)
@@ -173,6 +191,18 @@ class AppConfig:
                     cfg.discard_descriptions = val.lower() == "true"
                 elif key == "discard_sdh":
                     cfg.discard_sdh = val.lower() == "true"
+                elif key == "stall_timeout":
+                    cfg.stall_timeout = _parse_int(val, cfg.stall_timeout)
+                elif key == "stall_max_retries":
+                    cfg.stall_max_retries = _parse_int(val, cfg.stall_max_retries)
+                elif key == "donor_stop_confidence":
+                    cfg.donor_stop_confidence = _parse_float(val, cfg.donor_stop_confidence)
+                elif key == "donor_workers":
+                    cfg.donor_workers = _parse_int(val, cfg.donor_workers)
+                elif key == "fingerprint_library":
+                    cfg.fingerprint_library = val.lower() == "true"
+                elif key == "measure_bitrates":
+                    cfg.measure_bitrates = val.lower() == "true"
         return cfg
 
 
@@ -192,6 +222,22 @@ def _parse_string_list(val: str) -> List[str]:
     return result
 
 
+def _parse_int(val: str, default: int) -> int:
+    """Parse a TOML integer, keeping the default on malformed input."""
+    try:
+        return int(val.split("#")[0].strip())
+    except ValueError:
+        return default
+
+
+def _parse_float(val: str, default: float) -> float:
+    """Parse a TOML float, keeping the default on malformed input."""
+    try:
+        return float(val.split("#")[0].strip())
+    except ValueError:
+        return default
+
+
 def _fmt_list(lst: List[str]) -> str:
     """Format a Python list as a TOML inline array."""
     inner = ", ".join(f'"{s}"' for s in lst)
@@ -1,7 +1,7 @@
 import os
 import re
-import subprocess
 
+from .ffmpeg_progress import FFmpegProcess, ProgressTracker
 from .models import MediaFile
 
 
@@ -67,7 +67,7 @@ class MediaConverter:
     @staticmethod
     def build_ffmpeg_command(
         media_file: MediaFile, output_path: str, convert_audio: bool = False,
-        codec_overrides: dict = None
+        codec_overrides: dict = None, start_time: float = 0.0
     ) -> list:
         """
         Builds the ffmpeg command to keep only enabled tracks and set languages.
@@ -76,24 +76,29 @@ class MediaConverter:
                          get_audio_fallback_chain(), e.g. {0: {"codec": "eac3", ...}}.
                          When None, the first (preferred) entry from the chain is used.
         convert_audio: when True, DTS audio tracks get transcoded per the fallback chain.
+        start_time: source position (seconds) the output should begin at. Used to
+                    resume segmented jobs; every input is seeked so that donor
+                    offsets stay intact.
+        Donor audio tracks with a tempo_ratio other than 1.0 are retimed with atempo
+        (which means they are transcoded, per the same fallback chain as HD audio).
         """
         # 1. Identify all unique source files and their offsets.
         # The main file is always index 0 with offset 0.
-        # input_files: list of (path, offset_seconds)
-        input_files: list[tuple[str, float]] = [(media_file.path, 0.0)]
+        # input_files: list of (path, offset_seconds, tempo_ratio)
+        input_files: list[tuple[str, float, float]] = [(media_file.path, 0.0, 1.0)]
 
         # Helper to get or register input index for a path + offset.
-        def get_input_index(path, offset: float = 0.0):
+        def get_input_index(path, offset: float = 0.0, tempo: float = 1.0):
             if path is None or path == media_file.path:
                 return 0
             # Reuse existing entry if same path (take max offset seen for it).
-            for idx, (p, _o) in enumerate(input_files):
+            for idx, (p, _o, _t) in enumerate(input_files):
                 if p == path:
                     # Update offset to max, so a track's offset wins.
                     if abs(offset) > abs(_o):
-                        input_files[idx] = (path, offset)
+                        input_files[idx] = (path, offset, tempo)
                     return idx
-            input_files.append((path, offset))
+            input_files.append((path, offset, tempo))
             return len(input_files) - 1
 
         # 2. Build inputs part of the command.
@@ -101,9 +106,17 @@ class MediaConverter:
         # Pre-scan enabled tracks to register all necessary inputs.
         for track in media_file.tracks:
             if track.enabled and track.source_path:
-                get_input_index(track.source_path, track.offset_seconds)
-
-        for path, offset in input_files:
+                get_input_index(track.source_path, track.offset_seconds, track.tempo_ratio)
+
+        for path, offset, tempo in input_files:
+            if start_time > 0:
+                # Output t=0 must map to source t=start_time. Seek each input as far as
+                # its own offset allows and keep the remainder as -itsoffset.
+                # A retimed donor covers `tempo` output seconds per input second.
+                seek = max(0.0, (start_time - offset) / tempo)
+                offset = offset - start_time + seek * tempo
+                if seek > 0.001:
+                    cmd.extend(["-ss", f"{seek:.6f}"])
             if abs(offset) > 0.001:
                 cmd.extend(["-itsoffset", f"{offset:.6f}"])
             cmd.extend(["-i", path])
@@ -116,13 +129,14 @@ class MediaConverter:
 
         # Track which audio output indices need transcoding
         dts_audio_indices: list = []  # output audio indices that are DTS
+        tempo_audio_indices: list = []  # output audio indices retimed with atempo
 
         for track in media_file.tracks:
             if not track.enabled:
                 continue
 
             # Determine input index and stream index
-            input_idx = get_input_index(track.source_path, track.offset_seconds)
+            input_idx = get_input_index(track.source_path, track.offset_seconds, track.tempo_ratio)
 
             # Construct map: input_idx:stream_idx
             cmd.extend(["-map", f"{input_idx}:{track.index}"])
@@ -152,6 +166,9 @@ class MediaConverter:
                             names = {"jpn": "Japanese", "rus": "Russian", "eng": "English"}
                             title = names.get(track.language, lang_label)
 
+                if track.tempo_ratio != 1.0:
+                    tempo_audio_indices.append((audio_idx, track))
+
                 # Handling DTS to AC3 conversion metadata
                 if convert_audio and track.codec_name.lower() in MediaConverter.HD_CODECS:
                     dts_audio_indices.append((audio_idx, track))
@@ -227,6 +244,22 @@ class MediaConverter:
                 )
                 cmd.extend([f"-metadata:s:a:{a_idx}", f"title={new_title}"])
 
+        # 5. Tempo correction of donor tracks (e.g. PAL speed-up); filtering requires a re-encode
+        transcoded = {a_idx for a_idx, _ in dts_audio_indices}
+        for a_idx, track in tempo_audio_indices:
+            cmd.extend([f"-filter:a:{a_idx}", f"atempo={1.0 / track.tempo_ratio:.6f}"])
+            if a_idx in transcoded:
+                continue
+            if codec_overrides and a_idx in codec_overrides:
+                attempt = codec_overrides[a_idx]
+            else:
+                attempt = MediaConverter.get_audio_fallback_chain(track)[0]
+            cmd.extend([f"-c:a:{a_idx}", attempt["codec"]])
+            if attempt.get("bitrate"):
+                cmd.extend([f"-b:a:{a_idx}", attempt["bitrate"]])
+            if attempt.get("ac"):
+                cmd.extend([f"-ac:a:{a_idx}", str(attempt["ac"])])
+
         cmd.append(output_path)
 
         return cmd
@@ -274,33 +307,97 @@ class MediaConverter:
 
         return max(0, total_size + size_diff)
 
+    @staticmethod
+    def build_segmented_command(
+        media_file: MediaFile, segment_dir: str, convert_audio: bool = False,
+        codec_overrides: dict = None, start_time: float = 0.0, start_number: int = 0
+    ) -> list:
+        """
+        Same as build_ffmpeg_command, but writes checkpointed time segments into
+        segment_dir via the segment muxer instead of a single output file.
+        Completed segments are listed in a per-run CSV (see core.segments).
+        """
+        from .segments import SEGMENT_PATTERN, SEGMENT_SECONDS, segment_list_path
+
+        cmd = MediaConverter.build_ffmpeg_command(
+            media_file, "", convert_audio=convert_audio,
+            codec_overrides=codec_overrides, start_time=start_time
+        )
+        cmd.pop()  # drop the placeholder output path
+        cmd.extend([
+            "-f", "segment",
+            "-segment_time", str(SEGMENT_SECONDS),
+            "-segment_format", "matroska",
+            "-reset_timestamps", "1",
+            "-segment_start_number", str(start_number),
+            "-segment_list", segment_list_path(segment_dir, start_number),
+            "-segment_list_type", "csv",
+            os.path.join(segment_dir, SEGMENT_PATTERN),
+        ])
+        return cmd
+
+    @staticmethod
+    def convert_segmented(
+        media_file: MediaFile, segment_dir: str, convert_audio: bool = False,
+        codec_overrides: dict = None, start_time: float = 0.0, start_number: int = 0,
+        tracker: ProgressTracker = None, on_log=None
+    ) -> FFmpegProcess:
+        """
+        Executes a segmented conversion (see build_segmented_command).
+        Returns the FFmpegProcess so it can be managed; see convert for tracker/on_log.
+        """
+        cmd = MediaConverter.build_segmented_command(
+            media_file, segment_dir, convert_audio=convert_audio,
+            codec_overrides=codec_overrides, start_time=start_time,
+            start_number=start_number
+        )
+        return FFmpegProcess(
+            cmd,
+            tracker or MediaConverter.progress_tracker(media_file, convert_audio),
+            on_log=on_log,
+        )
+
     @staticmethod
     def convert(
         media_file: MediaFile, output_path: str, convert_audio: bool = False,
-        codec_overrides: dict = None, progress_callback=None
-    ):
+        codec_overrides: dict = None, tracker: ProgressTracker = None, on_log=None
+    ) -> FFmpegProcess:
         """
-        Executes the conversion. Returns the process object so it can be managed.
+        Executes the conversion. Returns the FFmpegProcess so it can be managed
+        and its progress events consumed.
         codec_overrides: see build_ffmpeg_command.
+        tracker: progress tracker to use; defaults to one sized for media_file.
+        on_log: optional callback receiving each ffmpeg log line.
         """
         cmd = MediaConverter.build_ffmpeg_command(
             media_file, output_path, convert_audio=convert_audio,
             codec_overrides=codec_overrides
         )
-        cmd.insert(1, "-progress")
-        cmd.insert(2, "-")
 
         # Overwrite output if exists
         if os.path.exists(output_path):
             os.remove(output_path)
 
-        process = subprocess.Popen(
+        return FFmpegProcess(
             cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            errors="replace",
-            bufsize=1,  # Line buffered
+            tracker or MediaConverter.progress_tracker(media_file, convert_audio),
+            on_log=on_log,
         )
-        return process
 
+    @staticmethod
+    def progress_tracker(
+        media_file: MediaFile, convert_audio: bool = False,
+        base_time: float = 0.0, base_size: int = 0
+    ) -> ProgressTracker:
+        """Progress tracker sized for a full conversion of media_file."""
+        total_frames = 0
+        for track in media_file.tracks:
+            if track.codec_type == "video" and track.nb_frames:
+                total_frames = max(total_frames, track.nb_frames)
+        return ProgressTracker(
+            duration=media_file.duration,
+            total_frames=total_frames,
+            estimated_size=MediaConverter.estimate_output_size(media_file, convert_audio),
+            base_time=base_time,
+            base_size=base_size,
+        )
@@ -0,0 +1,246 @@
+"""
+In-memory directory snapshots for existence and size lookups.
+
+Opening a folder used to cost one scandir, then a getsize per file, then four
+exists() calls per file to find converted outputs, plus more exists() calls in
+the editor. On an SMB mount every one of those is a network round trip. A
+snapshot instead records the names and types of one directory (scandir reports
+both without a per-file stat), and lookups are answered from memory:
+
+- exists(path) / first_existing(paths) look the name up in the snapshot of the
+  parent directory (taken on first use).
+- size(path) stats the file the first time it is asked for and keeps the
+  result in the snapshot, so a sidecar search over many files stats none of
+  them.
+- A snapshot is kept while the directory's mtime is unchanged. Creating,
+  renaming or deleting an entry changes it; the mtime is re-checked (one stat
+  of the directory) at most every REVALIDATE_SECS per directory.
+- A snapshot taken within RACY_SECS of the directory's mtime is not trusted on
+  revalidation, since a change in the same timestamp tick would go unnoticed.
+- invalidate() drops snapshots after the app itself wrote to a directory.
+- stream() hands out a listing in chunks while scandir is still reading it
+  (huge folders show their first rows at once) and caches the result. Only the
+  names the caller asks sizes for are stat'ed during the pass.
+
+Sizes of files that grow in place (the directory mtime does not change) are
+only as fresh as the snapshot; callers that need the live size stat the file.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+REVALIDATE_SECS = 2.0
+RACY_SECS = 2.0
+FIRST_CHUNK = 64      # entries in the first chunk of a streamed listing (time to first row)
+CHUNK_SIZE = 1024
+
+# Extensions of external tracks the editor picks up next to a video
+SIDECAR_AUDIO_EXTS = (".ac3", ".mka", ".dts", ".eac3", ".wav", ".flac", ".mp3", ".aac")
+SIDECAR_SUB_EXTS = (".srt", ".ass", ".sub", ".txt", ".vtt")
+
+
+class DirEntry(NamedTuple):
+    is_dir: bool
+    size: Optional[int] = None     # None until the file was stat'ed
+    mtime: Optional[float] = None
+
+
+def _read_entry(entry: os.DirEntry, stat: bool = False) -> Optional[DirEntry]:
+    """
+    Type of a scandir entry, plus size and mtime when stat is set; None when it
+    vanished or is unreadable. The type comes from the directory listing itself.
+    """
+    try:
+        if entry.is_dir():
+            return DirEntry(True, 0, 0.0)
+        if not stat:
+            return DirEntry(False)
+        st = entry.stat()
+        return DirEntry(False, st.st_size, st.st_mtime)
+    except OSError:
+        return None
+
+
+class DirSnapshot:
+    """Listing of one directory as of one scandir pass."""
+
+    def __init__(self, path: str, mtime_ns: int, entries: dict):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.entries: dict[str, DirEntry] = entries
+        self.taken_at = time.time()
+        self.checked_at = time.monotonic()
+        self.files = frozenset(n for n, e in entries.items() if not e.is_dir)
+        self.dirs = frozenset(n for n, e in entries.items() if e.is_dir)
+        self.sidecars = frozenset(
+            n for n in self.files if n.lower().endswith(SIDECAR_AUDIO_EXTS + SIDECAR_SUB_EXTS)
+        )
+
+    @classmethod
+    def scan(cls, path: str) -> Optional["DirSnapshot"]:
+        """One scandir pass over path; None when it cannot be listed."""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            entries = {}
+            with os.scandir(path) as it:
+                for entry in it:
+                    info = _read_entry(entry)
+                    if info is not None:
+                        entries[entry.name] = info
+        except OSError:
+            return None
+        return cls(path, mtime_ns, entries)
+
+    @property
+    def racy(self) -> bool:
+        return self.taken_at - self.mtime_ns / 1e9 < RACY_SECS
+
+    def stat(self, name: str) -> Optional[DirEntry]:
+        """Entry of name with its size filled in (one stat on first request); None when absent."""
+        entry = self.entries.get(name)
+        if entry is None or entry.size is not None:
+            return entry
+        try:
+            st = os.stat(os.path.join(self.path, name))
+        except OSError:
+            return entry
+        entry = DirEntry(False, st.st_size, st.st_mtime)
+        self.entries[name] = entry  # replaces a value only, safe next to readers
+        return entry
+
+
+class DirSnapshotCache:
+    """Snapshots by absolute directory path, revalidated against the directory mtime."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: dict[str, DirSnapshot] = {}
+        self._missing: dict[str, float] = {}  # directories that did not exist -> monotonic check time
+
+    def get(self, directory: str) -> Optional[DirSnapshot]:
+        """Snapshot of directory (taken or refreshed as needed); None when it does not exist."""
+        directory = os.path.abspath(directory)
+        now = time.monotonic()
+        with self._lock:
+            snap = self._snapshots.get(directory)
+            missing_at = self._missing.get(directory)
+        if snap is not None and now - snap.checked_at < REVALIDATE_SECS:
+            return snap
+        if missing_at is not None and now - missing_at < REVALIDATE_SECS:
+            return None
+        if snap is not None and self._unchanged(directory, snap):
+            return snap
+
+        snap = DirSnapshot.scan(directory)
+        self._store(directory, snap)
+        return snap
+
+    @staticmethod
+    def _unchanged(directory: str, snap: DirSnapshot) -> bool:
+        """Revalidate snap against the directory mtime (one stat)."""
+        if snap.racy:
+            return False
+        try:
+            unchanged = os.stat(directory).st_mtime_ns == snap.mtime_ns
+        except OSError:
+            return False
+        if unchanged:
+            snap.checked_at = time.monotonic()
+        return unchanged
+
+    def _store(self, directory: str, snap: Optional[DirSnapshot]) -> None:
+        with self._lock:
+            if snap is None:
+                self._snapshots.pop(directory, None)
+                self._missing[directory] = time.monotonic()
+            else:
+                self._snapshots[directory] = snap
+                self._missing.pop(directory, None)
+
+    def stream(self, directory: str, sized: Optional[Callable[[str], bool]] = None) -> Iterator[list]:
+        """
+        Entries of directory as [(name, DirEntry), ...] chunks: FIRST_CHUNK entries,
+        then CHUNK_SIZE at a time, yielded while scandir is still reading. Files whose
+        name passes sized come with their size; other entries carry only their type.
+        The complete listing becomes the directory's snapshot; a valid snapshot is
+        streamed from memory.
+        """
+        directory = os.path.abspath(directory)
+        with self._lock:
+            snap = self._snapshots.get(directory)
+        if snap is not None and (time.monotonic() - snap.checked_at < REVALIDATE_SECS
+                                 or self._unchanged(directory, snap)):
+            items = list(snap.entries.items())
+            if sized is not None:
+                items = [
+                    (name, (snap.stat(name) or entry) if entry.size is None and sized(name) else entry)
+                    for name, entry in items
+                ]
+            yield items[:FIRST_CHUNK]
+            for i in range(FIRST_CHUNK, len(items), CHUNK_SIZE):
+                yield items[i:i + CHUNK_SIZE]
+            return
+
+        entries = {}
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            chunk, limit = [], FIRST_CHUNK
+            with os.scandir(directory) as it:
+                for entry in it:
+                    info = _read_entry(entry, sized is not None and sized(entry.name))
+                    if info is None:
+                        continue
+                    entries[entry.name] = info
+                    chunk.append((entry.name, info))
+                    if len(chunk) >= limit:
+                        yield chunk
+                        chunk, limit = [], CHUNK_SIZE
+            if chunk:
+                yield chunk
+        except OSError:
+            self._store(directory, None)
+            return
+        self._store(directory, DirSnapshot(directory, mtime_ns, entries))
+
+    def _entry(self, path: str) -> Optional[DirEntry]:
+        path = os.path.abspath(path)
+        snap = self.get(os.path.dirname(path))
+        return snap.entries.get(os.path.basename(path)) if snap else None
+
+    def exists(self, path: str) -> bool:
+        return self._entry(path) is not None
+
+    def isfile(self, path: str) -> bool:
+        entry = self._entry(path)
+        return entry is not None and not entry.is_dir
+
+    def size(self, path: str) -> Optional[int]:
+        """Size of a file, stat'ed once per snapshot; None when it does not exist."""
+        path = os.path.abspath(path)
+        snap = self.get(os.path.dirname(path))
+        entry = snap.stat(os.path.basename(path)) if snap else None
+        return entry.size if entry is not None and not entry.is_dir else None
+
+    def first_existing(self, paths: Iterable[str]) -> Optional[str]:
+        """The first of paths that exists as a file."""
+        for path in paths:
+            if self.isfile(path):
+                return path
+        return None
+
+    def invalidate(self, directory: Optional[str] = None) -> None:
+        """Forget the snapshot of directory (all snapshots when None)."""
+        with self._lock:
+            if directory is None:
+                self._snapshots.clear()
+                self._missing.clear()
+            else:
+                directory = os.path.abspath(directory)
+                self._snapshots.pop(directory, None)
+                self._missing.pop(directory, None)
+
+
+# Shared instance: the Explorer and the Editor look at the same directories
+dir_snapshots = DirSnapshotCache()
@@ -1,18 +1,39 @@
 """
 Donor Audio Track Support
 =========================
-DonorCache  — instantaneous lookup: files in the same library that are likely alternative
-              versions of the same film (matched by normalized title + ±2% duration).
-DonorAligner — computes the sync offset between two files using FFmpeg ebur128 loudness
-               envelopes and a pure-Python sliding MAE search. No extra dependencies.
+DonorCache  — instantaneous lookup: files in the library that are likely alternative
+              versions of the same film (±1.5% duration via a bisect index, ranked with
+              normalized title tokens and year); persisted across sessions.
+DonorAligner — computes the sync offset between two files using RMS loudness envelopes,
+               computed in-process from low-rate mono PCM that one ffmpeg pass decodes
+               for all audio streams of a file, and an FFT normalized cross-correlation
+               over all lags (NumPy).
+               Without NumPy it falls back to a pure-Python sliding MAE search.
+               align() samples short windows across the whole runtime (input seeking)
+               and fits offset + linear drift, so differing intros and PAL speed-up
+               are handled; drift becomes a tempo_ratio applied with atempo.
+               BulkDonorAnalysis aligns many candidates in parallel on a process pool.
+               Extracted envelopes are kept in a persistent on-disk cache, so repeat
+               searches over the same files skip decoding.
 """
 
 import os
 import re
-import re
-import subprocess
+from dataclasses import dataclass, field
 from typing import Optional
 
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python alignment fallback
+    np = None
+
+from .envelope_cache import EnvelopeCache
+from .history import _history_dir
+from .resources import reap, record_operation
+
+# Shared persistent cache of extracted envelopes (see envelope_cache.py)
+envelope_cache = EnvelopeCache()
+
 
 # ---------------------------------------------------------------------------
 # DonorCache
@@ -20,102 +41,425 @@ from typing import Optional
 
 class DonorCache:
     """
-    In-memory registry of all scanned files.
-    Populated by the Explorer as files are probed. Zero I/O on lookup.
+    Registry of all scanned files, indexed for instant donor lookup.
+    Populated by the Explorer as files are probed and persisted to
+    $XDG_DATA_HOME/trackremux/donors.json, so files probed in earlier sessions
+    or other directories are candidates too.
+
+    Indexes: a sorted (duration, path) list for bisect range queries, and an
+    inverted index of normalized title tokens and release year. Candidates within
+    ±1.5% duration are ranked by a combined duration / title / year score.
     """
 
-    def __init__(self):
-        # [(file_path, duration), ...]
-        self._registry: list[tuple[str, float]] = []
+    DURATION_TOLERANCE = 0.015  # ±1.5% (e.g. ~1.3 minutes on a 90 minute movie)
+    # Runtime ratios of the same cut at another frame rate: as-is, PAL speed-up, PAL slow-down
+    SPEED_FACTORS = (1.0, 23.976 / 25, 25 / 23.976)
+    SAVE_INTERVAL = 10.0        # seconds between throttled saves while registering
+
+    # Score weights: duration match, title token overlap (Jaccard), same year
+    W_DURATION = 0.5
+    W_TITLE = 0.4
+    W_YEAR = 0.1
+
+    def __init__(self, path: Optional[str] = None):
+        import threading
+
+        self.path = path if path is not None else os.path.join(_history_dir(), "donors.json")
+        self._lock = threading.Lock()
+        self._durations: dict[str, float] = {}
+        self._by_duration: list[tuple[float, str]] = []  # sorted
+        self._tokens: dict[str, set[str]] = {}           # token -> paths
+        self._file_tokens: dict[str, frozenset[str]] = {}
+        self._years: dict[str, Optional[int]] = {}
+        self._dirty = False
+        self._last_save = 0.0
+        self._load()
+
+    # ------------------------------------------------------------------ #
+    # Persistence                                                          #
+    # ------------------------------------------------------------------ #
+
+    def _load(self) -> None:
+        import json
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for path, duration in data.get("files", {}).items():
+            try:
+                self._add(path, float(duration))
+            except (TypeError, ValueError):
+                continue
+
+    def save(self) -> None:
+        """Write the registry to disk if it changed."""
+        import json
+        import time
+
+        with self._lock:
+            if not self._dirty:
+                return
+            files = dict(self._durations)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"files": files}, f)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass  # Never crash the UI over the donor index
+
+    # ------------------------------------------------------------------ #
+    # Index maintenance                                                    #
+    # ------------------------------------------------------------------ #
+
+    def _add(self, path: str, duration: float) -> None:
+        import bisect
+
+        bisect.insort(self._by_duration, (duration, path))
+        self._durations[path] = duration
+        tokens, year = _title_key(os.path.basename(path))
+        self._file_tokens[path] = tokens
+        self._years[path] = year
+        for tok in tokens:
+            self._tokens.setdefault(tok, set()).add(path)
+
+    def _remove(self, path: str) -> None:
+        import bisect
+
+        duration = self._durations.pop(path, None)
+        if duration is None:
+            return
+        i = bisect.bisect_left(self._by_duration, (duration, path))
+        if i < len(self._by_duration) and self._by_duration[i] == (duration, path):
+            del self._by_duration[i]
+        for tok in self._file_tokens.pop(path, ()):
+            postings = self._tokens.get(tok)
+            if postings is not None:
+                postings.discard(path)
+                if not postings:
+                    del self._tokens[tok]
+        self._years.pop(path, None)
 
     def register(self, path: str, duration: float) -> None:
-        """Called once per file as it is probed during the initial scan."""
-        # Avoid duplicates
-        if not any(p == path for p, _ in self._registry):
-            self._registry.append((path, duration))
+        """Called once per file as it is probed during the scan."""
+        import time
+
+        if duration <= 0:
+            return
+        path = os.path.abspath(path)
+        with self._lock:
+            if self._durations.get(path) == duration:
+                return
+            self._remove(path)
+            self._add(path, duration)
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= self.SAVE_INTERVAL
+        if due:
+            self.save()
+
+    # ------------------------------------------------------------------ #
+    # Lookup                                                               #
+    # ------------------------------------------------------------------ #
 
-    def get_donors(self, path: str, duration: float) -> list[tuple[str, float]]:
+    def duration_of(self, path: str) -> Optional[float]:
+        """Registered duration of a file, or None when it was never probed."""
+        with self._lock:
+            return self._durations.get(os.path.abspath(path))
+
+    def get_donors(self, path: str, duration: float) -> list[tuple[str, float, float]]:
         """
-        Returns a list of (donor_path, duration_match_pct) for ANY file in the 
-        entire library that is within ±1.5% of the given duration.
-        The query file itself is excluded.
+        Returns (donor_path, duration_match_pct, score) for every file in the library
+        within ±1.5% of the given duration (or of its PAL sped-up / slowed-down
+        equivalent), best combined score first.
+        The query file itself and files that no longer exist are excluded.
         """
+        import bisect
+
+        if duration <= 0:
+            return []
+        path = os.path.abspath(path)
+        tokens, year = _title_key(os.path.basename(path))
+
+        with self._lock:
+            # One bisect range query per speed factor; value = runtime ratio after undoing the speed change
+            in_range: dict[str, float] = {}
+            for factor in self.SPEED_FACTORS:
+                lo = duration * factor * (1.0 - self.DURATION_TOLERANCE)
+                hi = duration * factor * (1.0 + self.DURATION_TOLERANCE)
+                i = bisect.bisect_left(self._by_duration, (lo, ""))
+                j = bisect.bisect_right(self._by_duration, (hi, "\uffff"))
+                for d, p in self._by_duration[i:j]:
+                    if p != path and p not in in_range:
+                        in_range[p] = d / (duration * factor)
+            # Shared title tokens per candidate, counted through the inverted index
+            shared: dict[str, int] = {}
+            for tok in tokens:
+                for p in self._tokens.get(tok, ()):
+                    if p in in_range:
+                        shared[p] = shared.get(p, 0) + 1
+            candidates = [
+                (p, ratio, shared.get(p, 0), len(self._file_tokens.get(p, ())), self._years.get(p))
+                for p, ratio in in_range.items()
+            ]
+
         result = []
-        for candidate_path, candidate_dur in self._registry:
-            if candidate_path == path:
+        vanished = []
+        for cand_path, ratio, n_shared, n_tokens, cand_year in candidates:
+            if not os.path.exists(cand_path):
+                vanished.append(cand_path)
                 continue
-            if duration <= 0 or candidate_dur <= 0:
-                continue
-                
-            # Duration Match
-            ratio = candidate_dur / duration
-            
-            # ±1.5% tolerance (e.g., ~1.3 minutes on a 90 minute movie)
-            if 0.985 <= ratio <= 1.015:
-                match_pct = (1.0 - abs(1.0 - ratio)) * 100.0
-                result.append((candidate_path, round(match_pct, 1)))
-        
-        # Sort best match first
-        result.sort(key=lambda x: -x[1])
+            match_pct = (1.0 - abs(1.0 - ratio)) * 100.0
+            dur_score = 1.0 - abs(1.0 - ratio) / self.DURATION_TOLERANCE
+            union = len(tokens) + n_tokens - n_shared
+            title_score = n_shared / union if union else 0.0
+            year_score = 1.0 if year is not None and year == cand_year else 0.0
+            score = self.W_DURATION * dur_score + self.W_TITLE * title_score + self.W_YEAR * year_score
+            result.append((cand_path, round(match_pct, 1), round(score, 3)))
+
+        if vanished:
+            with self._lock:
+                for p in vanished:
+                    self._remove(p)
+                self._dirty = True
+
+        # Best match first
+        result.sort(key=lambda x: (-x[2], -x[1]))
         return result
 
 
+# Tokens that end the title part of a release name
+_RELEASE_TAGS = {
+    "480p", "576p", "720p", "1080p", "1080i", "2160p", "4k", "uhd", "hdr", "hdr10", "dv",
+    "bluray", "bdrip", "brrip", "bdremux", "remux", "webrip", "webdl", "web", "hdtv", "dvdrip",
+    "x264", "x265", "h264", "h265", "hevc", "avc", "xvid", "aac", "ac3", "dts", "truehd", "atmos",
+    "proper", "repack", "extended", "unrated", "directors", "imax", "multi", "dub",
+}
+_STOPWORDS = {"the", "a", "an", "and", "of", "le", "la", "les", "der", "die", "das"}
+_YEAR_RE = re.compile(r"^(19|20)\d\d$")
+
+
+def _title_key(filename: str) -> tuple[frozenset[str], Optional[int]]:
+    """Normalized title tokens and release year parsed from a file name."""
+    stem = os.path.splitext(filename)[0].lower()
+    tokens: set[str] = set()
+    year = None
+    for tok in re.split(r"[^\w]+|_", stem):
+        if not tok:
+            continue
+        if _YEAR_RE.match(tok):
+            if tokens:  # a leading number is part of the title ("1917", "2012")
+                year = int(tok)
+                break
+        if tok in _RELEASE_TAGS:
+            break
+        if tok not in _STOPWORDS:
+            tokens.add(tok)
+    return frozenset(tokens), year
+
+
+@dataclass
+class Alignment:
+    """
+    Result of DonorAligner.align(): target time = offset + tempo_ratio * donor time.
+    tempo_ratio != 1.0 means the donor runs at a different speed (e.g. PAL speed-up)
+    and has to be retimed with atempo.
+    """
+
+    offset: float
+    confidence: float
+    tempo_ratio: float = 1.0
+    windows: list = field(default_factory=list)  # [(donor_time, offset, confidence), ...]
+    inliers: int = 0
+
+    @property
+    def has_drift(self) -> bool:
+        return self.tempo_ratio != 1.0
+
+    @property
+    def drift_per_hour(self) -> float:
+        """Seconds of desync per hour the drift would cause without tempo correction."""
+        return (self.tempo_ratio - 1.0) * 3600.0
+
+
 # ---------------------------------------------------------------------------
 # DonorAligner
 # ---------------------------------------------------------------------------
 
 class DonorAligner:
     """
-    Compute the sync offset between two audio tracks using FFmpeg ebur128
-    loudness envelopes and a sliding MAE search.
+    Compute the sync offset between two audio tracks from their loudness
+    envelopes (FFT cross-correlation, or a sliding MAE search without NumPy).
     """
 
-    SAMPLE_HZ = 10       # ebur128 outputs ~10 values/second (100ms windows)
+    SAMPLE_HZ = 100      # envelope values per second (10 ms RMS windows)
+    PCM_RATE = 8000      # mono sample rate ffmpeg decodes to for envelope extraction
     PROBE_SECS = 120     # how many seconds to analyse
-    SEARCH_WINDOW = 15.0 # ± seconds to search
+    SEARCH_WINDOW = 15.0 # ± seconds to search (pure-Python fallback)
+    FFT_SEARCH_WINDOW = 300.0  # ± seconds to search with the FFT engine
+    MIN_OVERLAP_SECS = 10.0    # lags overlapping less than this are ignored
+    PEAK_EXCLUSION_SECS = 1.0  # ± seconds around the peak left out of the sidelobe stats
+
+    # Windowed alignment across the whole runtime (offset + linear drift)
+    WINDOW_COUNT = 4           # target windows sampled between 8% and 92% of the runtime
+    WINDOW_SECS = 15.0         # length of each target window
+    ANCHOR_MARGIN = 30.0       # ± seconds searched around the predicted position of the anchor window
+    ANCHOR_RETRY_MARGIN = 120.0  # wider second attempt when the anchor is not found (FFT engine only)
+    WINDOW_MARGIN = 6.0        # ± seconds searched for the remaining windows (placed from the anchor)
+    MIN_WINDOWED_DURATION = 600.0  # shorter files use the single start-of-file window
+    MIN_WINDOW_CONFIDENCE = 0.2    # windows below this are left out of the fit
+    ANCHOR_CONFIDENCE = 0.35       # the anchor has to be more certain: everything is placed from it
+    OUTLIER_SECS = 0.5         # windows off the fitted line by more than this are rejected
+    DRIFT_TOLERANCE = 0.0003   # |tempo - 1| below this is treated as no drift (~2 s over 2 h)
+    # Frame-rate conversions seen between releases: PAL speed-up, 24 vs 23.976
+    KNOWN_TEMPO_RATIOS = (25 / 23.976, 23.976 / 25, 25 / 24, 24 / 25, 24 / 23.976, 23.976 / 24)
+    TEMPO_SNAP = 0.0008        # fitted ratios this close to a known one are snapped to it
 
     @staticmethod
     def _extract_envelope(file_path: str, stream_index: int) -> list[float]:
         """
-        Extract Momentary Loudness (LUFS) values via FFmpeg ebur128.
-        Returns a list of floats at ~10 Hz.  Empty on failure.
-        """
-        cmd = [
-            "ffmpeg",
-            "-hide_banner", "-nostats", "-v", "info",
-            "-ss", "0",
-            "-t", str(DonorAligner.PROBE_SECS),
-            "-i", file_path,
-            "-map", f"0:{stream_index}",
-            "-af", "ebur128",
-            "-f", "null",
-            "-",
-        ]
+        Extract the loudness envelope (dBFS) of one audio stream at SAMPLE_HZ.
+        Empty on failure.
+        """
+        return DonorAligner._extract_envelopes(file_path, [stream_index]).get(stream_index, [])
+
+    @classmethod
+    def _cache_params(cls, start: float = 0.0, length: Optional[float] = None) -> str:
+        """Extraction parameters that are part of the envelope cache key."""
+        length = cls.PROBE_SECS if length is None else length
+        return f"rms{cls.SAMPLE_HZ}-pcm{cls.PCM_RATE}-ss{start:.2f}-t{length:.2f}"
+
+    @classmethod
+    def _extract_envelopes(cls, file_path: str, stream_indices: list[int]) -> dict[int, list[float]]:
+        """
+        Loudness envelopes of the first PROBE_SECS of several audio streams.
+        Returns {stream_index: [dBFS, ...]} at SAMPLE_HZ; streams that failed are missing.
+        """
+        windows = cls._extract_windows(file_path, stream_indices, [(0.0, cls.PROBE_SECS)])
+        return {idx: values for (idx, _), values in windows.items()}
+
+    @classmethod
+    def _extract_windows(
+        cls, file_path: str, stream_indices: list[int], windows: list[tuple[float, float]]
+    ) -> dict[tuple[int, int], list[float]]:
+        """
+        Loudness envelopes of every (stream, window) pair, served from the persistent
+        envelope cache where possible; only the missing pairs are decoded (in one pass).
+        windows: [(start_seconds, length_seconds), ...].
+        Returns {(stream_index, window_number): [dBFS, ...]}; failed pairs are missing.
+        """
+        envelopes = {}
+        missing = []
+        for idx in stream_indices:
+            for w, (start, length) in enumerate(windows):
+                cached = envelope_cache.get(file_path, idx, cls._cache_params(start, length))
+                if cached:
+                    envelopes[(idx, w)] = cached
+                else:
+                    missing.append((idx, w))
+        if missing:
+            decoded = cls._decode_windows(file_path, missing, windows)
+            for (idx, w), values in decoded.items():
+                start, length = windows[w]
+                envelope_cache.put(file_path, idx, cls._cache_params(start, length), values, hz=cls.SAMPLE_HZ)
+            envelopes.update(decoded)
+        return envelopes
+
+    @staticmethod
+    def _decode_windows(
+        file_path: str, pairs: list[tuple[int, int]], windows: list[tuple[float, float]]
+    ) -> dict[tuple[int, int], list[float]]:
+        """
+        Decode the loudness envelopes of several (stream, window) pairs in ONE ffmpeg run.
+        Every window is a separate input of the same file with -ss before -i, so ffmpeg
+        seeks straight to it instead of decoding from the start. Each pair is downmixed
+        to mono, resampled to PCM_RATE and written as raw s16le to its own pipe. The RMS
+        envelope is computed here while the data streams in, so memory stays flat.
+        """
+        if not pairs:
+            return {}
+        import selectors
+        import subprocess
+        import time
+
+        cmd = ["ffmpeg", "-hide_banner", "-nostats", "-v", "error"]
+        inputs: dict[int, int] = {}  # window number -> ffmpeg input index
+        for _, w in pairs:
+            if w in inputs:
+                continue
+            start, length = windows[w]
+            inputs[w] = len(inputs)
+            cmd += ["-ss", f"{start:.3f}", "-t", f"{length:.3f}", "-i", file_path]
+
+        pipes = {}  # read fd -> ((stream index, window number), _RmsEnvelope)
+        write_fds = []
+        samples_per_bin = DonorAligner.PCM_RATE // DonorAligner.SAMPLE_HZ
+        for idx, w in pairs:
+            read_fd, write_fd = os.pipe()
+            pipes[read_fd] = ((idx, w), _RmsEnvelope(samples_per_bin))
+            write_fds.append(write_fd)
+            cmd += [
+                "-map", f"{inputs[w]}:{idx}",
+                "-ac", "1", "-ar", str(DonorAligner.PCM_RATE),
+                "-f", "s16le", f"pipe:{write_fd}",
+            ]
+
+        start = time.monotonic()
+        decoded_secs = sum(windows[w][1] for _, w in pairs)
+        deadline = start + 45 + decoded_secs / 4
         try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, errors="replace", timeout=60
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=tuple(write_fds),
             )
-            output = result.stderr  # ebur128 writes to stderr
         except Exception:
-            return []
-
-        values = []
-        for line in output.splitlines():
-            # Lines look like:   [Parsed_ebur128_0 @ ...] t: 0.0999 TARGET:-23 LUFS M:-120.7 S:-120.7 I: -70.0 LUFS
-            if "M:" in line and "S:" in line and "LUFS" in line:
+            for fd in list(pipes) + write_fds:
+                os.close(fd)
+            return {}
+        finally:
+            for fd in write_fds:
                 try:
-                    m_idx = line.index("M:")
-                    # Extract the value right after "M:"
-                    # E.g. "M:-120.7" -> "-120.7"
-                    val_str = line[m_idx + 2:].split()[0]
-                    val = float(val_str)
-                    # Clamp -infinity readings (silence) to a fixed floor
-                    if val < -70:
-                        val = -70.0
-                    values.append(val)
-                except (ValueError, IndexError):
-                    continue
-        return values
+                    os.close(fd)
+                except OSError:
+                    pass
+
+        sel = selectors.DefaultSelector()
+        for fd in pipes:
+            sel.register(fd, selectors.EVENT_READ)
+        timed_out = False
+        try:
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    process.kill()
+                    break
+                for key, _ in sel.select(timeout=remaining):
+                    chunk = os.read(key.fd, 65536)
+                    if chunk:
+                        pipes[key.fd][1].feed(chunk)
+                    else:
+                        sel.unregister(key.fd)
+        finally:
+            sel.close()
+            for fd in pipes:
+                os.close(fd)
+        record_operation("envelope", reap(process, start), file_path)
+        if timed_out or process.returncode != 0:
+            return {}
+
+        envelopes = {}
+        for pair, env in pipes.values():
+            values = env.finish()
+            if values:
+                envelopes[pair] = values
+        return envelopes
 
     @staticmethod
     def _sliding_mae(ref: list[float], query: list[float], hz: int, window: float) -> tuple[float, float]:
@@ -160,6 +504,92 @@ class DonorAligner:
         confidence = max(0.0, min(1.0, 1.0 - best_mae / 15.0))
         return offset_seconds, confidence
 
+    @staticmethod
+    def _fft_ncc(ref: list[float], query: list[float], hz: float, window: float) -> tuple[float, float]:
+        """
+        Normalized cross-correlation of `query` against `ref` for every lag in ±window
+        seconds at once (FFT), with each lag normalized over its own overlap so gain
+        differences and partial overlaps don't matter.
+        Returns (best_offset_seconds, confidence_0_to_1); same sign convention as
+        _sliding_mae (positive: ref[t + offset] matches query[t]).
+        Confidence comes from the peak-to-sidelobe ratio of the correlation curve.
+        """
+        # First differences whiten slowly varying loudness so the peak is sharp (onset emphasis)
+        r = np.diff(np.asarray(ref, dtype=np.float64))
+        q = np.diff(np.asarray(query, dtype=np.float64))
+        n_r, n_q = len(r), len(q)
+        min_overlap = max(20, int(DonorAligner.MIN_OVERLAP_SECS * hz), int(min(n_r, n_q) * 0.3))
+        if min(n_r, n_q) < min_overlap:
+            return 0.0, 0.0
+
+        # Raw correlation sum_i r[i + k] * q[i] for all lags via one FFT product
+        size = 1 << (n_r + n_q - 1).bit_length()
+        spec = np.fft.rfft(r, size) * np.conj(np.fft.rfft(q, size))
+        corr = np.fft.irfft(spec, size)
+
+        max_shift = int(window * hz)
+        lags = np.arange(-min(max_shift, n_q - 1), min(max_shift, n_r - 1) + 1)
+        raw = corr[lags % size]
+
+        # Per-lag overlap ranges: r[r0:r1] pairs with q[q0:q1]
+        r0 = np.maximum(lags, 0)
+        r1 = np.minimum(n_r, n_q + lags)
+        q0 = np.maximum(-lags, 0)
+        q1 = np.minimum(n_q, n_r - lags)
+        n = (r1 - r0).astype(np.float64)
+
+        cr = np.concatenate(([0.0], np.cumsum(r)))
+        cr2 = np.concatenate(([0.0], np.cumsum(r * r)))
+        cq = np.concatenate(([0.0], np.cumsum(q)))
+        cq2 = np.concatenate(([0.0], np.cumsum(q * q)))
+        sum_r = cr[r1] - cr[r0]
+        sum_q = cq[q1] - cq[q0]
+        var_r = (cr2[r1] - cr2[r0]) - sum_r * sum_r / np.maximum(n, 1)
+        var_q = (cq2[q1] - cq2[q0]) - sum_q * sum_q / np.maximum(n, 1)
+        cov = raw - sum_r * sum_q / np.maximum(n, 1)
+
+        valid = (n >= min_overlap) & (var_r > 1e-9) & (var_q > 1e-9)
+        if not valid.any():
+            return 0.0, 0.0
+        ncc = np.full(len(lags), -1.0)
+        ncc[valid] = cov[valid] / np.sqrt(var_r[valid] * var_q[valid])
+
+        peak = int(np.argmax(ncc))
+        peak_val = float(ncc[peak])
+
+        # Parabolic interpolation around the peak for sub-sample resolution
+        frac = 0.0
+        if 0 < peak < len(ncc) - 1 and valid[peak - 1] and valid[peak + 1]:
+            y0, y1, y2 = ncc[peak - 1], ncc[peak], ncc[peak + 1]
+            denom = y0 - 2 * y1 + y2
+            if denom < 0:
+                frac = float(np.clip(0.5 * (y0 - y2) / denom, -0.5, 0.5))
+        offset_seconds = float((lags[peak] + frac) / hz)
+
+        # Peak-to-sidelobe ratio: how far the peak stands out from the rest of the curve
+        excl = max(1, int(DonorAligner.PEAK_EXCLUSION_SECS * hz))
+        side = valid.copy()
+        side[max(0, peak - excl): peak + excl + 1] = False
+        if side.sum() < 10:
+            return offset_seconds, max(0.0, min(1.0, peak_val))
+        side_vals = ncc[side]
+        psr = (peak_val - float(side_vals.mean())) / max(float(side_vals.std()), 1e-6)
+
+        # PSR <= 3 is noise, >= 10 is an unambiguous peak; weak correlations are damped
+        confidence = min(1.0, max(0.0, (psr - 3.0) / 7.0)) * min(1.0, max(0.0, peak_val / 0.5))
+        return offset_seconds, confidence
+
+    @classmethod
+    def _correlate(cls, ref: list[float], query: list[float], hz: float) -> tuple[float, float]:
+        """Best available alignment engine: FFT NCC with NumPy, sliding MAE without."""
+        if np is not None:
+            return cls._fft_ncc(ref, query, hz, cls.FFT_SEARCH_WINDOW)
+        # The pure-Python search is tuned for ~10 Hz: average the envelopes down first
+        factor = max(1, int(hz) // 10)
+        if factor > 1:
+            ref, query = _decimate(ref, factor), _decimate(query, factor)
+        return cls._sliding_mae(ref, query, int(hz) // factor, cls.SEARCH_WINDOW)
+
     @classmethod
     def align_best_track(cls, file_a: str, stream_a: int, file_b: str, tracks_b: list, env_a: list[float] = None) -> tuple[float, float]:
         """
@@ -177,11 +607,13 @@ class DonorAligner:
         best_conf = -1.0
         
         audio_b = [t for t in tracks_b if t.codec_type == "audio"]
+        # All donor streams are decoded in a single pass over the file
+        envs_b = cls._extract_envelopes(file_b, [t.index for t in audio_b])
         for t_b in audio_b:
-            env_b = cls._extract_envelope(file_b, t_b.index)
+            env_b = envs_b.get(t_b.index)
             if not env_b:
                 continue
-            off, conf = cls._sliding_mae(env_a, env_b, cls.SAMPLE_HZ, cls.SEARCH_WINDOW)
+            off, conf = cls._correlate(env_a, env_b, cls.SAMPLE_HZ)
             if conf > best_conf:
                 best_conf = conf
                 best_offset = off
@@ -191,3 +623,371 @@ class DonorAligner:
             
         return best_offset, best_conf
 
+    # ------------------------------------------------------------------ #
+    # Windowed alignment                                                   #
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def target_windows(cls, duration: float) -> list[tuple[float, float]]:
+        """(start, length) of the windows sampled from the target, or [] when it is too short."""
+        if duration < cls.MIN_WINDOWED_DURATION:
+            return []
+        first = duration * 0.08
+        last = duration * 0.92 - cls.WINDOW_SECS
+        step = (last - first) / (cls.WINDOW_COUNT - 1)
+        return [(round(first + i * step, 2), cls.WINDOW_SECS) for i in range(cls.WINDOW_COUNT)]
+
+    @classmethod
+    def extract_target(cls, file_a: str, stream_a: int, duration_a: float) -> list[list[float]]:
+        """Envelopes of the target windows (reusable across donors); [] entries failed."""
+        windows = cls.target_windows(duration_a)
+        envs = cls._extract_windows(file_a, [stream_a], windows)
+        return [envs.get((stream_a, w), []) for w in range(len(windows))]
+
+    @classmethod
+    def _tempo_prior(cls, duration_a: float, duration_b: float) -> float:
+        """Known frame-rate ratio the runtimes suggest, else 1.0 (runtime differences are usually cuts)."""
+        ratio = duration_a / duration_b
+        best = min(cls.KNOWN_TEMPO_RATIOS, key=lambda r: abs(r - ratio))
+        return best if abs(best - ratio) < 0.006 else 1.0
+
+    @classmethod
+    def _window_offset(
+        cls, env_t: list[float], env_d: list[float], margin: float, tempo: float = 1.0
+    ) -> tuple[float, float]:
+        """
+        Locate a target window inside a donor window that starts `margin` donor seconds
+        before its predicted position. The donor window is first stretched by the expected
+        tempo so both play at the same speed. Returns (o, confidence): the donor window
+        start lines up with target window start + o.
+        """
+        hz = cls.SAMPLE_HZ
+        if tempo != 1.0:
+            env_d = _stretch(env_d, tempo)
+            margin *= tempo
+        if np is not None:
+            return cls._fft_ncc(env_t, env_d, hz, 2 * margin + cls.WINDOW_SECS)
+        # Pure-Python: start the donor at the predicted position and search ±SEARCH_WINDOW
+        factor = max(1, hz // 10)
+        shift = int(margin * hz)
+        donor, target = _decimate(env_d[shift:], factor), _decimate(env_t, factor)
+        s, conf = cls._sliding_mae(donor, target, hz // factor, min(margin, cls.SEARCH_WINDOW))
+        return -(margin + s), conf
+
+    @classmethod
+    def _fit_drift(cls, points: list[tuple[float, float, float]], prior: float) -> Optional[tuple[float, float, list]]:
+        """
+        Weighted least-squares fit of offset(t) = c + (tempo - 1) * t over the window
+        points [(donor_time, offset, confidence)], rejecting outliers one at a time.
+        Returns (c, tempo, inliers), or None without usable points.
+        """
+        pts = [p for p in points if p[2] >= cls.MIN_WINDOW_CONFIDENCE]
+        if not pts:
+            return None
+        while True:
+            if len(pts) == 1:
+                t, d, _ = pts[0]
+                return d - (prior - 1.0) * t, prior, pts
+            w_sum = sum(p[2] for p in pts)
+            t_mean = sum(p[0] * p[2] for p in pts) / w_sum
+            d_mean = sum(p[1] * p[2] for p in pts) / w_sum
+            var = sum(p[2] * (p[0] - t_mean) ** 2 for p in pts)
+            slope = sum(p[2] * (p[0] - t_mean) * (p[1] - d_mean) for p in pts) / var if var > 0 else prior - 1.0
+            tempo = 1.0 + slope
+            snapped = min(cls.KNOWN_TEMPO_RATIOS, key=lambda r: abs(r - tempo))
+            if abs(tempo - 1.0) < cls.DRIFT_TOLERANCE:
+                tempo = 1.0
+            elif abs(snapped - tempo) < cls.TEMPO_SNAP:
+                tempo = snapped
+            c = d_mean - (tempo - 1.0) * t_mean
+            residuals = [abs(p[1] - (c + (tempo - 1.0) * p[0])) for p in pts]
+            worst = max(range(len(pts)), key=lambda i: residuals[i])
+            if residuals[worst] <= cls.OUTLIER_SECS or len(pts) <= 2:
+                return c, tempo, pts
+            pts = pts[:worst] + pts[worst + 1:]
+
+    @classmethod
+    def align(
+        cls, file_a: str, stream_a: int, duration_a: float, media_b,
+        envs_a: Optional[list[list[float]]] = None
+    ) -> "Alignment":
+        """
+        Align stream_a of file_a against the best audio track of media_b using short
+        windows spread over the whole runtime, so differing intros don't matter and
+        speed differences (PAL speed-up) show up as drift.
+
+        1. Anchor: the middle target window is searched ±ANCHOR_MARGIN around its
+           expected donor position in every donor audio stream (one ffmpeg pass).
+        2. The other windows are placed from the anchor and searched ±WINDOW_MARGIN
+           in the best stream only (second pass).
+        3. offset + linear drift is fitted over all windows.
+        Pass envs_a (from extract_target) to reuse the target windows across donors.
+        Files shorter than MIN_WINDOWED_DURATION use align_best_track.
+        """
+        audio_b = [t for t in media_b.tracks if t.codec_type == "audio"]
+        windows_a = cls.target_windows(duration_a)
+        if not audio_b:
+            return Alignment(0.0, 0.0)
+        if not windows_a or media_b.duration < cls.MIN_WINDOWED_DURATION:
+            off, conf = cls.align_best_track(file_a, stream_a, media_b.path, media_b.tracks)
+            return Alignment(off, conf)
+        if envs_a is None:
+            envs_a = cls.extract_target(file_a, stream_a, duration_a)
+        if not any(envs_a):
+            return Alignment(0.0, 0.0)
+
+        prior = cls._tempo_prior(duration_a, media_b.duration)
+        anchor = len(windows_a) // 2 if envs_a[len(windows_a) // 2] else next(i for i, e in enumerate(envs_a) if e)
+        a_start, length = windows_a[anchor]
+
+        # 1. Anchor window in every donor stream (retried once with a wider search)
+        margins = [cls.ANCHOR_MARGIN] + ([cls.ANCHOR_RETRY_MARGIN] if np is not None else [])
+        for anchor_margin in margins:
+            b_start = round(max(0.0, a_start / prior - anchor_margin), 2)
+            margin = a_start / prior - b_start
+            found = cls._extract_windows(
+                media_b.path, [t.index for t in audio_b], [(b_start, length / prior + margin + anchor_margin)]
+            )
+            best_stream, best = None, (0.0, -1.0)
+            for t_b in audio_b:
+                env_b = found.get((t_b.index, 0))
+                if not env_b:
+                    continue
+                o, conf = cls._window_offset(envs_a[anchor], env_b, margin, prior)
+                if conf > best[1]:
+                    best_stream, best = t_b.index, (o, conf)
+            if best[1] >= cls.ANCHOR_CONFIDENCE:
+                break
+        if best_stream is None or best[1] < cls.ANCHOR_CONFIDENCE:
+            # No usable anchor: fall back to the start-of-file search
+            off, conf = cls.align_best_track(file_a, stream_a, media_b.path, media_b.tracks)
+            return Alignment(off, conf)
+
+        # Correspondence: donor b_start plays at target a_start + o
+        d_anchor = a_start + best[0] - b_start
+        points = [(b_start, d_anchor, best[1])]
+        c0 = d_anchor - (prior - 1.0) * b_start
+
+        # 2. Remaining windows in the best stream, placed from the anchor
+        placed = []
+        for w, (start, _) in enumerate(windows_a):
+            if w == anchor or not envs_a[w]:
+                continue
+            b = (start - c0) / prior - cls.WINDOW_MARGIN
+            b_len = length / prior + 2 * cls.WINDOW_MARGIN
+            if b < 0 or b + b_len > media_b.duration:
+                continue
+            placed.append((w, round(b, 2)))
+        if placed:
+            b_len = length / prior + 2 * cls.WINDOW_MARGIN
+            found = cls._extract_windows(media_b.path, [best_stream], [(b, b_len) for _, b in placed])
+            for n, (w, b) in enumerate(placed):
+                env_b = found.get((best_stream, n))
+                if not env_b:
+                    continue
+                o, conf = cls._window_offset(envs_a[w], env_b, cls.WINDOW_MARGIN, prior)
+                points.append((b, windows_a[w][0] + o - b, conf))
+
+        # 3. offset + drift
+        fit = cls._fit_drift(points, prior)
+        if fit is None:
+            return Alignment(0.0, 0.0)
+        c, tempo, inliers = fit
+        confidence = (sum(p[2] for p in inliers) / len(inliers)) * (len(inliers) / len(windows_a)) ** 0.5
+        return Alignment(
+            offset=round(c, 3),
+            confidence=max(0.0, min(1.0, confidence)),
+            tempo_ratio=tempo,
+            windows=sorted(points),
+            inliers=len(inliers),
+        )
+
+
+def _analyze_donor(
+    file_a: str, stream_a: int, duration_a: float, envs_a: list[list[float]], donor_path: str
+) -> tuple[Alignment, float]:
+    """Process-pool job: probe one donor and align it. Returns (alignment, seconds)."""
+    import time
+
+    from .probe import MediaProbe
+
+    start = time.monotonic()
+    media_b = MediaProbe.probe(donor_path)
+    alignment = DonorAligner.align(file_a, stream_a, duration_a, media_b, envs_a=envs_a)
+    return alignment, time.monotonic() - start
+
+
+class BulkDonorAnalysis:
+    """
+    Aligns many donor candidates against one target track on a bounded process pool.
+    Candidates are submitted in the given order (best duration match first) and every
+    result is handed to `on_result` as soon as it completes. Unless `exhaustive`, the
+    run stops once a candidate reaches `stop_confidence`; queued candidates are
+    dropped and only the jobs already running are allowed to finish.
+    The pool uses the spawn start method so the curses process and its threads are
+    never forked.
+    """
+
+    def __init__(
+        self,
+        file_a: str,
+        stream_a: int,
+        duration_a: float,
+        donor_paths: list[str],
+        workers: int = 0,
+        stop_confidence: float = 0.85,
+        exhaustive: bool = False,
+    ):
+        import threading
+
+        self.file_a = file_a
+        self.stream_a = stream_a
+        self.duration_a = duration_a
+        self.donor_paths = list(donor_paths)
+        self.workers = workers if workers > 0 else min(4, os.cpu_count() or 1)
+        self.workers = max(1, min(self.workers, len(self.donor_paths)))
+        self.stop_confidence = stop_confidence
+        self.exhaustive = exhaustive
+        self.done = 0
+        self.stopped_by: Optional[str] = None  # donor that triggered the early stop
+        self._cancelled = threading.Event()
+
+    @property
+    def total(self) -> int:
+        return len(self.donor_paths)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def _should_stop(self, confidence: float) -> bool:
+        return not self.exhaustive and self.stop_confidence > 0 and confidence >= self.stop_confidence
+
+    def run(self, on_result) -> None:
+        """
+        Blocking; call from a background thread.
+        on_result(path, alignment, seconds) — seconds is None when the job failed.
+        """
+        if not self.donor_paths:
+            return
+        # The target windows are extracted (or loaded from the cache) once and shipped to every job
+        envs_a = DonorAligner.extract_target(self.file_a, self.stream_a, self.duration_a)
+        if DonorAligner.target_windows(self.duration_a) and not any(envs_a):
+            for path in self.donor_paths:
+                self.done += 1
+                on_result(path, Alignment(0.0, 0.0), None)
+            return
+
+        def _done(path, result, error):
+            alignment, secs = result if error is None else (Alignment(0.0, 0.0), None)
+            self.done += 1
+            on_result(path, alignment, secs)
+            if self.stopped_by is None and self._should_stop(alignment.confidence):
+                self.stopped_by = path
+                self._cancelled.set()
+
+        jobs = [(path, (self.file_a, self.stream_a, self.duration_a, envs_a, path)) for path in self.donor_paths]
+        run_process_pool(_analyze_donor, jobs, self.workers, _done, self._cancelled)
+
+
+def run_process_pool(fn, jobs: list, workers: int, on_done, cancelled) -> None:
+    """
+    Run fn(*args) for every (key, args) in jobs on a spawn-context process pool of
+    `workers`, in order, calling on_done(key, result, error) as each one finishes
+    (error is the exception or None). Stops early once the `cancelled` Event is set:
+    queued jobs are dropped, running ones finish in the background.
+    """
+    import multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    pool = ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn"))
+    try:
+        futures = {pool.submit(fn, *args): key for key, args in jobs}
+        pending = set(futures)
+        while pending and not cancelled.is_set():
+            finished, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in finished:
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    result, error = None, e
+                on_done(futures[future], result, error)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Envelope values never go below this (digital silence would be -inf dB)
+ENVELOPE_FLOOR_DB = -70.0
+
+
+class _RmsEnvelope:
+    """
+    Streaming RMS envelope of s16le mono PCM: feed() raw chunks as they arrive,
+    finish() returns one dBFS value per `samples_per_bin` samples.
+    """
+
+    def __init__(self, samples_per_bin: int):
+        self.samples_per_bin = samples_per_bin
+        self.values: list[float] = []
+        self._pending = bytearray()
+
+    def feed(self, chunk: bytes) -> None:
+        self._pending += chunk
+        bin_bytes = self.samples_per_bin * 2
+        usable = len(self._pending) - len(self._pending) % bin_bytes
+        if usable:
+            self._add_bins(bytes(self._pending[:usable]))
+            del self._pending[:usable]
+
+    def finish(self) -> list[float]:
+        # A trailing partial bin counts if it holds at least half a window
+        if len(self._pending) >= self.samples_per_bin:
+            data = bytes(self._pending[: len(self._pending) - len(self._pending) % 2])
+            self._add_bins(data, len(data) // 2)
+        self._pending = bytearray()
+        return self.values
+
+    def _add_bins(self, data: bytes, n: int = 0) -> None:
+        n = n or self.samples_per_bin
+        if np is not None:
+            x = np.frombuffer(data, dtype="<i2").astype(np.float32).reshape(-1, n)
+            rms = np.sqrt((x * x).mean(axis=1)) / 32768.0
+            db = 20.0 * np.log10(np.maximum(rms, 1e-9))
+            self.values.extend(np.maximum(db, ENVELOPE_FLOOR_DB).tolist())
+            return
+
+        import math
+        import sys
+        from array import array
+
+        samples = array("h")
+        samples.frombytes(data)
+        if sys.byteorder == "big":
+            samples.byteswap()
+        for start in range(0, len(samples) - n + 1, n):
+            ms = sum(v * v for v in samples[start:start + n]) / n
+            rms = math.sqrt(ms) / 32768.0
+            self.values.append(max(20.0 * math.log10(max(rms, 1e-9)), ENVELOPE_FLOOR_DB))
+
+
+def _stretch(values: list[float], factor: float) -> list[float]:
+    """Linearly resample `values` to `factor` times their length (slows them down for factor > 1)."""
+    n = len(values)
+    out_len = int((n - 1) * factor) + 1 if n else 0
+    out = []
+    for i in range(out_len):
+        x = i / factor
+        j = int(x)
+        if j + 1 < n:
+            frac = x - j
+            out.append(values[j] * (1.0 - frac) + values[j + 1] * frac)
+        else:
+            out.append(values[-1])
+    return out
+
+
+def _decimate(values: list[float], factor: int) -> list[float]:
+    """Average consecutive groups of `factor` values."""
+    return [
+        sum(values[i:i + factor]) / factor
+        for i in range(0, len(values) - factor + 1, factor)
+    ]
@@ -0,0 +1,261 @@
+"""
+Encoder capabilities of the local ffmpeg build.
+
+A transcode whose audio codec the build or the output muxer cannot handle (e.g.
+EAC3 from a 7.1 DTS-HD MA source) only fails when ffmpeg exits, which can be
+hours into a job; the remux then restarts from scratch with the next entry of
+the fallback chain. This module finds the working entry up front instead:
+
+1. The build's encoder and muxer lists (`ffmpeg -encoders` / `-muxers`) are
+   parsed once per ffmpeg version. Chain entries whose encoder is missing are
+   skipped without running anything.
+2. Every remaining entry is tried on a few seconds of the actual source track,
+   written to the real output container, in chain order. The first one that
+   encodes cleanly is used for the full job.
+
+Trial results are remembered per source audio layout (codec, profile, channels),
+attempt and container, so the trials run once per kind of track, not per file.
+A failure is only remembered when another entry succeeded on the same track,
+so a damaged source cannot rule out a codec for good.
+
+Stored in $XDG_CACHE_HOME/trackremux/encoders.json
+(falls back to ~/.cache/trackremux/encoders.json).
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from typing import Optional
+
+from .converter import MediaConverter
+from .resources import record_operation, run_accounted
+
+
+def _cache_path() -> str:
+    xdg = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(xdg, "trackremux", "encoders.json")
+
+
+def hd_audio_chains(media_file, convert_audio: bool) -> dict:
+    """
+    Fallback chains of the audio tracks a job transcodes:
+    {audio output index: (track, [chain entries])}. Empty without convert_audio.
+    """
+    chains = {}
+    if not convert_audio:
+        return chains
+    a_out_idx = 0
+    for t in media_file.tracks:
+        if not t.enabled or t.codec_type != "audio":
+            continue
+        if t.codec_name.lower() in MediaConverter.HD_CODECS:
+            chains[a_out_idx] = (t, MediaConverter.get_audio_fallback_chain(t))
+        a_out_idx += 1
+    return chains
+
+
+class EncoderCapabilities:
+    """Encoders, muxers and trial-encode results of the ffmpeg on PATH."""
+
+    TRIAL_SECS = 3.0        # length of a trial encode
+    TRIAL_AT = 0.5          # trial position as a fraction of the runtime
+    TRIAL_TIMEOUT = 60.0
+
+    # Output extension -> ffmpeg muxer
+    MUXERS = {".mkv": "matroska", ".mka": "matroska", ".webm": "webm", ".mp4": "mp4",
+              ".m4v": "mp4", ".mov": "mov", ".avi": "avi", ".ts": "mpegts"}
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or _cache_path()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.version = ""  # first line of `ffmpeg -version`; empty when ffmpeg is unavailable
+        self.encoders: set[str] = set()
+        self.muxers: set[str] = set()
+        self._trials: dict[str, bool] = {}
+
+    # ------------------------------------------------------------------ #
+    # Build capabilities                                                   #
+    # ------------------------------------------------------------------ #
+
+    def load(self) -> bool:
+        """Read (or probe and cache) the capabilities of the current ffmpeg. False without ffmpeg."""
+        with self._lock:
+            if self._loaded:
+                return bool(self.version)
+            self._loaded = True
+            self.version = self._ffmpeg_version()
+            if not self.version:
+                return False
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get("version") == self.version:
+                self.encoders = set(data.get("encoders", []))
+                self.muxers = set(data.get("muxers", []))
+                self._trials = dict(data.get("trials", {}))
+                if self.encoders:
+                    return True
+            # New or changed build: probe it and drop trial results of the old one
+            self.encoders = self._list("-encoders")
+            self.muxers = self._list("-muxers")
+            self._trials = {}
+        self._save()
+        return True
+
+    @staticmethod
+    def _ffmpeg_version() -> str:
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-version"], capture_output=True, text=True, timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return ""
+        if result.returncode != 0 or not result.stdout:
+            return ""
+        return result.stdout.splitlines()[0].strip()
+
+    @staticmethod
+    def _list(flag: str) -> set[str]:
+        """Names from `ffmpeg -encoders` / `-muxers`: the column after the flags, below the ' --' rule."""
+        try:
+            result = subprocess.run(["ffmpeg", "-hide_banner", flag], capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            return set()
+        names = set()
+        in_table = False
+        for line in result.stdout.splitlines():
+            if not in_table:
+                in_table = line.strip().startswith("--")
+                continue
+            parts = line.split()
+            if len(parts) >= 2:
+                names.update(n for n in parts[1].split(",") if n)
+        return names
+
+    def _save(self) -> None:
+        with self._lock:
+            data = {
+                "version": self.version,
+                "encoders": sorted(self.encoders),
+                "muxers": sorted(self.muxers),
+                "trials": dict(self._trials),
+            }
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # Capabilities are re-probed next time
+
+    def has_encoder(self, name: str) -> bool:
+        """True when the build has this encoder (also when it could not be determined)."""
+        if not self.load() or not self.encoders:
+            return True
+        return name in self.encoders
+
+    def has_muxer(self, name: str) -> bool:
+        """True when the build has this muxer (also when it could not be determined)."""
+        if not self.load() or not self.muxers:
+            return True
+        return name in self.muxers
+
+    # ------------------------------------------------------------------ #
+    # Trial encodes                                                        #
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _trial_key(track, attempt: dict, container: str) -> str:
+        return "|".join(str(v) for v in (
+            track.codec_name.lower(), track.profile or "", MediaConverter.get_channel_count(track),
+            track.channel_layout or "", attempt["codec"], attempt.get("bitrate") or "",
+            attempt.get("ac") or "", bool(attempt.get("strict_experimental")), container,
+        ))
+
+    def trial_encode(self, source_path: str, track, attempt: dict, container: str, at: float) -> bool:
+        """Encode TRIAL_SECS of one source stream from `at` seconds with attempt into a temp file."""
+        fd, out = tempfile.mkstemp(prefix="trackremux-trial-", suffix=container)
+        os.close(fd)
+        cmd = ["ffmpeg", "-v", "error", "-nostdin", "-y"]
+        if at > 0:
+            cmd += ["-ss", f"{at:.3f}"]
+        cmd += ["-i", source_path, "-t", f"{self.TRIAL_SECS:.1f}", "-map", f"0:{track.index}",
+                "-c:a", attempt["codec"]]
+        if attempt.get("bitrate"):
+            cmd += ["-b:a", attempt["bitrate"]]
+        if attempt.get("ac"):
+            cmd += ["-ac", str(attempt["ac"])]
+        if attempt.get("strict_experimental"):
+            cmd += ["-strict", "experimental"]
+        cmd.append(out)
+        try:
+            result, usage = run_accounted(cmd, timeout=self.TRIAL_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        finally:
+            try:
+                size = os.path.getsize(out)
+                os.remove(out)
+            except OSError:
+                size = 0
+        record_operation("trial", usage, source_path)
+        return result.returncode == 0 and size > 0
+
+    def choose(self, media_file, chains: dict, output_path: str, on_log=None) -> dict:
+        """
+        Chain position to start each transcoded track at: {audio output index: position}.
+        chains is hd_audio_chains() output. Tracks where no entry passes keep position 0,
+        so the full run fails (and falls back) exactly as it would have without trials.
+        """
+        positions = {idx: 0 for idx in chains}
+        if not chains or not self.load():
+            return positions
+        container = os.path.splitext(output_path)[1].lower() or ".mkv"
+        muxer = self.MUXERS.get(container)
+        if muxer and not self.has_muxer(muxer):
+            if on_log:
+                on_log(f">>> Muxer '{muxer}' not in this ffmpeg build, skipping trial encodes")
+            return positions
+        changed = False
+        for idx, (track, chain) in chains.items():
+            source = track.source_path or media_file.path
+            at = max(0.0, media_file.duration * self.TRIAL_AT - track.offset_seconds)
+            failed = []
+            for pos, attempt in enumerate(chain):
+                if not self.has_encoder(attempt["codec"]):
+                    if on_log:
+                        on_log(f">>> {attempt['label']}: encoder '{attempt['codec']}' not in this ffmpeg build, skipped")
+                    continue
+                key = self._trial_key(track, attempt, container)
+                with self._lock:
+                    known = self._trials.get(key)
+                if known is None:
+                    known = self.trial_encode(source, track, attempt, container, at)
+                    if known:
+                        with self._lock:
+                            self._trials[key] = True
+                        changed = True
+                if known:
+                    positions[idx] = pos
+                    with self._lock:
+                        for k in failed:
+                            self._trials[k] = False
+                    changed = changed or bool(failed)
+                    if on_log and pos > 0:
+                        on_log(f">>> Trial encode: audio track {idx} uses {attempt['label']} "
+                               f"({chain[0]['label']} does not work here)")
+                    break
+                failed.append(key)
+        if changed:
+            self._save()
+        return positions
+
+
+# Shared instance: capabilities are per machine, not per job
+encoder_capabilities = EncoderCapabilities()
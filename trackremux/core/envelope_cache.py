@@ -0,0 +1,132 @@
+"""
+Persistent cache of donor loudness envelopes.
+
+Envelopes are keyed by file identity (absolute path, size, mtime) plus the
+stream index and the extraction parameters, so a changed file or a different
+envelope resolution never returns stale data. Each entry is one small binary
+file (centi-dB as little-endian int16, ~2 bytes per value). The directory is
+trimmed, least recently used first, whenever it grows past its size budget; a
+running total of its size (one directory scan per session, then kept up to date
+by put()) tells when that is, so a put does not stat every entry.
+
+Stored in $XDG_CACHE_HOME/trackremux/envelopes
+(falls back to ~/.cache/trackremux/envelopes).
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Optional
+
+# Total size budget of the cache directory
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_MAGIC = b"TRENV1"
+_HEADER = struct.Struct("<6sfI")  # magic, sample rate (Hz), value count
+
+
+def _cache_dir() -> str:
+    xdg = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(xdg, "trackremux", "envelopes")
+
+
+class EnvelopeCache:
+    """Size-bounded on-disk cache of envelopes: get()/put() by file, stream and parameters."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or _cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None  # bytes in the directory; None until scanned
+
+    def _entry_path(self, file_path: str, stream_index: int, params: str) -> Optional[str]:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        identity = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}|{stream_index}|{params}"
+        digest = hashlib.sha1(identity.encode("utf-8", errors="surrogateescape")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + ".env")
+
+    def get(self, file_path: str, stream_index: int, params: str) -> Optional[list[float]]:
+        """Cached envelope, or None on a miss."""
+        path = self._entry_path(file_path, stream_index, params)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, _hz, count = _HEADER.unpack_from(data)
+            if magic != _MAGIC:
+                return None
+            values = array("h")
+            values.frombytes(data[_HEADER.size:_HEADER.size + count * 2])
+            if sys.byteorder == "big":
+                values.byteswap()
+            os.utime(path)  # mark as recently used for eviction
+        except (OSError, struct.error, ValueError):
+            return None
+        return [v / 100.0 for v in values]
+
+    def put(self, file_path: str, stream_index: int, params: str, values: list[float], hz: float = 0.0) -> None:
+        """Store an envelope; never raises (a cache must not break analysis)."""
+        path = self._entry_path(file_path, stream_index, params)
+        if not path or not values:
+            return
+        packed = array("h", (max(-32768, min(32767, int(round(v * 100)))) for v in values))
+        if sys.byteorder == "big":
+            packed.byteswap()
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, hz, len(packed)))
+                f.write(packed.tobytes())
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        self._account(_HEADER.size + len(packed) * 2)
+
+    def _account(self, added: int) -> None:
+        """Add a stored entry to the running total; scan and trim only when it may exceed the budget."""
+        with self._lock:
+            if self._total is not None:
+                # Overwritten entries are counted twice, which only brings the next scan forward
+                self._total += added
+                if self._total <= self.max_bytes:
+                    return
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits its budget (caller holds the lock)."""
+        entries = []
+        total = 0
+        try:
+            for sub in os.scandir(self.directory):
+                if not sub.is_dir():
+                    continue
+                for e in os.scandir(sub.path):
+                    if e.name.endswith(".env"):
+                        st = e.stat()
+                        entries.append((st.st_mtime, st.st_size, e.path))
+                        total += st.st_size
+        except OSError:
+            return
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+                if total <= self.max_bytes * 0.9:
+                    break
+        self._total = total
@@ -0,0 +1,407 @@
+"""
+Structured ffmpeg progress engine shared by every conversion runner.
+
+ffmpeg is started with `-progress pipe:N -nostats`, so machine-readable progress
+blocks arrive on a dedicated pipe while stderr carries only log output. Both are
+read as raw bytes through a selector; only the keys of the most recent complete
+block are decoded, and typed ProgressEvent objects are emitted at a throttled rate
+together with instantaneous/smoothed throughput and an ETA.
+"""
+
+import os
+import selectors
+import subprocess
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterator, Optional
+
+from .resources import ResourceUsage, reap, record_operation
+
+# Minimum wall-clock seconds between two emitted events (the final one is always emitted)
+DEFAULT_EVENT_INTERVAL = 0.25
+
+# Weight of the newest sample in the exponential moving averages
+DEFAULT_SMOOTHING = 0.3
+
+# How many stderr log lines are kept per process
+LOG_LINES_KEPT = 500
+
+_READ_CHUNK = 65536
+
+
+@dataclass
+class ProgressEvent:
+    """One throttled snapshot of a running ffmpeg process."""
+
+    frame: int = 0
+    fps: float = 0.0
+    total_size: int = 0  # bytes written so far (including any resumed base)
+    out_time: float = 0.0  # seconds of media written (absolute, including any resumed base)
+    speed: float = 0.0  # ffmpeg's own cumulative speed factor
+    dup_frames: int = 0
+    drop_frames: int = 0
+    streams: Dict[str, float] = field(default_factory=dict)  # stream_<file>_<stream>_<stat> -> value
+    percent: int = 0
+    elapsed: float = 0.0  # wall seconds since the process was started
+    rate: float = 0.0  # instantaneous media seconds per wall second
+    smoothed_rate: float = 0.0
+    byte_rate: float = 0.0  # instantaneous output bytes per wall second
+    smoothed_byte_rate: float = 0.0
+    eta: Optional[float] = None  # estimated wall seconds remaining
+    ended: bool = False
+
+    @property
+    def size_mb(self) -> float:
+        return self.total_size / 1024 / 1024
+
+    def status_line(self) -> str:
+        """Compact ffmpeg-style stats line for display."""
+        t = max(0.0, self.out_time)
+        h, rem = divmod(t, 3600)
+        m, s = divmod(rem, 60)
+        parts = []
+        if self.frame:
+            parts.append(f"frame={self.frame}")
+            parts.append(f"fps={self.fps:.0f}")
+        parts.append(f"size={self.size_mb:.1f}MB")
+        parts.append(f"time={int(h):02d}:{int(m):02d}:{s:05.2f}")
+        if self.smoothed_byte_rate > 0:
+            parts.append(f"rate={self.smoothed_byte_rate / 1024 / 1024:.1f}MB/s")
+        parts.append(f"speed={self.smoothed_rate or self.speed:.2f}x")
+        return " ".join(parts)
+
+
+class ProgressTracker:
+    """
+    Turns raw `-progress` key/value blocks into ProgressEvents.
+
+    duration / total_frames / estimated_size describe the whole job; base_time and
+    base_size are what a previous (resumed) run already produced, so percent and ETA
+    stay relative to the full job.
+    """
+
+    def __init__(
+        self,
+        duration: float = 0.0,
+        total_frames: int = 0,
+        estimated_size: int = 0,
+        base_time: float = 0.0,
+        base_size: int = 0,
+        min_interval: float = DEFAULT_EVENT_INTERVAL,
+        smoothing: float = DEFAULT_SMOOTHING,
+    ):
+        self.duration = duration
+        self.total_frames = total_frames
+        self.estimated_size = estimated_size
+        self.base_time = base_time
+        self.base_size = base_size
+        self.min_interval = min_interval
+        self.smoothing = smoothing
+
+        self.start_time = time.monotonic()
+        self.last_event: Optional[ProgressEvent] = None
+        self._values: Dict[bytes, bytes] = {}
+        self._last_emit = 0.0
+        self._last_sample: Optional[tuple] = None  # (wall, out_time, total_size)
+        self._percent = 0
+
+    def feed_block(self, block: bytes) -> None:
+        """Merge one or more complete `key=value` lines (bytes) into the pending state."""
+        values = self._values
+        for line in block.split(b"\n"):
+            key, sep, value = line.partition(b"=")
+            if sep:
+                values[key.strip()] = value.strip()
+
+    def emit(self, force: bool = False) -> Optional[ProgressEvent]:
+        """Build an event from the pending state, unless throttled."""
+        now = time.monotonic()
+        ended = self._values.get(b"progress") == b"end"
+        if not force and not ended and now - self._last_emit < self.min_interval:
+            return None
+        if not self._values:
+            return None
+        self._last_emit = now
+        event = self._build(now, ended)
+        self.last_event = event
+        return event
+
+    def _build(self, now: float, ended: bool) -> ProgressEvent:
+        v = self._values
+        ev = ProgressEvent(elapsed=now - self.start_time, ended=ended)
+        ev.frame = _to_int(v.get(b"frame"))
+        ev.fps = _to_float(v.get(b"fps"))
+        ev.dup_frames = _to_int(v.get(b"dup_frames"))
+        ev.drop_frames = _to_int(v.get(b"drop_frames"))
+        ev.speed = _to_float(v.get(b"speed", b"").rstrip(b"x"))
+        ev.total_size = self.base_size + _to_int(v.get(b"total_size"))
+
+        # ffmpeg reports microseconds under both out_time_us and the misnamed out_time_ms
+        raw_us = v.get(b"out_time_us") or v.get(b"out_time_ms")
+        out_time = _to_int(raw_us) / 1_000_000.0 if raw_us else 0.0
+        ev.out_time = self.base_time + max(0.0, out_time)
+
+        for key, value in v.items():
+            if key.startswith(b"stream_"):
+                ev.streams[key.decode("ascii", "replace")] = _to_float(value)
+
+        # Stream-copy jobs often report no frames / N/A times: fall back to size
+        if ev.out_time <= self.base_time and self.estimated_size > 0 and self.duration > 0:
+            ev.out_time = max(ev.out_time, self.duration * ev.total_size / self.estimated_size)
+
+        # Throughput: instantaneous since the last event, smoothed with an EMA
+        prev = self.last_event
+        if self._last_sample:
+            dt = now - self._last_sample[0]
+            if dt > 0:
+                ev.rate = max(0.0, (ev.out_time - self._last_sample[1]) / dt)
+                ev.byte_rate = max(0.0, (ev.total_size - self._last_sample[2]) / dt)
+        elif ev.elapsed > 0:
+            # First sample: prefer ffmpeg's own speed, our clock includes process startup
+            ev.rate = ev.speed or max(0.0, (ev.out_time - self.base_time) / ev.elapsed)
+            ev.byte_rate = max(0.0, (ev.total_size - self.base_size) / ev.elapsed)
+        a = self.smoothing
+        if prev and prev.smoothed_rate > 0:
+            ev.smoothed_rate = a * ev.rate + (1 - a) * prev.smoothed_rate
+            ev.smoothed_byte_rate = a * ev.byte_rate + (1 - a) * prev.smoothed_byte_rate
+        else:
+            ev.smoothed_rate = ev.rate
+            ev.smoothed_byte_rate = ev.byte_rate
+        self._last_sample = (now, ev.out_time, ev.total_size)
+
+        # Percent: best of frame/time/size signals, monotonic, never 100 before exit
+        pct = self._percent
+        if self.total_frames > 0 and ev.frame:
+            pct = max(pct, min(98, int(ev.frame * 100 / self.total_frames)))
+        if self.duration > 0:
+            pct = max(pct, min(99, int(ev.out_time * 100 / self.duration)))
+        if self.estimated_size > 0:
+            pct = max(pct, min(99, int(ev.total_size * 100 / self.estimated_size)))
+        if ended:
+            pct = 99
+        self._percent = pct
+        ev.percent = pct
+
+        # ETA from the smoothed media rate, or the byte rate when time is unknown
+        if self.duration > 0 and ev.smoothed_rate > 0:
+            ev.eta = max(0.0, self.duration - ev.out_time) / ev.smoothed_rate
+        elif self.estimated_size > 0 and ev.smoothed_byte_rate > 0:
+            ev.eta = max(0, self.estimated_size - ev.total_size) / ev.smoothed_byte_rate
+        if ended:
+            ev.eta = 0.0
+        return ev
+
+
+class StallWatchdog:
+    """
+    Detects a job that stopped making progress: neither out_time nor the muxed
+    size advanced and the output on disk (file, or directory of segments) did
+    not grow for `timeout` seconds.
+    """
+
+    # Minimum seconds between two looks at the output on disk
+    DISK_CHECK_INTERVAL = 5.0
+
+    def __init__(self, timeout: float, watch_path: Optional[str] = None):
+        self.timeout = timeout
+        self.watch_path = watch_path
+        self.last_progress = time.monotonic()
+        self._best = (-1.0, -1)
+        self._disk_size = -1
+        self._disk_checked = 0.0
+
+    def observe(self, event: ProgressEvent) -> None:
+        if event.out_time > self._best[0] or event.total_size > self._best[1]:
+            self._best = (max(event.out_time, self._best[0]), max(event.total_size, self._best[1]))
+            self.last_progress = time.monotonic()
+
+    def stalled(self) -> bool:
+        now = time.monotonic()
+        if self.watch_path and now - self._disk_checked >= self.DISK_CHECK_INTERVAL:
+            self._disk_checked = now
+            size = self._output_size(self.watch_path)
+            if size > self._disk_size:
+                if self._disk_size >= 0:
+                    self.last_progress = now
+                self._disk_size = size
+        return now - self.last_progress > self.timeout
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_progress
+
+    @staticmethod
+    def _output_size(path: str) -> int:
+        try:
+            if os.path.isdir(path):
+                return sum(e.stat().st_size for e in os.scandir(path) if e.is_file())
+            return os.path.getsize(path)
+        except OSError:
+            return -1
+
+
+class FFmpegProcess:
+    """
+    A running ffmpeg with progress on a dedicated pipe and logs on stderr.
+    Mirrors the parts of subprocess.Popen the runners use (pid, poll, wait,
+    terminate, kill, returncode) and adds events() / logs.
+    """
+
+    def __init__(
+        self,
+        cmd: list,
+        tracker: Optional[ProgressTracker] = None,
+        on_log: Optional[Callable[[str], None]] = None,
+    ):
+        self.tracker = tracker or ProgressTracker()
+        self.on_log = on_log
+        self.logs: Deque[str] = deque(maxlen=LOG_LINES_KEPT)
+        self.usage: Optional[ResourceUsage] = None  # set once the process has been reaped
+        self.stalled = False  # killed by a StallWatchdog
+        self._started = time.monotonic()
+
+        read_fd, write_fd = os.pipe()
+        # ffmpeg needs the argument right after its name; -nostats keeps stderr to real logs
+        self.cmd = [cmd[0], "-progress", f"pipe:{write_fd}", "-nostats"] + list(cmd[1:])
+        try:
+            self.process = subprocess.Popen(
+                self.cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                pass_fds=(write_fd,),
+            )
+        except Exception:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+        self._progress_fd = read_fd
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self.process.returncode
+
+    def poll(self) -> Optional[int]:
+        return self.process.poll()
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Wait for exit, reaping with resource accounting (see core.resources)."""
+        usage = reap(self.process, self._started, timeout)
+        if usage:
+            self.usage = usage
+            record_operation("convert", usage, self.cmd[-1])
+        return self.process.returncode
+
+    def terminate(self) -> None:
+        self.process.terminate()
+
+    def kill(self) -> None:
+        self.process.kill()
+
+    @property
+    def last_event(self) -> Optional[ProgressEvent]:
+        return self.tracker.last_event
+
+    def events(self, watchdog: Optional[StallWatchdog] = None) -> Iterator[ProgressEvent]:
+        """
+        Yield throttled progress events until ffmpeg closes both pipes.
+        stderr is consumed in the same loop so neither pipe can fill up and block ffmpeg.
+        With a watchdog, a stalled process is killed, `stalled` is set and iteration ends
+        without waiting for the pipes (a process stuck on a dead mount may not close them).
+        """
+        stderr = self.process.stderr
+        assert stderr is not None  # started with stderr=PIPE
+        sel = selectors.DefaultSelector()
+        stderr_fd = stderr.fileno()
+        sel.register(self._progress_fd, selectors.EVENT_READ, "progress")
+        sel.register(stderr_fd, selectors.EVENT_READ, "log")
+        progress_buf = bytearray()
+        log_buf = bytearray()
+        open_fds = 2
+        try:
+            while open_fds:
+                if watchdog and watchdog.stalled():
+                    self.stalled = True
+                    self._add_log(f"No progress for {watchdog.idle_seconds:.0f}s, killing stalled ffmpeg".encode())
+                    try:
+                        self.kill()
+                    except OSError:
+                        pass
+                    break
+                for key, _ in sel.select(timeout=1.0):
+                    chunk = os.read(key.fd, _READ_CHUNK)
+                    if not chunk:
+                        sel.unregister(key.fd)
+                        open_fds -= 1
+                        continue
+                    if key.data == "log":
+                        log_buf += chunk
+                        self._drain_logs(log_buf)
+                        continue
+
+                    progress_buf += chunk
+                    # Only complete blocks (terminated by a progress=... line) are parsed
+                    end = progress_buf.rfind(b"progress=")
+                    if end < 0:
+                        continue
+                    end = progress_buf.find(b"\n", end)
+                    if end < 0:
+                        continue
+                    self.tracker.feed_block(bytes(progress_buf[:end]))
+                    del progress_buf[: end + 1]
+                    event = self.tracker.emit()
+                    if event:
+                        if watchdog:
+                            watchdog.observe(event)
+                        yield event
+            if log_buf:
+                self._add_log(bytes(log_buf))
+        finally:
+            sel.close()
+            try:
+                os.close(self._progress_fd)
+            except OSError:
+                pass
+            stderr.close()
+
+    def _drain_logs(self, buf: bytearray) -> None:
+        # ffmpeg separates log lines with \n and overwrites with \r
+        cut = max(buf.rfind(b"\n"), buf.rfind(b"\r"))
+        if cut < 0:
+            return
+        block = bytes(buf[:cut])
+        del buf[: cut + 1]
+        for line in block.replace(b"\r", b"\n").split(b"\n"):
+            self._add_log(line)
+
+    def _add_log(self, raw: bytes) -> None:
+        line = raw.decode("utf-8", errors="replace").strip()
+        if not line:
+            return
+        self.logs.append(line)
+        if self.on_log:
+            self.on_log(line)
+
+
+def _to_int(value: Optional[bytes]) -> int:
+    if not value:
+        return 0
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def _to_float(value: Optional[bytes]) -> float:
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
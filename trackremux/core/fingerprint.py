@@ -0,0 +1,349 @@
+"""
+Library-wide audio fingerprint index.
+
+Duration alone cannot tell an alternate release of a film from an unrelated file
+of similar length. Every probed file therefore gets a compact content signature
+of its main audio track, computed in the background:
+
+1. Loudness envelopes of a few long windows at fixed fractions of the runtime
+   (the same DonorAligner extraction, served by the envelope cache).
+2. The set of local loudness shapes: the envelope is smoothed to SHAPE_STEP
+   bins and every run of SHAPE_LEN steps is quantized to rising / flat / falling.
+   The set does not depend on where a shape occurs, so differing intros, gain and
+   codec differences barely change it.
+3. A MinHash signature of that set (SIGNATURE_SIZE 32-bit values), whose
+   agreement estimates the Jaccard similarity of two files' shape sets.
+
+Signatures are banded for locality-sensitive hashing: files sharing any band are
+candidates, and only those are compared, so a lookup touches a handful of
+buckets instead of the whole library. The index is persisted to
+$XDG_DATA_HOME/trackremux/fingerprints.json.
+"""
+
+import collections
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+from .history import _history_dir
+
+# MinHash / LSH layout: SIGNATURE_SIZE = BANDS * ROWS
+# (2-row bands: pairs at the similarity of a foreign-language dub, ~0.2, still collide)
+SIGNATURE_SIZE = 128
+BANDS = 64
+ROWS = SIGNATURE_SIZE // BANDS
+
+# Files whose estimated shape-set similarity reaches this share content
+MIN_SIMILARITY = 0.18
+
+_PRIME = (1 << 61) - 1
+_MASK32 = 0xFFFFFFFF
+_rng = random.Random(0x7E4C)
+_HASH_PARAMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(SIGNATURE_SIZE)]
+
+
+class Fingerprinter:
+    """Computes the MinHash signature of one audio stream."""
+
+    WINDOWS = (0.25, 0.5, 0.75)  # window starts as fractions of the runtime
+    WINDOW_SECS = 90.0           # long enough to keep most content when intros differ by ~30 s
+    SHAPE_STEP = 0.5             # seconds per smoothed bin
+    SHAPE_HOP = 0.1              # seconds between successive shapes
+    SHAPE_LEN = 10               # steps per shape (5 s)
+    DEADZONE_DB = 1.5            # steps smaller than this count as flat
+    MIN_ACTIVE_STEPS = 3         # shapes with fewer rising/falling steps are ignored (silence, drones)
+    MIN_SHAPES = 50              # fewer distinct shapes than this: no usable signature
+
+    @classmethod
+    def windows(cls, duration: float) -> list[tuple[float, float]]:
+        length = min(cls.WINDOW_SECS, duration / (len(cls.WINDOWS) + 1))
+        return [(round(duration * f, 2), length) for f in cls.WINDOWS]
+
+    @classmethod
+    def shapes(cls, envelope: list[float], hz: float) -> set[int]:
+        """Quantized local loudness shapes of one envelope, as integers."""
+        step = max(1, int(round(cls.SHAPE_STEP * hz)))
+        hop = max(1, int(round(cls.SHAPE_HOP * hz)))
+        # Running mean over one step at every hop: bins[k] covers envelope[k*hop : k*hop + step]
+        prefix = [0.0]
+        for v in envelope:
+            prefix.append(prefix[-1] + v)
+        bins = [(prefix[i + step] - prefix[i]) / step for i in range(0, len(envelope) - step + 1, hop)]
+        stride = step // hop or 1  # hops per step
+        span = cls.SHAPE_LEN * stride
+        result = set()
+        for i in range(len(bins) - span):
+            code = 0
+            active = 0
+            for k in range(cls.SHAPE_LEN):
+                delta = bins[i + (k + 1) * stride] - bins[i + k * stride]
+                if delta > cls.DEADZONE_DB:
+                    digit = 2
+                    active += 1
+                elif delta < -cls.DEADZONE_DB:
+                    digit = 0
+                    active += 1
+                else:
+                    digit = 1
+                code = code * 3 + digit
+            if active >= cls.MIN_ACTIVE_STEPS:
+                result.add(code)
+        return result
+
+    @staticmethod
+    def minhash(shapes: set[int]) -> list[int]:
+        return [min(((a * s + b) % _PRIME) & _MASK32 for s in shapes) for a, b in _HASH_PARAMS]
+
+    @classmethod
+    def compute(cls, file_path: str, stream_index: int, duration: float) -> Optional[list[int]]:
+        """Signature of one audio stream, or None when it could not be decoded or is too quiet."""
+        from .donor import DonorAligner
+
+        if duration <= 0:
+            return None
+        windows = cls.windows(duration)
+        envelopes = DonorAligner._extract_windows(file_path, [stream_index], windows)
+        shapes: set[int] = set()
+        for w in range(len(windows)):
+            shapes |= cls.shapes(envelopes.get((stream_index, w), []), DonorAligner.SAMPLE_HZ)
+        if len(shapes) < cls.MIN_SHAPES:
+            return None
+        return cls.minhash(shapes)
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def main_audio_stream(media) -> Optional[int]:
+    """Stream index that represents a file: its default audio track, else the first one."""
+    audio = [t for t in media.tracks if t.codec_type == "audio"]
+    if not audio:
+        return None
+    return int(next((t.index for t in audio if t.is_default), audio[0].index))
+
+
+class FingerprintIndex:
+    """
+    Persistent signature store with an LSH bucket index.
+    Entries are tied to the file's size and mtime; a changed file is re-fingerprinted.
+    """
+
+    SAVE_INTERVAL = 10.0
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else os.path.join(_history_dir(), "fingerprints.json")
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}  # path -> {"size", "mtime_ns", "sig"}
+        self._buckets: dict[tuple[int, tuple[int, ...]], set[str]] = {}
+        self._dirty = False
+        self._last_save = 0.0
+        self._load()
+
+    def _load(self) -> None:
+        import json
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for path, entry in data.get("files", {}).items():
+            sig = entry.get("sig")
+            if isinstance(sig, list) and len(sig) == SIGNATURE_SIZE:
+                self._add(path, entry)
+
+    def save(self) -> None:
+        """Write the index to disk if it changed."""
+        import json
+
+        with self._lock:
+            if not self._dirty:
+                return
+            files = dict(self._entries)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"files": files}, f)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass  # Never crash the UI over the fingerprint index
+
+    @staticmethod
+    def _bands(sig: list[int]):
+        for b in range(BANDS):
+            yield (b, tuple(sig[b * ROWS:(b + 1) * ROWS]))
+
+    def _add(self, path: str, entry: dict) -> None:
+        self._entries[path] = entry
+        for key in self._bands(entry["sig"]):
+            self._buckets.setdefault(key, set()).add(path)
+
+    def _remove(self, path: str) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return
+        for key in self._bands(entry["sig"]):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(path)
+                if not bucket:
+                    del self._buckets[key]
+
+    @staticmethod
+    def _identity(path: str) -> Optional[tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def get(self, path: str) -> Optional[list[int]]:
+        """Signature of path, or None when missing or the file changed since."""
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if self._identity(path) != (entry["size"], entry["mtime_ns"]):
+            return None
+        return [int(v) for v in entry["sig"]]  # loaded from JSON
+
+    def put(self, path: str, sig: list[int]) -> None:
+        path = os.path.abspath(path)
+        identity = self._identity(path)
+        if identity is None:
+            return
+        with self._lock:
+            self._remove(path)
+            self._add(path, {"size": identity[0], "mtime_ns": identity[1], "sig": list(sig)})
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= self.SAVE_INTERVAL
+        if due:
+            self.save()
+
+    def similar(self, path: str, min_similarity: float = MIN_SIMILARITY) -> dict[str, float]:
+        """
+        Files sharing content with path: {other_path: similarity}, via the LSH buckets.
+        Empty when path has no signature yet.
+        """
+        path = os.path.abspath(path)
+        sig = self.get(path)
+        if sig is None:
+            return {}
+        with self._lock:
+            candidates = set()
+            for key in self._bands(sig):
+                candidates |= self._buckets.get(key, set())
+            candidates.discard(path)
+            sigs = {p: self._entries[p]["sig"] for p in candidates}
+        result = {}
+        for p, other in sigs.items():
+            s = similarity(sig, other)
+            if s >= min_similarity:
+                result[p] = s
+        return result
+
+    def compare(self, path: str, others: list[str]) -> dict[str, Optional[float]]:
+        """Similarity of path to each of others; None where either side is not fingerprinted yet."""
+        sig = self.get(path)
+        result: dict[str, Optional[float]] = {}
+        for other in others:
+            other_sig = self.get(other) if sig is not None else None
+            if sig is None or other_sig is None:
+                result[other] = None
+            else:
+                result[other] = similarity(sig, other_sig)
+        return result
+
+
+class FingerprintIndexer:
+    """
+    Background job filling a FingerprintIndex: one daemon thread works through the
+    files submitted by the scanner, one ffmpeg pass at a time, so it never competes
+    with the UI for more than a single decode. prioritize() moves files to the front,
+    e.g. the candidates of a donor picker that was just opened; it works even when
+    library-wide indexing is disabled.
+    """
+
+    def __init__(self, index: FingerprintIndex, enabled: bool = True):
+        self.index = index
+        self.enabled = enabled
+        self.done = 0
+        self._queue: collections.deque = collections.deque()  # (path, stream or None, duration)
+        self._queued: set[str] = set()
+        self._failed: set[str] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def submit(self, media) -> None:
+        """Queue a probed MediaFile (background priority) unless it is already fingerprinted."""
+        if not self.enabled or media is None or media.duration <= 0:
+            return
+        stream = main_audio_stream(media)
+        if stream is not None:
+            self._enqueue(os.path.abspath(media.path), stream, media.duration, front=False)
+
+    def prioritize(self, paths: list[str]) -> None:
+        """Fingerprint these files next, in the given order (they are probed first if needed)."""
+        for path in reversed(paths):
+            self._enqueue(os.path.abspath(path), None, 0.0, front=True)
+
+    def _enqueue(self, path: str, stream: Optional[int], duration: float, front: bool) -> None:
+        if path in self._failed or self.index.get(path) is not None:
+            return
+        with self._lock:
+            if path in self._queued:
+                if not front:
+                    return
+                self._queue = collections.deque(i for i in self._queue if i[0] != path)
+            self._queued.add(path)
+            if front:
+                self._queue.appendleft((path, stream, duration))
+            else:
+                self._queue.append((path, stream, duration))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _worker(self) -> None:
+        while True:
+            with self._lock:
+                item = self._queue.popleft() if self._queue else None
+                if item is None:
+                    self._wake.clear()
+            if item is None:
+                self._wake.wait()
+                continue
+            path, stream, duration = item
+            sig = None
+            try:
+                if stream is None:
+                    from .probe import MediaProbe
+
+                    media = MediaProbe.probe(path)
+                    stream, duration = main_audio_stream(media), media.duration
+                if stream is not None:
+                    sig = Fingerprinter.compute(path, stream, duration)
+            except Exception:
+                sig = None
+            with self._lock:
+                self._queued.discard(path)
+            if sig is None:
+                self._failed.add(path)
+            else:
+                self.index.put(path, sig)
+            self.done += 1
@@ -37,6 +37,7 @@ class Track:
     is_sdh_disposition: bool = False  # True when disposition.hearing_impaired == 1
     source_path: Optional[str] = None  # Path to external file (or None for main file)
     offset_seconds: float = 0.0  # Sync offset for donor tracks (applied via -itsoffset)
+    tempo_ratio: float = 1.0  # Donor speed correction: target secs per donor sec (applied via atempo)
     trackremux_id: Optional[int] = None  # Unique ID for the output file metadata
 
     @property
@@ -0,0 +1,216 @@
+"""
+Per-stream sizes measured from packets.
+
+Matroska files without BPS statistics tags carry no per-stream bitrate, and the
+codec-based guesses of MediaProbe._estimate_bit_rate can be off by 2x (a DTS-HD MA
+track is anywhere between 1.5 and 6 Mbit/s). That breaks the size-based progress
+estimate and the Explorer's audio size column. This module measures instead:
+
+- Small files (up to FULL_SCAN_BYTES) get a full packet scan: every packet size
+  is summed per stream, which is exact.
+- Larger files are sampled: ffprobe reads SAMPLE_WINDOWS windows of WINDOW_SECS
+  spread over the runtime (-read_intervals, so only those parts are read), and
+  each stream's bytes per second of packet duration are extrapolated to the
+  whole runtime.
+
+Results are kept per file (tied to size and mtime) in
+$XDG_DATA_HOME/trackremux/packet_sizes.json. MediaProbe.probe applies a stored
+measurement to every stream without a container bitrate, so the numbers survive
+restarts. A full scan clears bit_rate_is_estimated; a sampled one keeps it set.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from .history import _history_dir
+from .resources import record_operation, run_accounted
+
+# Files up to this size are scanned completely (cheaper than many seeks on small files)
+FULL_SCAN_BYTES = 512 * 1024 * 1024
+SAMPLE_WINDOWS = 6
+WINDOW_SECS = 10.0
+
+
+class PacketSampler:
+    """Measures per-stream byte totals with ffprobe packet listings."""
+
+    SCAN_TIMEOUT = 600
+
+    @staticmethod
+    def _intervals(duration: float) -> str:
+        """-read_intervals spec: SAMPLE_WINDOWS windows centred in equal parts of the runtime."""
+        length = min(WINDOW_SECS, duration / SAMPLE_WINDOWS)
+        starts = [duration * (i + 0.5) / SAMPLE_WINDOWS - length / 2 for i in range(SAMPLE_WINDOWS)]
+        return ",".join(f"{max(0.0, s):.3f}%+{length:.3f}" for s in starts)
+
+    @classmethod
+    def _scan(cls, file_path: str, streams: set[int], intervals: Optional[str]) -> dict[int, list[float]]:
+        """{stream_index: [bytes, seconds of packet duration]} over the read part of the file."""
+        cmd = ["ffprobe", "-v", "error", "-show_entries", "packet=stream_index,duration_time,size",
+               "-of", "compact=p=0"]
+        if intervals:
+            cmd += ["-read_intervals", intervals]
+        cmd.append(file_path)
+        result, usage = run_accounted(cmd, timeout=cls.SCAN_TIMEOUT)
+        record_operation("probe", usage, file_path)
+        if result.returncode != 0:
+            raise Exception(f"ffprobe failed: {result.stderr.decode('utf-8', errors='replace').strip()[-200:]}")
+
+        totals: dict[int, list[float]] = {}
+        for line in result.stdout.decode("utf-8", errors="replace").splitlines():
+            fields = dict(part.split("=", 1) for part in line.split("|") if "=" in part)
+            try:
+                idx = int(fields["stream_index"])
+                size = int(fields["size"])
+            except (KeyError, ValueError):
+                continue
+            if idx not in streams:
+                continue
+            entry = totals.setdefault(idx, [0.0, 0.0])
+            entry[0] += size
+            try:
+                entry[1] += float(fields.get("duration_time", ""))
+            except ValueError:
+                pass
+        return totals
+
+    @classmethod
+    def measure(cls, media, full: Optional[bool] = None) -> Optional[dict]:
+        """
+        Measure the audio and video streams of a probed MediaFile.
+        full: force (True) or forbid (False) a full scan; None picks by file size.
+        Returns {"mode": "full"|"sampled", "streams": {index: total bytes}} or None.
+        """
+        streams = {t.index for t in media.tracks if t.codec_type in ("audio", "video") and not t.is_attached_pic}
+        if not streams or media.duration <= 0:
+            return None
+        if full is None:
+            full = 0 < media.size_bytes <= FULL_SCAN_BYTES or media.duration <= SAMPLE_WINDOWS * WINDOW_SECS
+        try:
+            totals = cls._scan(media.path, streams, None if full else cls._intervals(media.duration))
+        except Exception:
+            return None
+
+        result = {}
+        for idx, (size, seconds) in totals.items():
+            if full:
+                result[idx] = int(size)
+            elif seconds > 0:
+                result[idx] = int(size / seconds * media.duration)
+        if not result:
+            return None
+        return {"mode": "full" if full else "sampled", "streams": result}
+
+    @staticmethod
+    def apply(media, measurement: dict) -> None:
+        """Set bit_rate from a measurement on every stream without a container bitrate."""
+        if not measurement or media.duration <= 0:
+            return
+        sizes = measurement.get("streams", {})
+        exact = measurement.get("mode") == "full"
+        for t in media.tracks:
+            total = sizes.get(t.index)
+            if total is None or (t.bit_rate and not t.bit_rate_is_estimated):
+                continue
+            t.bit_rate = int(total * 8 / media.duration)
+            t.bit_rate_is_estimated = not exact
+
+
+class PacketSizeIndex:
+    """
+    Persistent store of measurements, one entry per file (size/mtime checked on read).
+    Loaded on first use, saved at most every SAVE_INTERVAL seconds and on exit.
+    """
+
+    SAVE_INTERVAL = 10.0
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[dict[str, dict]] = None  # path -> {"size", "mtime_ns", "mode", "streams"}
+        self._dirty = False
+        self._last_save = 0.0
+
+    def _file(self) -> str:
+        # Resolved on first use: the shared instance is created at import time
+        if self.path is None:
+            self.path = os.path.join(_history_dir(), "packet_sizes.json")
+        return self.path
+
+    def _ensure_loaded(self) -> dict[str, dict]:
+        if self._entries is None:
+            entries = {}
+            try:
+                with open(self._file(), "r", encoding="utf-8") as f:
+                    entries = json.load(f).get("files", {})
+            except (OSError, ValueError, AttributeError):
+                pass
+            self._entries = entries
+        return self._entries
+
+    def get(self, media) -> Optional[dict]:
+        """Measurement for a probed MediaFile, or None when missing or the file changed since."""
+        path = os.path.abspath(media.path)
+        with self._lock:
+            entry = self._ensure_loaded().get(path)
+        if entry is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if (st.st_size, st.st_mtime_ns) != (entry.get("size"), entry.get("mtime_ns")):
+            return None
+        # JSON turned the stream indices into strings
+        return {"mode": entry.get("mode"), "streams": {int(k): v for k, v in entry.get("streams", {}).items()}}
+
+    def put(self, media, measurement: dict) -> None:
+        path = os.path.abspath(media.path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self._ensure_loaded()[path] = {
+                "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                "mode": measurement["mode"], "streams": measurement["streams"],
+            }
+            self._dirty = True
+            due = time.monotonic() - self._last_save >= self.SAVE_INTERVAL
+        if due:
+            self.save()
+
+    def save(self) -> None:
+        """Write the index to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            files = dict(self._ensure_loaded())
+            path = self._file()
+            self._dirty = False
+            self._last_save = time.monotonic()
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"files": files}, f)
+            os.replace(tmp, path)
+        except Exception:
+            pass  # Never crash the UI over measured sizes
+
+    def measure(self, media, full: Optional[bool] = None) -> bool:
+        """Measure media unless a measurement is stored, then apply it. True when bitrates were set."""
+        measurement = self.get(media)
+        if measurement is None:
+            measurement = PacketSampler.measure(media, full)
+            if measurement is None:
+                return False
+            self.put(media, measurement)
+        PacketSampler.apply(media, measurement)
+        return True
+
+
+# Shared instance: MediaProbe.probe applies stored measurements, the scanner adds new ones
+packet_sizes = PacketSizeIndex()
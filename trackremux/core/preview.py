@@ -1,11 +1,282 @@
+"""
+Audio previews.
+
+Preferred path: MediaPreview.play() streams. ffmpeg decodes the track to PCM on a
+pipe, a PreviewStream keeps the decoded audio in memory and a feeder thread
+relays it to a player reading WAV from stdin (ffplay, paplay or aplay), so sound
+starts as soon as the first packets are decoded and nothing blocks the curses
+loop. Seeks that land inside the already-decoded range (or a little ahead of
+it) only restart the player and reuse the running decoder.
+The first SEGMENT_SECS of every stream go to the PreviewCache, and prefetch()
+decodes likely next previews (neighbouring tracks, next seek position) in the
+background, so switching between tracks plays straight from the cache.
+Without a stdin-capable player (e.g. afplay only) a 30 s WAV snippet is
+extracted and played from a background thread instead.
+"""
+
+import collections
 import os
+import shutil
+import struct
 import subprocess
 import tempfile
+import threading
+import time
 from typing import Optional
 
+from .preview_cache import PreviewCache
+from .resources import reap, record_operation, run_accounted
+
+# Players that accept a WAV stream on stdin, in order of preference
+STREAM_PLAYERS = (
+    ["ffplay", "-nodisp", "-autoexit", "-v", "quiet", "-probesize", "32", "-analyzeduration", "0", "-i", "pipe:0"],
+    ["paplay"],
+    ["aplay", "-q", "-"],
+)
+
+# Shared cache of decoded preview segments (see preview_cache.py)
+preview_cache = PreviewCache()
+
+
+class PreviewStream:
+    """
+    One running decoder for (file, audio track) from start_time, plus the player
+    currently fed from its buffer. Decoding runs ahead of playback by at most
+    READ_AHEAD_SECS and stops after MAX_SECS; play() may be called repeatedly to
+    restart playback anywhere inside that range.
+    """
+
+    RATE = 44100
+    CHANNELS = 2
+    BYTES_PER_SEC = RATE * CHANNELS * 2
+    MAX_SECS = 300.0          # decoded audio kept per stream (~50 MB)
+    READ_AHEAD_SECS = 120.0   # how far the decoder may run ahead of the player
+    CHUNK = 16384
+    SEGMENT_SECS = 30.0       # cached per (file, track, start time)
+
+    def __init__(
+        self, file_path: str, track_index_in_type: int, start_time: float, player_cmd: list,
+        pcm: Optional[bytes] = None
+    ):
+        """pcm: cached audio from start_time; no decoder is started then."""
+        self.file_path = file_path
+        self.track_index_in_type = track_index_in_type
+        self.start_time = start_time
+        self.player_cmd = player_cmd
+        self.player: Optional[subprocess.Popen] = None
+        self._pcm = bytearray()
+        self._cond = threading.Condition()
+        self._cursor = 0       # byte position the feeder is at
+        self._generation = 0   # bumped by every play()/close(); stale feeders exit
+        self._eof = False
+        self._closed = False
+        self._started = time.monotonic()
+        self.decoder: Optional[subprocess.Popen] = None
+        if pcm is not None:
+            self._pcm += pcm
+            self._eof = True
+            return
+        cmd = decode_command(file_path, track_index_in_type, start_time, self.MAX_SECS)
+        self.decoder = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        threading.Thread(target=self._read_decoder, daemon=True).start()
+
+    def covers(self, file_path: str, track_index_in_type: int, start_time: float) -> bool:
+        """True when playback at start_time can be served by this decoder."""
+        if self._closed or file_path != self.file_path or track_index_in_type != self.track_index_in_type:
+            return False
+        offset = start_time - self.start_time
+        if offset < 0 or offset >= self.MAX_SECS:
+            return False
+        with self._cond:
+            decoded = len(self._pcm) / self.BYTES_PER_SEC
+            eof = self._eof
+        return offset < decoded or (not eof and offset - decoded <= self.READ_AHEAD_SECS)
+
+    def play(self, start_time: float, duration: float) -> None:
+        """(Re)start the player at start_time for `duration` seconds. Does not block."""
+        self._stop_player()
+        frame = self.CHANNELS * 2
+        pos = int((start_time - self.start_time) * self.RATE) * frame
+        end = pos + int(duration * self.RATE) * frame
+        with self._cond:
+            self._generation += 1
+            generation = self._generation
+            self._cursor = pos
+            self._cond.notify_all()
+        self.player = subprocess.Popen(
+            self.player_cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        threading.Thread(target=self._feed, args=(generation, self.player, pos, end), daemon=True).start()
+
+    def is_playing(self) -> bool:
+        return self.player is not None and self.player.poll() is None
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._generation += 1
+            self._cond.notify_all()
+        self._stop_player()
+        if self.decoder is not None and self.decoder.poll() is None:
+            self.decoder.kill()
+
+    def _stop_player(self) -> None:
+        player, self.player = self.player, None
+        if player is not None and player.poll() is None:
+            player.terminate()
+
+    def _wav_header(self, data_bytes: int) -> bytes:
+        """Canonical 44-byte PCM WAV header."""
+        frame = self.CHANNELS * 2
+        return (
+            b"RIFF" + struct.pack("<I", 36 + data_bytes) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, self.CHANNELS, self.RATE, self.BYTES_PER_SEC, frame, 16)
+            + b"data" + struct.pack("<I", data_bytes)
+        )
+
+    def _feed(self, generation: int, player: subprocess.Popen, pos: int, end: int) -> None:
+        stdin = player.stdin
+        assert stdin is not None  # started with stdin=PIPE
+        try:
+            stdin.write(self._wav_header(end - pos))
+            while pos < end:
+                with self._cond:
+                    while (
+                        len(self._pcm) <= pos and not self._eof
+                        and generation == self._generation and not self._closed
+                    ):
+                        self._cond.wait(0.5)
+                    if generation != self._generation or self._closed:
+                        return
+                    chunk = bytes(self._pcm[pos:min(len(self._pcm), pos + self.CHUNK, end)])
+                    if not chunk:
+                        return  # decoder finished before the requested range
+                    self._cursor = pos + len(chunk)
+                    self._cond.notify_all()
+                stdin.write(chunk)  # blocks at real-time speed: the player paces us
+                pos += len(chunk)
+        except (BrokenPipeError, OSError, ValueError):
+            pass
+        finally:
+            try:
+                stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+    def _read_decoder(self) -> None:
+        decoder = self.decoder
+        assert decoder is not None and decoder.stdout is not None  # only started with a decoder
+        stdout = decoder.stdout
+        fd = stdout.fileno()
+        ahead = int(self.READ_AHEAD_SECS * self.BYTES_PER_SEC)
+        segment = int(self.SEGMENT_SECS * self.BYTES_PER_SEC)
+        cached = False
+        try:
+            while True:
+                with self._cond:
+                    while not self._closed and len(self._pcm) - self._cursor > ahead:
+                        self._cond.wait(0.5)
+                    if self._closed:
+                        break
+                data = os.read(fd, 65536)
+                with self._cond:
+                    if not data:
+                        break
+                    self._pcm += data
+                    self._cond.notify_all()
+                    full = not cached and len(self._pcm) >= segment
+                if full:
+                    cached = True
+                    preview_cache.put(self.file_path, self.track_index_in_type, self.start_time, bytes(self._pcm[:segment]))
+        except OSError:
+            pass
+        finally:
+            with self._cond:
+                self._eof = True
+                self._cond.notify_all()
+            stdout.close()
+            if self._closed and decoder.poll() is None:
+                decoder.kill()
+            record_operation("snippet", reap(decoder, self._started), self.file_path)
+            if not cached and not self._closed and decoder.returncode == 0 and self._pcm:
+                # Track ends within the first segment
+                preview_cache.put(self.file_path, self.track_index_in_type, self.start_time, bytes(self._pcm))
+
+
+def decode_command(file_path: str, track_index_in_type: int, start_time: float, length: float) -> list:
+    """ffmpeg command decoding one audio track to PreviewStream PCM on stdout."""
+    return [
+        "ffmpeg", "-v", "quiet", "-nostdin",
+        "-ss", str(start_time),
+        "-i", file_path,
+        "-map", f"0:a:{track_index_in_type}",
+        "-t", str(length),
+        "-ac", str(PreviewStream.CHANNELS), "-ar", str(PreviewStream.RATE),
+        "-f", "s16le", "pipe:1",
+    ]
+
 
 class MediaPreview:
-    _current_process = None
+    _current_process: Optional[subprocess.Popen] = None
+    _stream: Optional[PreviewStream] = None
+    _player_cmd: Optional[list] = None
+    _player_checked = False
+    _generation = 0  # bumped by stop(); a background extraction that finishes late does not play
+    _lock = threading.Lock()
+    # Background prefetch of likely next previews: (file, track_index_in_type, start_time)
+    _prefetch_queue: collections.deque = collections.deque()
+    _prefetch_wake = threading.Event()
+    _prefetch_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def stream_player() -> Optional[list]:
+        """Command of the first installed player that reads WAV from stdin, or None."""
+        if not MediaPreview._player_checked:
+            MediaPreview._player_cmd = next((cmd for cmd in STREAM_PLAYERS if shutil.which(cmd[0])), None)
+            MediaPreview._player_checked = True
+        return MediaPreview._player_cmd
+
+    @staticmethod
+    def play(file_path: str, track_index_in_type: int, start_time: float = 0.0, duration: float = 30.0) -> str:
+        """
+        Start previewing an audio track at start_time without blocking the caller.
+        Returns "reused" (served by the running decoder), "cached" (from the
+        PreviewCache), "stream" (new decoder), "extract" (snippet being extracted
+        in the background) or "" on failure.
+        """
+        with MediaPreview._lock:
+            MediaPreview._stop_snippet()
+            player = MediaPreview.stream_player()
+            current = MediaPreview._stream
+            try:
+                if current is not None and current.covers(file_path, track_index_in_type, start_time):
+                    current.play(start_time, duration)
+                    return "reused"
+                if current is not None:
+                    current.close()
+                    MediaPreview._stream = None
+                if player is not None:
+                    pcm = preview_cache.get(file_path, track_index_in_type, start_time)
+                    stream = PreviewStream(file_path, track_index_in_type, start_time, player, pcm=pcm)
+                    MediaPreview._stream = stream
+                    stream.play(start_time, duration)
+                    return "cached" if pcm is not None else "stream"
+            except OSError:
+                failed, MediaPreview._stream = MediaPreview._stream, None
+                if failed is not None:
+                    failed.close()
+                return ""
+
+            generation = MediaPreview._generation
+
+        def _extract_and_play():
+            wav = MediaPreview.extract_snippet(file_path, "audio", track_index_in_type, start_time=start_time)
+            with MediaPreview._lock:
+                if wav and generation == MediaPreview._generation:
+                    MediaPreview.play_snippet(wav)
+
+        threading.Thread(target=_extract_and_play, daemon=True).start()
+        return "extract"
 
     @staticmethod
     def extract_snippet(
@@ -48,7 +319,8 @@ class MediaPreview:
             output_path,
         ]
 
-        result = subprocess.run(cmd)
+        result, usage = run_accounted(cmd, capture_output=False)
+        record_operation("snippet", usage, file_path)
         return output_path if result.returncode == 0 else None
 
     @staticmethod
@@ -56,7 +328,7 @@ class MediaPreview:
         """
         Plays the WAV file using afplay (Mac) or ffplay -nodisp.
         """
-        MediaPreview.stop()
+        MediaPreview._stop_snippet()
 
         # Use afplay on Mac for zero-window experience
         cmd = ["afplay", wav_path]
@@ -74,7 +346,64 @@ class MediaPreview:
             )
 
     @staticmethod
-    def stop():
+    def prefetch(items: list) -> None:
+        """
+        Decode [(file_path, track_index_in_type, start_time), ...] into the PreviewCache
+        in the background, in order. Replaces any prefetch still pending, so only the
+        neighbourhood of the latest preview is worked on.
+        """
+        with MediaPreview._lock:
+            MediaPreview._prefetch_queue.clear()
+            MediaPreview._prefetch_queue.extend(items)
+            if MediaPreview._prefetch_thread is None:
+                MediaPreview._prefetch_thread = threading.Thread(target=MediaPreview._prefetch_worker, daemon=True)
+                MediaPreview._prefetch_thread.start()
+        MediaPreview._prefetch_wake.set()
+
+    @staticmethod
+    def _prefetch_worker():
+        while True:
+            with MediaPreview._lock:
+                item = MediaPreview._prefetch_queue.popleft() if MediaPreview._prefetch_queue else None
+                if item is None:
+                    MediaPreview._prefetch_wake.clear()
+                stream = MediaPreview._stream
+            if item is None:
+                MediaPreview._prefetch_wake.wait()
+                continue
+            file_path, track_index_in_type, start_time = item
+            if stream is not None and stream.covers(file_path, track_index_in_type, start_time):
+                continue  # the running decoder will get there anyway
+            if preview_cache.contains(file_path, track_index_in_type, start_time):
+                continue
+            cmd = decode_command(file_path, track_index_in_type, start_time, PreviewStream.SEGMENT_SECS)
+            try:
+                result, usage = run_accounted(cmd, timeout=120)
+            except Exception:
+                continue
+            record_operation("snippet", usage, file_path)
+            if result.returncode == 0:
+                preview_cache.put(file_path, track_index_in_type, start_time, result.stdout)
+
+    @staticmethod
+    def is_playing() -> bool:
+        stream = MediaPreview._stream
+        if stream is not None and stream.is_playing():
+            return True
+        process = MediaPreview._current_process
+        return process is not None and process.poll() is None
+
+    @staticmethod
+    def _stop_snippet():
+        MediaPreview._generation += 1
         if MediaPreview._current_process and MediaPreview._current_process.poll() is None:
             MediaPreview._current_process.terminate()
-            MediaPreview._current_process = None
+        MediaPreview._current_process = None
+
+    @staticmethod
+    def stop():
+        """Stop playback. The decoder of a streaming preview is closed too."""
+        MediaPreview._stop_snippet()
+        stream, MediaPreview._stream = MediaPreview._stream, None
+        if stream is not None:
+            stream.close()
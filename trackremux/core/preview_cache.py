@@ -0,0 +1,117 @@
+"""
+Cache of decoded preview audio.
+
+Previews are raw PCM in the PreviewStream format (44.1 kHz stereo s16le). Each
+segment is keyed by file identity (absolute path, size, mtime), the audio track
+and the start time, so flipping back and forth between dubs plays from disk
+instead of decoding the source again. Segments are written by streams that
+played them and by the background prefetcher (tracks next to the cursor and the
+next seek position). The directory is trimmed, least recently used first,
+whenever it grows past its size budget; a running total of its size (one scan
+per session, then kept up to date by put()) tells when that is, so prefetching
+does not list and stat the directory for every segment.
+
+Stored in <tempdir>/trackremux-preview.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Optional
+
+# Total size budget of the cache directory (~37 segments of 30 s)
+DEFAULT_MAX_BYTES = 192 * 1024 * 1024
+
+
+def _cache_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "trackremux-preview")
+
+
+class PreviewCache:
+    """Size-bounded LRU cache of PCM preview segments: get()/put() by file, track and start time."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or _cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None  # bytes in the directory; None until scanned
+
+    def _entry_path(self, file_path: str, track_index_in_type: int, start_time: float) -> Optional[str]:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        identity = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}|a:{track_index_in_type}|{start_time:.2f}"
+        digest = hashlib.sha1(identity.encode("utf-8", errors="surrogateescape")).hexdigest()
+        return os.path.join(self.directory, digest + ".pcm")
+
+    def contains(self, file_path: str, track_index_in_type: int, start_time: float) -> bool:
+        path = self._entry_path(file_path, track_index_in_type, start_time)
+        return path is not None and os.path.exists(path)
+
+    def get(self, file_path: str, track_index_in_type: int, start_time: float) -> Optional[bytes]:
+        """Cached PCM, or None on a miss."""
+        path = self._entry_path(file_path, track_index_in_type, start_time)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            return None
+        return data or None
+
+    def put(self, file_path: str, track_index_in_type: int, start_time: float, pcm: bytes) -> None:
+        """Store a segment; never raises (a cache must not break previews)."""
+        path = self._entry_path(file_path, track_index_in_type, start_time)
+        if not path or not pcm:
+            return
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(pcm)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        self._account(len(pcm))
+
+    def _account(self, added: int) -> None:
+        """Add a stored segment to the running total; scan and trim only when it may exceed the budget."""
+        with self._lock:
+            if self._total is not None:
+                # Overwritten segments are counted twice, which only brings the next scan forward
+                self._total += added
+                if self._total <= self.max_bytes:
+                    return
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used segments until the cache fits its budget (caller holds the lock)."""
+        entries = []
+        total = 0
+        try:
+            for e in os.scandir(self.directory):
+                if e.name.endswith(".pcm"):
+                    st = e.stat()
+                    entries.append((st.st_mtime, st.st_size, e.path))
+                    total += st.st_size
+        except OSError:
+            return
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+                if total <= self.max_bytes * 0.9:
+                    break
+        self._total = total
@@ -1,8 +1,10 @@
 import json
 import os
-import subprocess
+from typing import Optional
 
 from .models import MediaFile, Track
+from .packet_sizes import PacketSampler, packet_sizes
+from .resources import record_operation, run_accounted
 
 
 class MediaProbe:
@@ -22,7 +24,8 @@ class MediaProbe:
             file_path,
         ]
 
-        result = subprocess.run(cmd, capture_output=True)
+        result, usage = run_accounted(cmd)
+        record_operation("probe", usage, file_path)
         if result.returncode != 0:
             err_msg = result.stderr.decode("utf-8", errors="replace")
             raise Exception(f"ffprobe failed: {err_msg}")
@@ -126,8 +129,49 @@ class MediaProbe:
 
             media_file.tracks.append(track)
 
+        # Packet sizes measured in an earlier scan beat container-less guesses
+        measurement = packet_sizes.get(media_file)
+        if measurement:
+            PacketSampler.apply(media_file, measurement)
+
         return media_file
 
+    @staticmethod
+    def count_packets(file_path: str) -> tuple[dict, float]:
+        """
+        Demux the whole file and count packets per stream.
+        Returns ({stream_index: packet_count}, container_duration_seconds).
+        """
+        cmd = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-count_packets",
+            "-show_entries",
+            "stream=index,nb_read_packets:format=duration",
+            "-print_format",
+            "json",
+            file_path,
+        ]
+        result, usage = run_accounted(cmd)
+        record_operation("probe", usage, file_path)
+        if result.returncode != 0:
+            err_msg = result.stderr.decode("utf-8", errors="replace")
+            raise Exception(f"ffprobe failed: {err_msg}")
+
+        data = json.loads(result.stdout.decode("utf-8", errors="replace"))
+        counts = {}
+        for s in data.get("streams", []):
+            try:
+                counts[int(s["index"])] = int(s.get("nb_read_packets", 0))
+            except (KeyError, ValueError):
+                pass
+        try:
+            duration = float(data.get("format", {}).get("duration", 0))
+        except ValueError:
+            duration = 0.0
+        return counts, duration
+
     @staticmethod
     def _estimate_bit_rate(track: Track) -> Optional[int]:
         """Provide a conservative bitrate estimate for common codecs when missing."""
@@ -1,6 +1,7 @@
 import json
 import os
 import threading
+import time
 from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -23,6 +24,14 @@ class QueuedTask:
     owner_pid: Optional[int] = None
     ffmpeg_pid: Optional[int] = None
     error_message: Optional[str] = None
+    # Checkpointed segments already written to staging: [{"file", "start", "end"}, ...]
+    completed_segments: List[Dict[str, Any]] = field(default_factory=list)
+    # Summed ResourceUsage (core.resources) of the ffmpeg runs of this task
+    resources: Dict[str, Any] = field(default_factory=dict)
+    # Stall watchdog: how often this task was killed for making no progress,
+    # and the epoch time before which it must not be retried (back-off)
+    stall_count: int = 0
+    retry_at: Optional[float] = None
 
     @classmethod
     def create(cls, media_file: MediaFile, output_mode: OutputMode, convert_audio: bool) -> "QueuedTask":
@@ -145,6 +154,8 @@ class QueueManager:
                         return t
                         
                     if t.status == "pending":
+                        if t.retry_at and t.retry_at > time.time():
+                            continue  # backing off after a stall
                         # Take task if:
                         # 1. We own it
                         # 2. It has no owner (legacy)
@@ -181,7 +192,8 @@ class QueueManager:
 
     def clean_stale_tasks(self):
         """Reset any tasks marked as running that belong to dead or non-trackremux processes,
-        or that belong to our own PID from a previous launch on startup."""
+        or that belong to our own PID from a previous launch on startup.
+        Recorded segments are kept so the task resumes where it stopped."""
         with self.lock:
             my_pid = os.getpid()
             changed = False
@@ -216,11 +228,71 @@ class QueueManager:
                     if status in ("completed", "failed"):
                         t.ffmpeg_pid = None
                         t.owner_pid = None
+                        if status == "completed":
+                            t.completed_segments = []
+                            t.retry_at = None
                     elif status == "pending":
                         t.ffmpeg_pid = None
                     self.save()
                     return
                     
+    def record_segments(self, task_id: str, segments: List[Dict[str, Any]]):
+        """Append newly completed segments to a task and persist them immediately."""
+        with self.lock:
+            for t in self._tasks:
+                if t.id == task_id:
+                    t.completed_segments.extend(segments)
+                    self.save()
+                    return
+
+    def reset_segments(self, task_id: str):
+        """Forget all recorded segments of a task so it restarts from zero."""
+        with self.lock:
+            for t in self._tasks:
+                if t.id == task_id:
+                    t.completed_segments = []
+                    self.save()
+                    return
+
+    def mark_stalled(self, task_id: str, max_retries: int, base_backoff: float = 60.0) -> bool:
+        """
+        Record a stall. Re-queues the task with exponential back-off, or fails it
+        once it stalled more than max_retries times. Returns True if re-queued.
+        """
+        with self.lock:
+            for t in self._tasks:
+                if t.id == task_id:
+                    t.stall_count += 1
+                    t.ffmpeg_pid = None
+                    if t.stall_count > max_retries:
+                        t.status = "failed"
+                        t.owner_pid = None
+                        t.retry_at = None
+                        t.error_message = f"Stalled {t.stall_count} times, giving up"
+                        requeued = False
+                    else:
+                        delay = min(30 * 60, base_backoff * 2 ** (t.stall_count - 1))
+                        t.status = "pending"
+                        t.retry_at = time.time() + delay
+                        t.error_message = f"Stalled (attempt {t.stall_count}), retrying in {int(delay)}s"
+                        requeued = True
+                    self.save()
+                    return requeued
+            return False
+
+    def add_task_resources(self, task_id: str, usage):
+        """Add a finished run's ResourceUsage to the task's running total."""
+        from .resources import ResourceUsage
+
+        with self.lock:
+            for t in self._tasks:
+                if t.id == task_id:
+                    if t.resources:
+                        usage = ResourceUsage.from_dict(t.resources).merged(usage)
+                    t.resources = usage.to_dict()
+                    self.save()
+                    return
+
     def remove_task(self, task_id: str):
         """Remove a task from the queue."""
         with self.lock:
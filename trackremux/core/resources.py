@@ -0,0 +1,245 @@
+"""
+Per-subprocess resource accounting.
+
+Children are reaped with wait4() to get their CPU user/sys time and max RSS.
+On Linux the exited child is first waited on without reaping it
+(waitid WNOWAIT), so its final /proc/<pid>/io read/write byte counters can
+still be read. The resulting ResourceUsage is attached to queue tasks and
+aggregated per operation kind (convert, probe, envelope, snippet), which shows
+whether a job type is CPU-, disk- or network-bound.
+"""
+
+import os
+import selectors
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+# How many recent operations are kept in memory for the summary
+RECENT_OPERATIONS = 500
+
+
+@dataclass
+class ResourceUsage:
+    """Resources consumed by one child process (or the sum over several)."""
+
+    wall_seconds: float = 0.0
+    user_seconds: float = 0.0
+    sys_seconds: float = 0.0
+    max_rss_kb: int = 0
+    read_bytes: Optional[int] = None  # storage bytes from /proc/<pid>/io (Linux only)
+    write_bytes: Optional[int] = None
+    rchar: Optional[int] = None  # all bytes read via syscalls, including network filesystems
+    wchar: Optional[int] = None
+    runs: int = 1
+
+    @property
+    def cpu_seconds(self) -> float:
+        return self.user_seconds + self.sys_seconds
+
+    @property
+    def cpu_utilization(self) -> float:
+        """Average number of busy cores over the wall time."""
+        return self.cpu_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def bottleneck(self) -> str:
+        """Rough classification: 'cpu' when cores were busy most of the time, else 'io'."""
+        return "cpu" if self.cpu_utilization >= 0.8 else "io"
+
+    def merged(self, other: "ResourceUsage") -> "ResourceUsage":
+        """Sum two usages (max RSS is the max), e.g. over the runs of a resumed job."""
+
+        def add(a, b):
+            if a is None:
+                return b
+            if b is None:
+                return a
+            return a + b
+
+        return ResourceUsage(
+            wall_seconds=self.wall_seconds + other.wall_seconds,
+            user_seconds=self.user_seconds + other.user_seconds,
+            sys_seconds=self.sys_seconds + other.sys_seconds,
+            max_rss_kb=max(self.max_rss_kb, other.max_rss_kb),
+            read_bytes=add(self.read_bytes, other.read_bytes),
+            write_bytes=add(self.write_bytes, other.write_bytes),
+            rchar=add(self.rchar, other.rchar),
+            wchar=add(self.wchar, other.wchar),
+            runs=self.runs + other.runs,
+        )
+
+    def summary(self) -> str:
+        """One-line human-readable summary."""
+        parts = [
+            f"wall {self.wall_seconds:.1f}s",
+            f"cpu {self.user_seconds:.1f}u/{self.sys_seconds:.1f}s ({self.cpu_utilization:.1f} cores)",
+            f"rss {self.max_rss_kb / 1024:.0f}MB",
+        ]
+        read = self.rchar if self.rchar is not None else self.read_bytes
+        write = self.wchar if self.wchar is not None else self.write_bytes
+        if read is not None and write is not None:
+            parts.append(f"io r {read / 1024 / 1024:.0f}MB w {write / 1024 / 1024:.0f}MB")
+            if self.wall_seconds > 0:
+                parts.append(f"{read / 1024 / 1024 / self.wall_seconds:.1f}MB/s in")
+        parts.append(f"{self.bottleneck()}-bound")
+        return " | ".join(parts)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ResourceUsage":
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+def read_proc_io(pid: int) -> Optional[Dict[str, int]]:
+    """Counters from /proc/<pid>/io, or None where unavailable (non-Linux, permissions)."""
+    try:
+        with open(f"/proc/{pid}/io", "r", encoding="ascii") as f:
+            values = {}
+            for line in f:
+                key, _, value = line.partition(":")
+                values[key.strip()] = int(value)
+            return values
+    except (OSError, ValueError):
+        return None
+
+
+def _usage_from(ru, io: Optional[Dict[str, int]], wall: float) -> ResourceUsage:
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    rss = ru.ru_maxrss // 1024 if sys.platform == "darwin" else ru.ru_maxrss
+    usage = ResourceUsage(
+        wall_seconds=wall,
+        user_seconds=ru.ru_utime,
+        sys_seconds=ru.ru_stime,
+        max_rss_kb=int(rss),
+    )
+    if io:
+        usage.read_bytes = io.get("read_bytes")
+        usage.write_bytes = io.get("write_bytes")
+        usage.rchar = io.get("rchar")
+        usage.wchar = io.get("wchar")
+    return usage
+
+
+def reap(process: subprocess.Popen, start: float, timeout: Optional[float] = None) -> Optional[ResourceUsage]:
+    """
+    Wait for process to exit and reap it with wait4(), setting process.returncode.
+    Returns its ResourceUsage, or None when the child was already reaped elsewhere.
+    Raises subprocess.TimeoutExpired like Popen.wait() when timeout elapses.
+    """
+    if process.returncode is not None:
+        return None
+    pid = process.pid
+    deadline = float("inf") if timeout is None else time.monotonic() + timeout
+    nohang = os.WNOHANG if timeout is not None else 0
+    io = None
+    try:
+        if hasattr(os, "waitid"):
+            # Wait for the exit without reaping so /proc/<pid>/io is still readable
+            while os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT | nohang) is None:
+                if timeout is not None and time.monotonic() >= deadline:
+                    raise subprocess.TimeoutExpired(process.args, timeout)
+                time.sleep(0.05)
+            io = read_proc_io(pid)
+            _, status, ru = os.wait4(pid, 0)
+        else:
+            while True:
+                wpid, status, ru = os.wait4(pid, nohang)
+                if wpid:
+                    break
+                if timeout is not None and time.monotonic() >= deadline:
+                    raise subprocess.TimeoutExpired(process.args, timeout)
+                time.sleep(0.05)
+    except ChildProcessError:
+        # Another thread (e.g. Popen.poll during cancellation) reaped it first
+        process.wait()
+        return None
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return _usage_from(ru, io, time.monotonic() - start)
+
+
+def run_accounted(
+    cmd: list, timeout: Optional[float] = None, capture_output: bool = True,
+    cwd: Optional[str] = None
+) -> Tuple[subprocess.CompletedProcess, Optional[ResourceUsage]]:
+    """
+    subprocess.run() replacement that also returns the child's ResourceUsage.
+    Output is captured as bytes; without capture_output the child inherits stdout/stderr.
+    """
+    start = time.monotonic()
+    pipe = subprocess.PIPE if capture_output else None
+    process = subprocess.Popen(cmd, stdout=pipe, stderr=pipe, cwd=cwd)
+    deadline = float("inf") if timeout is None else start + timeout
+    chunks: Dict[str, list[bytes]] = {"stdout": [], "stderr": []}
+
+    if capture_output:
+        stdout, stderr = process.stdout, process.stderr
+        assert stdout is not None and stderr is not None  # started with PIPE
+        sel = selectors.DefaultSelector()
+        sel.register(stdout, selectors.EVENT_READ, "stdout")
+        sel.register(stderr, selectors.EVENT_READ, "stderr")
+        try:
+            while sel.get_map():
+                wait: Optional[float] = None
+                if timeout is not None:
+                    wait = deadline - time.monotonic()
+                    if wait <= 0:
+                        process.kill()
+                        reap(process, start)
+                        raise subprocess.TimeoutExpired(cmd, timeout)
+                for key, _ in sel.select(timeout=wait):
+                    data = os.read(key.fd, 65536)
+                    if data:
+                        chunks[key.data].append(data)
+                    else:
+                        sel.unregister(key.fileobj)
+        finally:
+            sel.close()
+            stdout.close()
+            stderr.close()
+
+    remaining = None if timeout is None else max(0.0, deadline - time.monotonic())
+    try:
+        usage = reap(process, start, remaining)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        reap(process, start)
+        raise
+    result = subprocess.CompletedProcess(
+        cmd,
+        process.returncode,
+        b"".join(chunks["stdout"]) if capture_output else None,
+        b"".join(chunks["stderr"]) if capture_output else None,
+    )
+    return result, usage
+
+
+# ---------------------------------------------------------------------- #
+# Operation records                                                        #
+# ---------------------------------------------------------------------- #
+
+_operations_lock = threading.Lock()
+_operations: Deque[Tuple[str, str, ResourceUsage]] = deque(maxlen=RECENT_OPERATIONS)
+
+
+def record_operation(kind: str, usage: Optional[ResourceUsage], target: str = "") -> None:
+    """Remember the usage of one finished operation (convert, probe, envelope, snippet)."""
+    if usage is None:
+        return
+    with _operations_lock:
+        _operations.append((kind, target, usage))
+
+
+def operation_totals() -> Dict[str, ResourceUsage]:
+    """Summed usage per operation kind over the recent operations."""
+    totals: Dict[str, ResourceUsage] = {}
+    with _operations_lock:
+        for kind, _, usage in _operations:
+            totals[kind] = totals[kind].merged(usage) if kind in totals else usage
+    return totals
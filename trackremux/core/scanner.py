@@ -3,6 +3,7 @@ import os
 import threading
 import time
 
+from .packet_sizes import packet_sizes
 from .probe import MediaProbe
 
 
@@ -13,6 +14,8 @@ class GlobalScanner:
         self.processed_files = {}  # Cache: path -> MediaFile object
         self.queue_lock = threading.Lock()
         self.running = True
+        # Measure per-stream sizes from packets after probing (files without bitrate tags)
+        self.measure_bitrates = False
         self.thread = threading.Thread(target=self._worker, daemon=True)
         self.thread.start()
 
@@ -52,6 +55,11 @@ class GlobalScanner:
             for item in items:
                 self.background_queue.append(item)
 
+    def background_depth(self):
+        """Items waiting in the background queue (callers pace their submissions on it)."""
+        with self.queue_lock:
+            return len(self.background_queue)
+
     def stop(self):
         self.running = False
         if self.thread.is_alive():
@@ -91,6 +99,11 @@ class GlobalScanner:
                 # Probe the file
                 # This is blocking and can be slow
                 media = MediaProbe.probe(file_path)
+                if self.measure_bitrates and any(
+                    t.bit_rate_is_estimated or not t.bit_rate
+                    for t in media.tracks if t.codec_type in ("audio", "video") and not t.is_attached_pic
+                ):
+                    packet_sizes.measure(media)
 
                 # Signal completion
                 if callback:
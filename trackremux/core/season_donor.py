@@ -0,0 +1,217 @@
+"""
+Season-wide donor import.
+
+Pairs every episode of a BatchGroup with its counterpart in another release of
+the same season (same episode number, matching runtime per DonorCache), aligns
+all pairs concurrently on a process pool and flags pairs whose offset or tempo
+disagrees with the rest of the season. Releases of one season are normally
+offset by the same amount (same intro, same frame rate), so a deviating
+episode usually means a wrong pairing or a different cut.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .batch import BatchDetector, BatchGroup
+from .donor import Alignment, DonorAligner, run_process_pool
+from .models import MediaFile
+
+# Offsets further than this from the season median are flagged
+OUTLIER_SECS = 1.0
+
+# Pairs below this confidence are flagged (and not queued unless included by hand)
+LOW_CONFIDENCE = 0.5
+
+
+@dataclass
+class EpisodePair:
+    target: MediaFile
+    episode: tuple[int, int]  # (season, episode); season 0 = unknown
+    donor_path: str
+    match_pct: float
+    alignment: Optional[Alignment] = None
+    donor_media: Optional[MediaFile] = None
+    seconds: Optional[float] = None
+    error: str = ""
+    flag: str = ""  # "", "outlier", "tempo", "low", "failed"
+    included: bool = True
+    forced: bool = False  # low-confidence pair included by hand (not re-flagged)
+
+    @property
+    def done(self) -> bool:
+        return self.alignment is not None or bool(self.error)
+
+
+@dataclass
+class DonorRelease:
+    """One donor release (directory) and the episode pairs it covers."""
+
+    directory: str
+    pairs: list[EpisodePair] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(os.path.normpath(self.directory)) or self.directory
+
+
+def _same_episode(a: tuple[int, int], b: tuple[int, int]) -> bool:
+    return a[1] == b[1] and (a[0] == b[0] or a[0] == 0 or b[0] == 0)
+
+
+def find_releases(group: BatchGroup, donor_cache) -> list[DonorRelease]:
+    """
+    Candidate donor releases for a batch, most episodes covered first.
+    Each episode is paired with the best-ranked DonorCache candidate carrying the
+    same episode number in every directory that has one.
+    """
+    own_dirs = {os.path.dirname(os.path.abspath(f.path)) for f in group.files}
+    releases: dict[str, dict[str, EpisodePair]] = {}
+    scores: dict[str, float] = {}
+    for f in group.files:
+        key = BatchDetector.episode_key(f.filename)
+        if key is None:
+            continue
+        for donor_path, match_pct, score in donor_cache.get_donors(f.path, f.duration):
+            directory = os.path.dirname(donor_path)
+            if directory in own_dirs:
+                continue
+            donor_key = BatchDetector.episode_key(os.path.basename(donor_path))
+            if donor_key is None or not _same_episode(key, donor_key):
+                continue
+            pairs = releases.setdefault(directory, {})
+            if f.path in pairs:
+                continue  # candidates come best first
+            pairs[f.path] = EpisodePair(target=f, episode=key, donor_path=donor_path, match_pct=match_pct)
+            scores[directory] = scores.get(directory, 0.0) + score
+
+    result = [
+        DonorRelease(directory=d, pairs=sorted(pairs.values(), key=lambda p: p.episode))
+        for d, pairs in releases.items()
+    ]
+    result.sort(key=lambda r: (-len(r.pairs), -scores.get(r.directory, 0.0)))
+    return result
+
+
+def target_stream(media: MediaFile, audio_ordinal: int) -> Optional[int]:
+    """Stream index of the n-th audio track of an episode (falls back to the first)."""
+    audio = [t for t in media.tracks if t.codec_type == "audio"]
+    if not audio:
+        return None
+    return audio[audio_ordinal].index if audio_ordinal < len(audio) else audio[0].index
+
+
+def _align_episode(file_a: str, stream_a: int, duration_a: float, donor_path: str):
+    """Process-pool job: probe the donor episode and align it. Returns (alignment, donor media, seconds)."""
+    from .probe import MediaProbe
+
+    start = time.monotonic()
+    media_b = MediaProbe.probe(donor_path)
+    alignment = DonorAligner.align(file_a, stream_a, duration_a, media_b)
+    return alignment, media_b, time.monotonic() - start
+
+
+def flag_outliers(pairs: list[EpisodePair]) -> None:
+    """Set EpisodePair.flag from the season consensus of offsets and tempos."""
+    good = [p.alignment for p in pairs if p.alignment and p.alignment.confidence >= LOW_CONFIDENCE]
+    offsets = sorted(a.offset for a in good)
+    median = offsets[len(offsets) // 2] if offsets else None
+    tempos: dict[float, int] = {}
+    for a in good:
+        tempos[a.tempo_ratio] = tempos.get(a.tempo_ratio, 0) + 1
+    tempo = max(tempos, key=lambda t: tempos[t]) if tempos else None
+
+    for p in pairs:
+        if p.error:
+            p.flag = "failed"
+        elif p.alignment is None:
+            p.flag = ""
+        elif p.alignment.confidence < LOW_CONFIDENCE and not p.forced:
+            p.flag = "low"
+            p.included = False  # the checkbox shows exactly what gets queued
+        elif tempo is not None and p.alignment.tempo_ratio != tempo:
+            p.flag = "tempo"
+        elif median is not None and len(good) >= 3 and abs(p.alignment.offset - median) > OUTLIER_SECS:
+            p.flag = "outlier"
+        else:
+            p.flag = ""
+
+
+class SeasonDonorAlignment:
+    """Aligns all pairs of a DonorRelease on a bounded process pool, streaming results."""
+
+    def __init__(self, release: DonorRelease, audio_ordinal: int, workers: int = 0):
+        self.release = release
+        self.audio_ordinal = audio_ordinal
+        self.workers = workers if workers > 0 else min(4, os.cpu_count() or 1)
+        self.done = 0
+        self.started = 0.0
+        self.running = False
+        self._cancelled = threading.Event()
+
+    @property
+    def total(self) -> int:
+        return len(self.release.pairs)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def run(self, on_result=None) -> None:
+        """Blocking; call from a background thread. on_result(pair) after each episode."""
+        self.running = True
+        self.started = time.monotonic()
+        jobs = []
+        for i, pair in enumerate(self.release.pairs):
+            stream = target_stream(pair.target, self.audio_ordinal)
+            if stream is None:
+                pair.error = "no audio track"
+                self.done += 1
+                continue
+            jobs.append((i, (pair.target.path, stream, pair.target.duration, pair.donor_path)))
+
+        def _done(i, result, error):
+            pair = self.release.pairs[i]
+            if error is not None:
+                pair.error = str(error) or type(error).__name__
+            else:
+                pair.alignment, pair.donor_media, pair.seconds = result
+            self.done += 1
+            flag_outliers(self.release.pairs)
+            if on_result:
+                on_result(pair)
+
+        try:
+            run_process_pool(_align_episode, jobs, min(self.workers, max(1, len(jobs))), _done, self._cancelled)
+        finally:
+            flag_outliers(self.release.pairs)
+            self.running = False
+
+
+def attach_donor_tracks(media: MediaFile, pair: EpisodePair, donor_ordinals: list[int]) -> int:
+    """
+    Append the donor audio tracks at `donor_ordinals` (positions among the donor's
+    audio tracks) to media with the pair's offset and tempo. Returns how many were added.
+    """
+    import copy
+
+    if pair.donor_media is None or pair.alignment is None:
+        return 0
+    audio = [t for t in pair.donor_media.tracks if t.codec_type == "audio"]
+    next_id = max(
+        (t.trackremux_id if t.trackremux_id is not None else t.index for t in media.tracks), default=-1
+    ) + 1
+    added = 0
+    for ordinal in donor_ordinals:
+        if ordinal >= len(audio):
+            continue
+        track = copy.deepcopy(audio[ordinal])
+        track.source_path = pair.donor_path
+        track.offset_seconds = pair.alignment.offset
+        track.tempo_ratio = pair.alignment.tempo_ratio
+        track.enabled = True
+        track.trackremux_id = next_id + added
+        media.tracks.append(track)
+        added += 1
+    return added
@@ -0,0 +1,180 @@
+"""
+Resumable (segmented) remux support.
+
+Long queue jobs are written as a series of time segments inside the staging
+directory instead of one monolithic file. Every segment that ffmpeg finishes
+is recorded on the QueuedTask, so a task interrupted by a crash, a dropped SSH
+session or a shutdown resumes from the end of the last complete segment. Once
+all segments exist they are joined losslessly with the concat demuxer and the
+result is verified against the parts before it is finalized.
+"""
+
+import csv
+import os
+import subprocess
+from typing import List, Optional
+
+from .resources import record_operation, run_accounted
+
+# Length of one checkpointed segment in seconds of media time
+SEGMENT_SECONDS = 600
+
+# Jobs shorter than this are not worth segmenting
+MIN_SEGMENTED_DURATION = SEGMENT_SECONDS * 2
+
+# ffmpeg output pattern for segment files (segment_start_number picks the first index)
+SEGMENT_PATTERN = "seg_%05d.mkv"
+
+
+def segment_dir_for(staging_path: str) -> str:
+    """Return (and create) the directory holding the segments of a staged output."""
+    seg_dir = staging_path + ".parts"
+    os.makedirs(seg_dir, exist_ok=True)
+    return seg_dir
+
+
+def segment_list_path(segment_dir: str, start_number: int) -> str:
+    """Each ffmpeg run writes its own CSV list, named after its first segment."""
+    return os.path.join(segment_dir, f"segments_{start_number:05d}.csv")
+
+
+def prune_segments(segment_dir: str, completed: List[dict]) -> List[dict]:
+    """
+    Keep the longest contiguous run of recorded segments whose files still exist,
+    and delete anything else in the segment directory (partial segments, stale lists).
+    """
+    valid = []
+    expected_start = 0.0
+    for seg in completed:
+        path = os.path.join(segment_dir, seg["file"])
+        if not os.path.exists(path) or abs(seg["start"] - expected_start) > 0.5:
+            break
+        valid.append(seg)
+        expected_start = seg["end"]
+
+    keep = {seg["file"] for seg in valid}
+    try:
+        for name in os.listdir(segment_dir):
+            if name not in keep:
+                try:
+                    os.remove(os.path.join(segment_dir, name))
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return valid
+
+
+def remove_segment_dir(segment_dir: str) -> None:
+    """Delete the segment directory and everything inside it."""
+    if not os.path.isdir(segment_dir):
+        return
+    for name in os.listdir(segment_dir):
+        try:
+            os.remove(os.path.join(segment_dir, name))
+        except OSError:
+            pass
+    try:
+        os.rmdir(segment_dir)
+    except OSError:
+        pass
+
+
+class SegmentTracker:
+    """
+    Watches the CSV segment list written by ffmpeg's segment muxer and reports
+    newly completed segments with their times shifted into the absolute timeline
+    of the source (a resumed run starts its own timeline at 0).
+    """
+
+    def __init__(self, list_path: str, base_time: float):
+        self.list_path = list_path
+        self.base_time = base_time
+        self._seen = 0
+        self._last_size = -1
+
+    def poll(self) -> List[dict]:
+        """Return segments completed since the previous call."""
+        try:
+            size = os.path.getsize(self.list_path)
+        except OSError:
+            return []
+        if size == self._last_size:
+            return []
+        self._last_size = size
+
+        try:
+            with open(self.list_path, "r", encoding="utf-8", newline="") as f:
+                rows = [r for r in csv.reader(f) if len(r) >= 3]
+        except OSError:
+            return []
+
+        new = []
+        for row in rows[self._seen:]:
+            try:
+                new.append({
+                    "file": os.path.basename(row[0]),
+                    "start": round(self.base_time + float(row[1]), 6),
+                    "end": round(self.base_time + float(row[2]), 6),
+                })
+            except ValueError:
+                break
+        self._seen += len(new)
+        return new
+
+
+def concat_segments(segment_dir: str, segments: List[dict], output_path: str) -> subprocess.CompletedProcess:
+    """Losslessly join the recorded segments into output_path with the concat demuxer."""
+    list_file = os.path.join(segment_dir, "concat.txt")
+    with open(list_file, "w", encoding="utf-8") as f:
+        for seg in segments:
+            f.write(f"file '{seg['file']}'\n")
+
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+    cmd = [
+        "ffmpeg", "-hide_banner", "-v", "error", "-y",
+        "-f", "concat", "-safe", "0",
+        "-i", list_file,
+        "-map", "0",
+        "-c", "copy",
+        output_path,
+    ]
+    result, usage = run_accounted(cmd)
+    record_operation("concat", usage, output_path)
+    result.stdout = result.stdout.decode("utf-8", errors="replace")
+    result.stderr = result.stderr.decode("utf-8", errors="replace")
+    return result
+
+
+def verify_concat(
+    segment_dir: str, segments: List[dict], output_path: str, source_duration: float
+) -> Optional[str]:
+    """
+    Compare the joined output against its parts.
+    Per-stream packet counts must match exactly and durations must agree.
+    Returns None when the output is sound, otherwise a human-readable reason.
+    """
+    from .probe import MediaProbe
+
+    expected: dict = {}
+    parts_duration = 0.0
+    for seg in segments:
+        counts, duration = MediaProbe.count_packets(os.path.join(segment_dir, seg["file"]))
+        for idx, n in counts.items():
+            expected[idx] = expected.get(idx, 0) + n
+        parts_duration += duration
+
+    actual, out_duration = MediaProbe.count_packets(output_path)
+    if actual != expected:
+        return f"Packet count mismatch after join: expected {expected}, got {actual}"
+
+    if abs(out_duration - parts_duration) > 1.0:
+        return f"Duration mismatch after join: parts {parts_duration:.2f}s, output {out_duration:.2f}s"
+
+    # The sum of the parts must also cover the source (allow 1% slack for container rounding)
+    if source_duration > 0 and abs(out_duration - source_duration) > max(2.0, source_duration * 0.01):
+        return f"Output duration {out_duration:.2f}s does not match source {source_duration:.2f}s"
+
+    return None
@@ -0,0 +1,250 @@
+"""
+Subtitle preview support.
+
+SubtitleCache extracts every text subtitle stream of a file (SRT, ASS/SSA,
+WebVTT, mov_text) with ONE ffmpeg pass, one output per stream, into a per-file
+cache directory keyed by file identity (absolute path, size, mtime). Previewing
+another stream of the same file, or the same one again, reads from the cache.
+Bitmap subtitles (PGS, VobSub, DVB) cannot be shown as text and are skipped.
+
+PagedText reads a text file lazily for the preview overlay: one sequential scan
+builds a sparse line-offset index (every INDEX_STEP-th line), and a page is read
+by seeking to the nearest indexed line, so huge files are never loaded or split
+in memory.
+
+Stored in $XDG_CACHE_HOME/trackremux/subtitles
+(falls back to ~/.cache/trackremux/subtitles).
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from array import array
+from typing import Optional
+
+from .resources import record_operation, run_accounted
+
+# Total size budget of the cache directory
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Text subtitle codecs -> (output extension, ffmpeg subtitle encoder)
+TEXT_CODECS = {
+    "subrip": ("srt", "copy"),
+    "srt": ("srt", "copy"),
+    "ass": ("ass", "copy"),
+    "ssa": ("ass", "copy"),
+    "webvtt": ("vtt", "copy"),
+    "mov_text": ("srt", "srt"),
+    "text": ("srt", "srt"),
+}
+
+
+def _cache_dir() -> str:
+    xdg = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(xdg, "trackremux", "subtitles")
+
+
+class SubtitleCache:
+    """Per-file cache of extracted text subtitle streams."""
+
+    DONE_MARKER = ".complete"
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or _cache_dir()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._running: dict[str, threading.Event] = {}  # entry dir -> set when its dump finished
+
+    @staticmethod
+    def is_text(codec_name: str) -> bool:
+        return codec_name in TEXT_CODECS
+
+    def _entry_dir(self, file_path: str) -> Optional[str]:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        identity = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}"
+        digest = hashlib.sha1(identity.encode("utf-8", errors="surrogateescape")).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    @staticmethod
+    def _stream_file(entry: str, stream_index: int, codec_name: str) -> str:
+        return os.path.join(entry, f"s{stream_index}.{TEXT_CODECS[codec_name][0]}")
+
+    def get(self, file_path: str, stream_index: int, codec_name: str) -> Optional[str]:
+        """Path of the extracted stream, or None when it is not (yet) cached."""
+        entry = self._entry_dir(file_path)
+        if not entry or not self.is_text(codec_name):
+            return None
+        if not os.path.exists(os.path.join(entry, self.DONE_MARKER)):
+            return None
+        path = self._stream_file(entry, stream_index, codec_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            os.utime(entry)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return path
+
+    def extract(self, file_path: str, streams: list[tuple[int, str]], timeout: float = 600) -> bool:
+        """
+        Dump all text streams [(stream_index, codec_name), ...] of file_path in one
+        ffmpeg pass. Blocking; concurrent calls for the same file wait for the first.
+        Returns True when the cache entry is complete.
+        """
+        entry = self._entry_dir(file_path)
+        streams = [(idx, codec) for idx, codec in streams if self.is_text(codec)]
+        if not entry or not streams:
+            return False
+        if os.path.exists(os.path.join(entry, self.DONE_MARKER)):
+            return True
+
+        with self._lock:
+            running = self._running.get(entry)
+            if running is None:
+                running = self._running[entry] = threading.Event()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            running.wait(timeout)
+            return os.path.exists(os.path.join(entry, self.DONE_MARKER))
+
+        try:
+            tmp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.rmtree(tmp, ignore_errors=True)
+            try:
+                os.makedirs(tmp, exist_ok=True)
+            except OSError:
+                return False  # cache directory not writable
+            cmd = ["ffmpeg", "-v", "error", "-nostdin", "-y", "-i", file_path]
+            for idx, codec in streams:
+                encoder = TEXT_CODECS[codec][1]
+                cmd += ["-map", f"0:{idx}", "-c:s", encoder, self._stream_file(tmp, idx, codec)]
+            try:
+                result, usage = run_accounted(cmd, timeout=timeout)
+            except (OSError, subprocess.TimeoutExpired):
+                shutil.rmtree(tmp, ignore_errors=True)
+                return False
+            record_operation("subtitles", usage, file_path)
+            if result.returncode != 0:
+                shutil.rmtree(tmp, ignore_errors=True)
+                return False
+            try:
+                open(os.path.join(tmp, self.DONE_MARKER), "w").close()
+            except OSError:
+                shutil.rmtree(tmp, ignore_errors=True)
+                return False  # e.g. disk full
+            shutil.rmtree(entry, ignore_errors=True)
+            try:
+                os.replace(tmp, entry)
+            except OSError:
+                shutil.rmtree(tmp, ignore_errors=True)
+                return os.path.exists(os.path.join(entry, self.DONE_MARKER))
+            self._evict()
+            return True
+        finally:
+            with self._lock:
+                self._running.pop(entry, None)
+            running.set()
+
+    def _evict(self) -> None:
+        """Delete least recently used file entries until the cache fits its budget."""
+        with self._lock:
+            entries = []
+            total = 0
+            try:
+                for e in os.scandir(self.directory):
+                    if not e.is_dir() or e.name.endswith(".tmp"):
+                        continue
+                    size = sum(f.stat().st_size for f in os.scandir(e.path))
+                    entries.append((e.stat().st_mtime, size, e.path))
+                    total += size
+            except OSError:
+                return
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                if total <= self.max_bytes * 0.9:
+                    break
+
+
+class PagedText:
+    """
+    Line-addressable view of a text file that never holds more than one page in memory.
+    Build the index once (build_index, O(file size) sequential read), then lines(start, n).
+    """
+
+    INDEX_STEP = 64        # one byte offset is kept per this many lines
+    CHUNK = 1024 * 1024
+
+    def __init__(self, path: str):
+        self.path = path
+        self.line_count = 0
+        self._offsets = array("Q")  # byte offset of lines 0, INDEX_STEP, 2*INDEX_STEP, ...
+        self.encoding = "utf-8"
+
+    @classmethod
+    def open(cls, path: str) -> "PagedText":
+        doc = cls(path)
+        doc.build_index()
+        return doc
+
+    def build_index(self) -> None:
+        with open(self.path, "rb") as f:
+            head = f.read(65536)
+            if b"\0" in head:
+                raise ValueError("binary file")
+            try:
+                head.decode("utf-8")
+            except UnicodeDecodeError as e:
+                # A multi-byte character cut at the end of the sample is still UTF-8
+                if e.start < len(head) - 4:
+                    self.encoding = "latin-1"
+            f.seek(0)
+            self._offsets = array("Q", [0])
+            count = 0
+            pos = 0
+            ends_with_newline = True
+            while True:
+                chunk = f.read(self.CHUNK)
+                if not chunk:
+                    break
+                start = 0
+                while True:
+                    nl = chunk.find(b"\n", start)
+                    if nl < 0:
+                        break
+                    count += 1
+                    if count % self.INDEX_STEP == 0:
+                        self._offsets.append(pos + nl + 1)
+                    start = nl + 1
+                ends_with_newline = chunk.endswith(b"\n")
+                pos += len(chunk)
+            self.line_count = count + (0 if ends_with_newline else 1)
+
+    def lines(self, start: int, n: int) -> list[str]:
+        """Up to n lines starting at line number start."""
+        start = max(0, min(start, self.line_count))
+        block = start // self.INDEX_STEP
+        if block >= len(self._offsets):
+            return []
+        result = []
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[block])
+            skip = start - block * self.INDEX_STEP
+            for raw in f:
+                if skip:
+                    skip -= 1
+                    continue
+                result.append(raw.rstrip(b"\r\n").decode(self.encoding, errors="replace").lstrip("\ufeff"))
+                if len(result) >= n:
+                    break
+        return result
@@ -0,0 +1,217 @@
+"""
+Historical throughput model.
+
+Every finished conversion records how many source bytes per second it achieved,
+keyed by source device, destination device, job type (stream copy vs. transcode
+per target codec) and a size bucket. Predictions back off from the exact key to
+progressively coarser ones, so they work from the first recorded job and get
+sharper as history accumulates.
+
+Stored in $XDG_DATA_HOME/trackremux/throughput.json
+(falls back to ~/.local/share/trackremux/throughput.json).
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from .history import _history_dir
+from .models import MediaFile
+
+# Oldest samples are dropped beyond this many records
+MAX_SAMPLES = 1000
+
+# Samples lose half their weight after this many days (devices and setups change)
+HALF_LIFE_DAYS = 30.0
+
+# Pseudo-count pulling a sparse specific key towards its coarser parent
+PRIOR_WEIGHT = 2.0
+
+
+def device_of(path: str) -> str:
+    """Identify the filesystem a path lives on (walks up to the nearest existing parent)."""
+    p = os.path.abspath(path)
+    while True:
+        try:
+            return f"dev{os.stat(p).st_dev:x}"
+        except OSError:
+            parent = os.path.dirname(p)
+            if parent == p:
+                return "unknown"
+            p = parent
+
+
+def job_type(media_file: MediaFile, convert_audio: bool = False, codec_overrides: dict = None) -> str:
+    """'copy', or 'transcode:<codecs>' listing the audio codecs the job encodes to."""
+    if not convert_audio:
+        return "copy"
+    from .converter import MediaConverter
+
+    targets = set()
+    a_idx = 0
+    for t in media_file.tracks:
+        if not t.enabled or t.codec_type != "audio":
+            continue
+        if t.codec_name.lower() in MediaConverter.HD_CODECS:
+            override = (codec_overrides or {}).get(a_idx)
+            entry = override or MediaConverter.get_audio_fallback_chain(t)[0]
+            targets.add(entry["codec"])
+        a_idx += 1
+    return "transcode:" + "+".join(sorted(targets)) if targets else "copy"
+
+
+def size_bucket(size_bytes: int) -> int:
+    """Power-of-two bucket of the source size in units of 256 MB."""
+    if size_bytes <= 0:
+        return 0
+    return max(0, int(math.log2(max(1.0, size_bytes / (256 * 1024 * 1024)))))
+
+
+class ThroughputModel:
+    """Records finished-job throughput and predicts durations of future jobs."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(_history_dir(), "throughput.json")
+        self._lock = threading.Lock()
+        self._samples: List[dict] = []
+        self._mtime = None
+
+    # ------------------------------------------------------------------ #
+    # Persistence                                                          #
+    # ------------------------------------------------------------------ #
+
+    def _reload(self) -> None:
+        """Re-read the store if another process or instance changed it."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._samples = [s for s in data.get("samples", []) if s.get("rate", 0) > 0]
+            self._mtime = mtime
+        except Exception:
+            pass
+
+    def _save(self) -> None:
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"samples": self._samples}, f)
+            os.replace(tmp, self.path)
+            self._mtime = os.path.getmtime(self.path)
+        except Exception:
+            pass  # Never crash a conversion over statistics
+
+    @property
+    def sample_count(self) -> int:
+        with self._lock:
+            self._reload()
+            return len(self._samples)
+
+    # ------------------------------------------------------------------ #
+    # Recording                                                            #
+    # ------------------------------------------------------------------ #
+
+    def record(
+        self,
+        media_file: MediaFile,
+        output_path: str,
+        convert_audio: bool,
+        seconds: float,
+        source_bytes: Optional[int] = None,
+        codec_overrides: dict = None,
+    ) -> None:
+        """
+        Record a finished run. source_bytes is how much of the source this run
+        processed (defaults to the whole file; a resumed run processes less).
+        """
+        if source_bytes is None:
+            source_bytes = media_file.size_bytes
+        if seconds <= 1.0 or source_bytes <= 0:
+            return
+        sample = {
+            "ts": time.time(),
+            "src": device_of(media_file.path),
+            "dst": device_of(output_path),
+            "job": job_type(media_file, convert_audio, codec_overrides),
+            "bucket": size_bucket(media_file.size_bytes),
+            "bytes": int(source_bytes),
+            "seconds": round(seconds, 3),
+            "rate": source_bytes / seconds,
+        }
+        with self._lock:
+            self._reload()
+            self._samples.append(sample)
+            if len(self._samples) > MAX_SAMPLES:
+                self._samples = self._samples[-MAX_SAMPLES:]
+            self._save()
+
+    # ------------------------------------------------------------------ #
+    # Prediction                                                           #
+    # ------------------------------------------------------------------ #
+
+    def predict_rate(self, src: str, dst: str, job: str, bucket: int) -> Tuple[Optional[float], int]:
+        """
+        Predicted bytes/second for a job key and the number of samples behind it.
+        Levels from coarse to exact: all jobs, job type, +devices, +size bucket.
+        Each level is a recency-weighted harmonic mean shrunk towards the level above.
+        """
+        with self._lock:
+            self._reload()
+            samples = list(self._samples)
+        if not samples:
+            return None, 0
+
+        now = time.time()
+        levels = [
+            lambda s: True,
+            lambda s: s["job"] == job,
+            lambda s: s["job"] == job and s["src"] == src and s["dst"] == dst,
+            lambda s: s["job"] == job and s["src"] == src and s["dst"] == dst and s["bucket"] == bucket,
+        ]
+        rate = None
+        used = 0
+        for match in levels:
+            weight = 0.0
+            inv_rate = 0.0  # harmonic mean: averages time per byte, not speed
+            n = 0
+            for s in samples:
+                if not match(s):
+                    continue
+                age_days = max(0.0, now - s.get("ts", now)) / 86400
+                w = 0.5 ** (age_days / HALF_LIFE_DAYS)
+                weight += w
+                inv_rate += w / s["rate"]
+                n += 1
+            if n == 0:
+                break
+            level_inv = inv_rate / weight
+            if rate is not None:
+                level_inv = (weight * level_inv + PRIOR_WEIGHT / rate) / (weight + PRIOR_WEIGHT)
+            rate = 1.0 / level_inv
+            used = n
+        return rate, used
+
+    def predict_seconds(
+        self, media_file: MediaFile, output_path: str, convert_audio: bool = False,
+        codec_overrides: dict = None
+    ) -> Optional[float]:
+        """Predicted wall-clock seconds for converting media_file, or None without history."""
+        if media_file.size_bytes <= 0:
+            return None
+        rate, _ = self.predict_rate(
+            device_of(media_file.path),
+            device_of(output_path),
+            job_type(media_file, convert_audio, codec_overrides),
+            size_bucket(media_file.size_bytes),
+        )
+        if not rate:
+            return None
+        return media_file.size_bytes / rate
@@ -1,3 +1,5 @@
+import os
+import subprocess
 import threading
 import time
 import logging
@@ -5,7 +7,20 @@ from typing import Optional
 
 from .queue import QueueManager, QueuedTask
 from .converter import MediaConverter
+from .encoders import encoder_capabilities, hd_audio_chains
+from .ffmpeg_progress import FFmpegProcess, ProgressEvent, StallWatchdog
+from .throughput import ThroughputModel
 from .models import OutputMode
+from .segments import (
+    MIN_SEGMENTED_DURATION,
+    SegmentTracker,
+    concat_segments,
+    prune_segments,
+    remove_segment_dir,
+    segment_dir_for,
+    segment_list_path,
+    verify_concat,
+)
 from ..tui.progress import resolve_output_path, resolve_staging_path, atomic_finalize
 
 logger = logging.getLogger(__name__)
@@ -17,13 +32,16 @@ class QueueWorker:
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self.current_task: Optional[QueuedTask] = None
-        self.current_process = None
+        self.current_process: Optional[FFmpegProcess] = None
         self.on_task_completed = None  # Callback for successful completion
+        self.on_update = None  # Callback when progress or status changes (UI wakeup)
         
         # Real-time progress state
         self.percent = 0
         self.status_line = ""
-        self.total_frames = 0
+        self.last_event: Optional[ProgressEvent] = None
+        self.throughput = ThroughputModel()
+        self._resumed_from = 0.0  # media seconds a resumed job skipped this run
 
     def start(self):
         if self._thread and self._thread.is_alive():
@@ -77,17 +95,12 @@ class QueueWorker:
         self.current_task = task
         self.percent = 0
         self.status_line = "Starting..."
+        self.last_event = None
         self.qm.update_task_status(task.id, "running")
         
         try:
             media_file = task.get_media_file()
             output_mode = task.get_output_mode()
-            
-            # Reconstruct total frames for progress
-            self.total_frames = 0
-            for track in media_file.tracks:
-                if track.codec_type == "video" and getattr(track, "nb_frames", 0):
-                    self.total_frames = max(self.total_frames, track.nb_frames)
 
             output_path = resolve_output_path(media_file, output_mode)
             staging_output = resolve_staging_path(output_path)
@@ -95,31 +108,29 @@ class QueueWorker:
             from .config import AppConfig
             config = AppConfig.load()
             
-            self.current_process = MediaConverter.convert(
-                media_file, staging_output, task.convert_audio
-            )
-            task.ffmpeg_pid = self.current_process.pid
-            self.qm.save()
-            
-            estimated_size_mb = MediaConverter.estimate_output_size(media_file, task.convert_audio) / 1024 / 1024
-            
-            for line in self.current_process.stdout:
-                if self._stop_event.is_set():
-                    break
-                self._update_progress(line.strip(), media_file.duration, estimated_size_mb)
-                
+            codec_overrides = self._pick_codecs(task, media_file, output_path)
             if self._stop_event.is_set():
                 self.qm.update_task_status(task.id, "pending")
                 return
-                
-            self.current_process.wait()
-            if self.current_process.returncode == 0:
+
+            run_start = time.monotonic()
+            self._resumed_from = 0.0
+            if media_file.duration >= MIN_SEGMENTED_DURATION:
+                ok = self._run_segmented(task, media_file, staging_output, config, codec_overrides)
+            else:
+                ok = self._run_single(task, media_file, staging_output, config, codec_overrides)
+
+            if ok is None:  # stopped
+                self.qm.update_task_status(task.id, "pending")
+                return
+
+            if ok:
+                self.percent = 100
+                self._record_throughput(task, media_file, output_path, time.monotonic() - run_start)
                 atomic_finalize(staging_output, output_path, output_mode)
                 self.qm.update_task_status(task.id, "completed")
                 if self.on_task_completed:
                     self.on_task_completed(task)
-            else:
-                self.qm.update_task_status(task.id, "failed", f"Process exited with code {self.current_process.returncode}")
                 
         except Exception as e:
             logger.error(f"Task {task.id} failed: {e}")
@@ -127,43 +138,178 @@ class QueueWorker:
         finally:
             self.current_task = None
             self.current_process = None
+            self._notify()
 
-    def _update_progress(self, line: str, duration: float, estimated_size_mb: float = 0.0):
-        if not line:
-            return
-            
-        if "=" in line:
-            parts = line.split("=", 1)
-            if len(parts) == 2:
-                key, value = [p.strip() for p in parts]
-                if key == "frame" and value.isdigit() and self.total_frames > 0:
-                    self.percent = min(98, int((int(value) / self.total_frames) * 100))
-                elif key in ("out_time_ms", "out_time_us") and duration > 0:
-                    try:
-                        current_seconds = float(value) / 1_000_000.0
-                        if current_seconds >= 0:
-                            time_pct = int((current_seconds / duration) * 100)
-                            if time_pct > self.percent:
-                                self.percent = min(99, time_pct)
-                    except Exception:
-                        pass
-                elif key == "total_size" and value.isdigit() and estimated_size_mb > 0:
-                    actual_size_mb = int(value) / 1024 / 1024
-                    size_pct = int((actual_size_mb / estimated_size_mb) * 100)
-                    if size_pct > self.percent:
-                        self.percent = min(99, size_pct)
-                elif key == "progress" and value == "end":
-                    self.percent = 100
-        elif line.startswith("frame="):
-            self.status_line = line
-            if duration > 0 and "time=" in line:
-                try:
-                    time_str = line.split("time=")[1].split()[0]
-                    if time_str != "N/A":
-                        h, m, s = time_str.split(":")
-                        current_seconds = float(h) * 3600 + float(m) * 60 + float(s)
-                        time_pct = int((current_seconds / duration) * 100)
-                        if time_pct > self.percent:
-                            self.percent = min(99, time_pct)
-                except Exception:
-                    pass
+    def _pick_codecs(self, task: QueuedTask, media_file, output_path: str) -> Optional[dict]:
+        """Audio codec per transcoded track, chosen by short trial encodes (None: nothing transcoded)."""
+        chains = hd_audio_chains(media_file, task.convert_audio)
+        if not chains:
+            return None
+        self.status_line = "Testing audio encoders..."
+        positions = encoder_capabilities.choose(media_file, chains, output_path, on_log=logger.info)
+        return {idx: chain[positions[idx]] for idx, (_track, chain) in chains.items()}
+
+    def _run_single(self, task: QueuedTask, media_file, staging_output: str, config, codec_overrides=None):
+        """Run the whole job as one ffmpeg process. Returns True/False, or None if stopped."""
+        process = self.current_process = MediaConverter.convert(
+            media_file, staging_output, task.convert_audio, codec_overrides=codec_overrides
+        )
+        task.ffmpeg_pid = process.pid
+        self.qm.save()
+
+        for event in process.events(self._watchdog(config, staging_output)):
+            if self._stop_event.is_set():
+                break
+            self._on_progress(event)
+
+        if self._stop_event.is_set():
+            return None
+        if process.stalled:
+            self._handle_stall(task, config, process)
+            return False
+
+        process.wait()
+        self._record_usage(task, process)
+        if process.returncode != 0:
+            self.qm.update_task_status(task.id, "failed", self._failure_message(process))
+            return False
+        return True
+
+    def _run_segmented(self, task: QueuedTask, media_file, staging_output: str, config, codec_overrides=None):
+        """
+        Run the job as checkpointed segments, resuming after the last segment recorded
+        on the task, then join and verify them into staging_output.
+        Returns True/False, or None if stopped.
+        """
+        seg_dir = segment_dir_for(staging_output)
+        segments = prune_segments(seg_dir, task.completed_segments)
+        if len(segments) != len(task.completed_segments):
+            # Drop records whose files vanished or that no longer line up
+            self.qm.reset_segments(task.id)
+            if segments:
+                self.qm.record_segments(task.id, segments)
+        task.completed_segments = list(segments)
+
+        resume_at = segments[-1]["end"] if segments else 0.0
+        # A finished run also records its final segment, so resume_at near the end means done
+        finished = bool(segments) and resume_at >= media_file.duration - 1.0
+
+        self._resumed_from = resume_at
+        if not finished:
+            if resume_at > 0:
+                logger.info(f"Resuming task {task.id} at {resume_at:.1f}s ({len(segments)} segments done)")
+                self.status_line = f"Resuming at {int(resume_at // 60)}m{int(resume_at % 60):02d}s ({len(segments)} segments done)..."
+            # Progress stays relative to the whole job, counting what earlier runs produced
+            tracker = MediaConverter.progress_tracker(
+                media_file, task.convert_audio,
+                base_time=resume_at,
+                base_size=sum(os.path.getsize(os.path.join(seg_dir, seg["file"])) for seg in segments),
+            )
+            start_number = len(segments)
+            process = self.current_process = MediaConverter.convert_segmented(
+                media_file, seg_dir, task.convert_audio, codec_overrides=codec_overrides,
+                start_time=resume_at, start_number=start_number, tracker=tracker
+            )
+            task.ffmpeg_pid = process.pid
+            self.qm.save()
+
+            seg_tracker = SegmentTracker(segment_list_path(seg_dir, start_number), resume_at)
+            for event in process.events(self._watchdog(config, seg_dir)):
+                if self._stop_event.is_set():
+                    break
+                self._on_progress(event)
+                new_segments = seg_tracker.poll()
+                if new_segments:
+                    segments.extend(new_segments)
+                    self.qm.record_segments(task.id, new_segments)
+
+            if self._stop_event.is_set():
+                return None
+            if process.stalled:
+                # Segments finished before the stall stay recorded, so the retry resumes
+                self._handle_stall(task, config, process)
+                return False
+
+            process.wait()
+            self._record_usage(task, process)
+            new_segments = seg_tracker.poll()
+            if new_segments:
+                segments.extend(new_segments)
+                self.qm.record_segments(task.id, new_segments)
+
+            if process.returncode != 0:
+                self.qm.update_task_status(task.id, "failed", self._failure_message(process))
+                return False
+
+        self.status_line = f"Joining {len(segments)} segments..."
+        result = concat_segments(seg_dir, segments, staging_output)
+        if result.returncode != 0:
+            self.qm.update_task_status(task.id, "failed", f"Segment join failed: {result.stderr.strip()[-200:]}")
+            return False
+
+        self.status_line = "Verifying joined output..."
+        problem = verify_concat(seg_dir, segments, staging_output, media_file.duration)
+        if problem:
+            # Start from scratch next time rather than re-joining the same parts
+            remove_segment_dir(seg_dir)
+            self.qm.reset_segments(task.id)
+            if os.path.exists(staging_output):
+                os.remove(staging_output)
+            self.qm.update_task_status(task.id, "failed", problem)
+            return False
+
+        remove_segment_dir(seg_dir)
+        return True
+
+    def _on_progress(self, event: ProgressEvent):
+        self.last_event = event
+        self.percent = event.percent
+        self.status_line = event.status_line()
+        self._notify()
+
+    def _notify(self):
+        if self.on_update:
+            try:
+                self.on_update()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _watchdog(config, watch_path: str) -> Optional[StallWatchdog]:
+        if config.stall_timeout <= 0:
+            return None
+        return StallWatchdog(config.stall_timeout, watch_path)
+
+    def _handle_stall(self, task: QueuedTask, config, process: FFmpegProcess):
+        """Reap the killed process if it lets go, then re-queue the task with back-off."""
+        try:
+            process.wait(timeout=10)
+            self._record_usage(task, process)
+        except subprocess.TimeoutExpired:
+            # Stuck in uninterruptible I/O (dead mount); it exits once the I/O returns
+            logger.warning(f"Stalled ffmpeg {process.pid} did not exit after SIGKILL")
+        requeued = self.qm.mark_stalled(task.id, config.stall_max_retries)
+        logger.warning(f"Task {task.id} stalled; {'re-queued' if requeued else 'giving up'}")
+        self.status_line = "Stalled, re-queued with back-off" if requeued else "Stalled too often, failed"
+
+    def _record_usage(self, task: QueuedTask, process: FFmpegProcess):
+        usage = process.usage
+        if usage:
+            self.qm.add_task_resources(task.id, usage)
+
+    def _record_throughput(self, task: QueuedTask, media_file, output_path: str, seconds: float):
+        """Feed the finished run into the throughput model (only the part processed this run)."""
+        source_bytes = media_file.size_bytes
+        if self._resumed_from > 0 and media_file.duration > 0:
+            remaining = max(0.0, media_file.duration - self._resumed_from) / media_file.duration
+            source_bytes = int(source_bytes * remaining)
+        if source_bytes < media_file.size_bytes * 0.05:
+            return  # too little work this run to say anything about throughput
+        self.throughput.record(media_file, output_path, task.convert_audio, seconds, source_bytes)
+
+    @staticmethod
+    def _failure_message(process) -> str:
+        msg = f"Process exited with code {process.returncode}"
+        if process.logs:
+            msg += f": {process.logs[-1]}"
+        return msg
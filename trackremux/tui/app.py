@@ -1,5 +1,6 @@
 import curses
 import os
+import signal
 import sys
 import time
 import traceback
@@ -9,11 +10,16 @@ from trackremux.core.preview import MediaPreview
 
 from ..core.config import AppConfig
 from ..core.donor import DonorCache
+from ..core.fingerprint import FingerprintIndex, FingerprintIndexer
 from ..core.models import OutputMode
+from ..core.packet_sizes import packet_sizes
+from ..core.background import background
+from ..core.dir_snapshot import dir_snapshots
 from ..core.scanner import GlobalScanner
 from .constants import APP_TIMEOUT_MS, KEY_CTRL_C
 from .editor import TrackEditor
 from .explorer import FileExplorer
+from .redraw import RedrawScheduler
 
 
 @dataclass
@@ -54,10 +60,15 @@ class TrackRemuxApp:
 
         # Initialize Global Scanner
         self.scanner = GlobalScanner()
+        self.scanner.measure_bitrates = self.config.measure_bitrates
 
         # Initialize Donor Cache
         self.donor_cache = DonorCache()
 
+        # Audio fingerprints of the library (donor candidate pre-filter), filled in the background
+        self.fingerprints = FingerprintIndex()
+        self.fingerprint_indexer = FingerprintIndexer(self.fingerprints, enabled=self.config.fingerprint_library)
+
         # Initialize Queue subsystem
         from ..core.queue import QueueManager
         from ..core.worker import QueueWorker
@@ -67,10 +78,30 @@ class TrackRemuxApp:
         self.pending_refreshes = set()
         self.queue_worker.on_task_completed = self._on_task_completed
 
+        # Frames are drawn on input, wakeups from background threads or view ticks only
+        self.redraw = RedrawScheduler(sys.stdin.fileno())
+        self.queue_worker.on_update = self.request_redraw
+
     def _on_task_completed(self, task):
         filename = os.path.basename(task.media_file_dict.get('path', ''))
+        dir_snapshots.invalidate()  # the output directory changed
         if filename:
             self.pending_refreshes.add(filename)
+            self.request_redraw()
+
+    def request_redraw(self):
+        """Wake the input loop and redraw the current view (callable from any thread)."""
+        self.redraw.request()
+
+    def _apply_resize(self):
+        """Adopt the new terminal size after SIGWINCH."""
+        self.redraw.resized = False
+        try:
+            size = os.get_terminal_size(sys.__stdout__.fileno())
+            curses.resizeterm(size.lines, size.columns)
+        except (OSError, ValueError, AttributeError, curses.error):
+            pass
+        self.stdscr.clear()
 
     def run(self):
         try:
@@ -140,6 +171,8 @@ class TrackRemuxApp:
                         for task in failed_tasks:
                             task.status = "pending"
                             task.error_message = None
+                            task.stall_count = 0
+                            task.retry_at = None
                         self.queue_manager.save()
                         break
                     elif key in (ord('n'), ord('N'), 27):  # ESC or N
@@ -151,23 +184,47 @@ class TrackRemuxApp:
             else:
                 self.current_view = FileExplorer(self, self.start_path)
 
-            self.stdscr.timeout(APP_TIMEOUT_MS)  # Non-blocking getch
+            self.stdscr.timeout(0)  # Non-blocking getch; the loop waits in select()
+            if hasattr(signal, "SIGWINCH"):
+                signal.signal(signal.SIGWINCH, self.redraw.on_resize)
             
             # Start worker immediately to pick up any pending or abandoned tasks
             if hasattr(self, "queue_worker") and not self.queue_worker.is_running():
                 self.queue_worker.start()
 
+            drawn_view = None
             while self.current_view:
+                view = self.current_view
                 if self.pending_refreshes:
-                    if hasattr(self.current_view, "refresh_metadata"):
+                    if hasattr(view, "refresh_metadata"):
                         refs = list(self.pending_refreshes)
                         self.pending_refreshes.clear()
-                        self.current_view.refresh_metadata(refs)
-                        
-                self.current_view.draw()
+                        view.refresh_metadata(refs)
+                        self.redraw.mark_dirty()
+
+                if self.redraw.resized:
+                    self._apply_resize()
+                if view is not drawn_view:
+                    self.redraw.mark_dirty()
+                if self.redraw.take_frame():
+                    view.draw()
+                    drawn_view = view
+
+                # Handle everything curses has buffered before sleeping again
                 key = self.stdscr.getch()
+                if key != -1:
+                    view.handle_input(key)
+                    self.redraw.mark_dirty()
+                    continue
 
-                self.current_view.handle_input(key)
+                # Views without time-dependent content sleep until input or a wakeup
+                interval_fn = getattr(view, "redraw_interval", None)
+                interval = interval_fn() if interval_fn else APP_TIMEOUT_MS / 1000
+                input_ready, _ = self.redraw.wait(interval)
+                if not input_ready:
+                    # Ticks and wakeups still reach the view, as the old getch() timeout did
+                    view.handle_input(-1)
+                    self.redraw.mark_dirty()
         except KeyboardInterrupt:
             # Graceful exit on Ctrl-C
             pass
@@ -178,9 +235,16 @@ class TrackRemuxApp:
             raise e
         finally:
             curses.mousemask(0)
+            if hasattr(signal, "SIGWINCH"):
+                signal.signal(signal.SIGWINCH, signal.SIG_DFL)
 
             # Ensure audio stops when quitting
             MediaPreview.stop()
+
+            # Persist the donor index for the next session
+            self.donor_cache.save()
+            self.fingerprints.save()
+            packet_sizes.save()
             
             # Stop worker
             if hasattr(self, "queue_worker"):
@@ -207,6 +271,21 @@ class TrackRemuxApp:
 
     def switch_view(self, new_view):
         self.current_view = new_view
+        # Queued background jobs of views that can no longer be returned to are dropped
+        background.cancel_except(self._live_views())
+
+    def _live_views(self):
+        """The current view and every view reachable from it through back_view."""
+        live = []
+        view = self.current_view
+        while view is not None and all(view is not v for v in live):
+            live.append(view)
+            view = getattr(view, "back_view", None)
+        return live
+
+    def is_live_view(self, view):
+        """True while view can still be returned to."""
+        return any(v is view for v in self._live_views())
 
     def toggle_mouse(self):
         self.mouse_enabled = not self.mouse_enabled
@@ -6,6 +6,7 @@ import time
 from ..core.converter import MediaConverter
 from ..core.history import copy_to_clipboard, save_command
 from ..core.models import OutputMode
+from ..core.throughput import ThroughputModel
 from .constants import KEY_ESC, KEY_Q_LOWER, KEY_Q_UPPER, KEY_HELP, KEY_H_LOWER, KEY_H_UPPER
 from .formatters import format_duration
 from .help import HelpView
@@ -45,6 +46,7 @@ class BatchProgressView:
         self.process = None
         self.percent = 0
         self.frame_status = ""
+        self.last_event = None  # latest ProgressEvent of the current file
         self.status = "Initializing Batch..."
 
         self.done = False
@@ -56,6 +58,7 @@ class BatchProgressView:
         self.end_time = None
 
         self._copy_status = ""  # clipboard feedback message
+        self.throughput = ThroughputModel()
 
         # Start conversion thread
         self.thread = threading.Thread(target=self._run_batch)
@@ -121,21 +124,7 @@ class BatchProgressView:
                 self.current_file = f
                 self.percent = 0
                 self.frame_status = ""
-
-                # Calculate total frames for progress bar
-                self.total_frames = 0
-                for track in f.tracks:
-                    if track.codec_type == "video":
-                        try:
-                            if "/" in track.avg_frame_rate:
-                                num, den = track.avg_frame_rate.split("/")
-                                fps = float(num) / float(den)
-                            else:
-                                fps = float(track.avg_frame_rate)
-                            self.total_frames = int(fps * f.duration)
-                            break
-                        except Exception:
-                            pass
+                self.last_event = None
 
                 fname = os.path.basename(f.filename)
                 self.status = f"Processing {i+1}/{len(self.files_to_process)}: {fname}"
@@ -156,14 +145,16 @@ class BatchProgressView:
                     cmd = MediaConverter.build_ffmpeg_command(f, staging_output, self.convert_audio)
                     # Save to history
                     save_command(cmd, f.path, output_path)
-                    self.process = MediaConverter.convert(f, staging_output, self.convert_audio)
-
+                    file_start = time.time()
+                    self.process = MediaConverter.convert(
+                        f, staging_output, self.convert_audio, on_log=self._add_log
+                    )
 
-                    # Read loop similar to ProgressView
-                    for line in self.process.stdout:
+                    # Same progress event loop as ProgressView
+                    for event in self.process.events():
                         if self.cancelled:
                             break
-                        self._update_status(line, f)
+                        self._update_status(event)
 
                     if self.cancelled:
                         break
@@ -171,6 +162,7 @@ class BatchProgressView:
                     self.process.wait()
 
                     if self.process.returncode == 0:
+                        self.throughput.record(f, output_path, self.convert_audio, time.time() - file_start)
                         # Success move
                         if os.path.exists(staging_output):
                             try:
@@ -220,64 +212,20 @@ class BatchProgressView:
         self.cancelled = True
         self.status = "Cancelling Batch..."
 
-    def _update_status(self, line, current_file):
-        line = line.strip()
-        if not line:
-            return
+    def _update_status(self, event):
+        self.last_event = event
+        self.percent = event.percent  # 100 is only set by process.wait() result
+        self.frame_status = event.status_line()
 
-        is_progress_internal = False
-        if "=" in line:
-            parts = line.split("=", 1)
-            if len(parts) == 2:
-                key, value = [p.strip() for p in parts]
-
-                progress_keys = (
-                    "frame",
-                    "fps",
-                    "bitrate",
-                    "total_size",
-                    "out_time_ms",
-                    "out_time_us",
-                    "out_time",
-                    "dup_frames",
-                    "drop_frames",
-                    "speed",
-                    "progress",
-                )
+    def _add_log(self, line):
+        with self.logs_lock:
+            self.logs.append(line)
+            if len(self.logs) > 200:
+                self.logs = self.logs[-200:]
 
-                if key in progress_keys or key.startswith("stream_"):
-                    is_progress_internal = True
-                    if key == "frame" and value.isdigit():
-                        current_frame = int(value)
-                        if self.total_frames > 0:
-                            self.percent = int((current_frame / self.total_frames) * 100)
-                    elif key in ("out_time_ms", "out_time_us"):
-                        try:
-                            # ffmpeg -progress uses microseconds for both keys
-                            current_seconds = float(value) / 1_000_000.0
-                            if current_file and current_file.duration > 0:
-                                time_pct = int((current_seconds / current_file.duration) * 100)
-                                if time_pct > self.percent:
-                                    self.percent = min(99, time_pct)
-                        except Exception:
-                            pass
-                    elif key == "progress" and value == "end":
-                        self.percent = 99  # 100 is only set by process.wait() result
-
-                    if self.percent == 100 and key != "progress":
-                        self.percent = 99
-
-
-        if line.startswith("frame="):
-            self.frame_status = line
-        elif not is_progress_internal:
-            with self.logs_lock:
-                for part in line.split("\r"):
-                    part = part.strip()
-                    if part and not part.startswith("frame="):
-                        self.logs.append(part)
-                if len(self.logs) > 200:
-                    self.logs = self.logs[-200:]
+    def redraw_interval(self):
+        """Seconds between unprompted redraws (elapsed timer and per-file progress)."""
+        return None if self.done else 0.25
 
     def draw(self):
         self.app.stdscr.erase()
@@ -317,19 +265,16 @@ class BatchProgressView:
         # ETA and Speed
         elapsed = time.time() - self.start_time
         if self.percent > 0 and not self.done:
-            # We use local % for the current file to estimate remaining batch time?
-            # Or just for this file. Let's do it for the whole batch for better UX.
-            # batch_percent = (self.current_idx + self.percent/100.0) / len(self.files_to_process)
-            batch_percent = (self.current_idx + self.percent / 100.0) / len(self.files_to_process)
-            total_est = elapsed / batch_percent
-            remaining = total_est - elapsed
-            speed = batch_percent * 100.0 / elapsed  # batch % per second
-            eta_str = f" Batch ETA: {format_duration(remaining)} | Speed: {speed:.2f} files/min "
-            # Actually files/min is more intuitive for batch
-            files_per_min = (self.current_idx + self.percent / 100.0) / (elapsed / 60.0)
+            # Batch ETA from overall files/min; the current file uses its own smoothed ETA
+            files_done = self.current_idx + self.percent / 100.0
+            remaining = elapsed / files_done * len(self.files_to_process) - elapsed
+            files_per_min = files_done / (elapsed / 60.0)
             eta_str = f" Batch ETA: {format_duration(remaining)} | Speed: {files_per_min:.1f} files/min "
+            event = self.last_event
+            if event and event.eta is not None:
+                eta_str += f"| File ETA: {format_duration(event.eta)} @ {event.smoothed_rate:.2f}x "
 
-            self.app.stdscr.addstr(y + 4, 0, eta_str.center(width), curses.color_pair(3))
+            self.app.stdscr.addstr(y + 4, 0, eta_str.center(width)[:width - 1], curses.color_pair(3))
 
         self.app.stdscr.addstr(y + 5, 1, self.status.center(width), curses.color_pair(3))
 
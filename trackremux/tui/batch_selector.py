@@ -18,6 +18,10 @@ class BatchSelectorView:
     def batches(self):
         return self.explorer.batches
 
+    def redraw_interval(self):
+        """Seconds between unprompted redraws (None: only on input or wakeups)."""
+        return None
+
     def draw(self):
         self.app.stdscr.erase()
         height, width = self.app.stdscr.getmaxyx()
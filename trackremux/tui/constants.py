@@ -1,3 +1,4 @@
+import curses
 import curses.ascii
 
 # Key Codes
@@ -38,6 +39,8 @@ KEY_P_UPPER = ord("P")
 KEY_V_LOWER = ord("v")
 KEY_V_UPPER = ord("V")
 KEY_HELP = ord("?")
+KEY_SLASH = ord("/")
+KEY_BACKSPACE_KEYS = (curses.KEY_BACKSPACE, curses.ascii.DEL, curses.ascii.BS)
 KEY_H_LOWER = ord("h")
 KEY_H_UPPER = ord("H")
 
@@ -3,15 +3,18 @@ import os
 import threading
 
 
+from ..core.background import PRIORITY_INTERACTIVE, background
 from ..core.converter import MediaConverter
-from ..core.donor import DonorAligner
+from ..core.dir_snapshot import SIDECAR_AUDIO_EXTS, SIDECAR_SUB_EXTS, dir_snapshots
+from ..core.donor import BulkDonorAnalysis, DonorAligner
+from ..core.fingerprint import MIN_SIMILARITY
 from ..core.languages import LANGUAGE_MAP
 from ..core.models import OutputMode
 from ..core.preview import MediaPreview
 from ..core.probe import MediaProbe
+from ..core.subtitle_cache import PagedText, SubtitleCache
 from .batch_progress import BatchProgressView
 from .constants import (
-    APP_TIMEOUT_MS,
     KEY_HELP,
     KEY_H_LOWER,
     KEY_H_UPPER,
@@ -21,6 +24,8 @@ from .constants import (
     KEY_C_UPPER,
     KEY_ENTER,
     KEY_ESC,
+    KEY_F_LOWER,
+    KEY_F_UPPER,
     KEY_L_LOWER,
     KEY_L_UPPER,
     KEY_M_LOWER,
@@ -44,6 +49,9 @@ from .formatters import format_duration, format_size
 from .help import HelpView
 from .progress import ProgressView
 
+# Extracted text subtitle streams, shared by all editors (see subtitle_cache.py)
+subtitle_cache = SubtitleCache()
+
 
 class TrackEditor:
     def __init__(self, app, file_path_or_media, back_view=None, batch_group=None):
@@ -62,8 +70,10 @@ class TrackEditor:
         self.confirming_exit = False
         self.current_preview_time = 0.0
         self.previewing_subs = False
-        self.preview_lines = []
+        self.preview_doc = None      # PagedText of the previewed subtitle
+        self.preview_label = ""
         self.preview_scroll = 0
+        self._preview_page = (None, 0, [])  # (scroll, height, lines) of the last drawn page
 
         # UI state flags for v0.7.0 overlays
         self.showing_output_dialog = False  # Output mode selection [O/M/L]
@@ -90,6 +100,7 @@ class TrackEditor:
         self._donor_computing = False           # True while alignment is running
         self._donor_offset: float = 0.0         # computed offset seconds
         self._donor_confidence: float = 0.0
+        self._donor_tempo: float = 1.0          # donor speed correction (atempo), 1.0 = none
         self._donor_chosen_path: str = ""       # path of confirmed donor
         self._donor_track_list: list = []       # audio tracks from donor
         self._donor_track_sel: set[int] = set() # selected donor track indices
@@ -110,19 +121,13 @@ class TrackEditor:
             f"{base_name}.mkv",
         )
 
-        self.output_name = local_out
-        if os.path.exists(local_out):
-            self.output_name = local_out
-        elif os.path.exists(remote_out):
-            self.output_name = remote_out
-        elif os.path.exists(batch_local):
-            self.output_name = batch_local
-        elif os.path.exists(batch_remote):
-            self.output_name = batch_remote
+        self.output_name = (
+            dir_snapshots.first_existing([local_out, remote_out, batch_local, batch_remote]) or local_out
+        )
 
         # These are slow on remote mounts, run them in a background thread
         self._init_done = False
-        threading.Thread(target=self._background_init, daemon=True).start()
+        background.submit(self._background_init, priority=PRIORITY_INTERACTIVE, owner=self)
 
         # Check profile match for [A] hint (computed once on open)
         self._profile_candidates = self.app.config.matches(self.media_file)
@@ -214,12 +219,13 @@ class TrackEditor:
         # Sync the baseline state so auto-restored donor tracks don't trigger the "Unsaved Changes" prompt on exit
         self.commit_changes()
         self._init_done = True
+        self.app.request_redraw()
 
     def _scan_external_tracks(self):
         """Scans the directory RECURSIVELY for sibling audio and subtitle files and adds them."""
         # Common external extensions
-        audio_exts = (".ac3", ".mka", ".dts", ".eac3", ".wav", ".flac", ".mp3", ".aac")
-        sub_exts = (".srt", ".ass", ".sub", ".txt", ".vtt")
+        audio_exts = SIDECAR_AUDIO_EXTS
+        sub_exts = SIDECAR_SUB_EXTS
 
         directory = os.path.dirname(self.file_path)
         base_name = os.path.splitext(self.media_file.filename)[0]
@@ -233,17 +239,18 @@ class TrackEditor:
 
             scanned_files = []
 
-            # Use os.walk with depth limit logic manually
-            root_depth = directory.rstrip(os.sep).count(os.sep)
-
-            for root, dirs, files in os.walk(directory):
-                # Calculate current depth
-                current_depth = root.rstrip(os.sep).count(os.sep)
-                if current_depth - root_depth > 2:  # Limit to 2 levels deep
-                    dirs[:] = []  # Stop descending
+            # Walk the directory snapshots (shared with the Explorer), limited to 2 levels deep;
+            # only sidecar names are collected, so no per-file stat is needed
+            pending = [(directory, 0)]
+            while pending:
+                root, depth = pending.pop()
+                snap = dir_snapshots.get(root)
+                if snap is None:
                     continue
+                if depth < 2:
+                    pending.extend((os.path.join(root, d), depth + 1) for d in snap.dirs)
 
-                for f in files:
+                for f in snap.sidecars:
                     full = os.path.join(root, f)
                     if full == self.file_path:
                         continue
@@ -317,7 +324,7 @@ class TrackEditor:
             pass
 
     def _recognize_existing_output(self):
-        if not os.path.exists(self.output_name):
+        if not dir_snapshots.isfile(self.output_name):
             return
 
         try:
@@ -364,6 +371,7 @@ class TrackEditor:
                             new_donor = ex
                             new_donor.source_path = self.output_name
                             new_donor.offset_seconds = 0.0  # Already synced in the converted file
+                            new_donor.tempo_ratio = 1.0
                             new_donor.trackremux_id = src_idx
                             new_donor.enabled = True
                             
@@ -417,7 +425,7 @@ class TrackEditor:
 
                         break
 
-            size_str = format_size(os.path.getsize(self.output_name) / 1024 / 1024)
+            size_str = format_size((dir_snapshots.size(self.output_name) or 0) / 1024 / 1024)
             self.status_message = f" Found existing output ({size_str}). Auto-restored selection. "
         except Exception as e:
             self.status_message = f" Error probing existing output: {e} "
@@ -431,6 +439,12 @@ class TrackEditor:
         self.initial_state = [(t.index, t.enabled) for t in self.media_file.tracks]
         self.confirming_exit = False
 
+    def redraw_interval(self):
+        """Seconds between unprompted redraws (spinners while donors are analyzed)."""
+        if self._donor_computing or getattr(self, "_donor_bulk_computing", False):
+            return 0.25
+        return None
+
     def draw(self):
         self.app.stdscr.erase()
         height, width = self.app.stdscr.getmaxyx()
@@ -464,7 +478,7 @@ class TrackEditor:
             output_name = f"converted_{base_name}.mkv"
         else:  # OVERWRITE
             output_name = self.media_file.filename
-        existing_exists = os.path.exists(output_name)
+        existing_size = dir_snapshots.size(output_name)  # memory lookup, this runs every frame
 
         est_size_mb = MediaConverter.estimate_output_size(
             self.media_file, convert_audio=self.app.settings.convert_audio
@@ -474,8 +488,8 @@ class TrackEditor:
             f" Output: {mode_tag}{output_name} | Est. file size: {format_size(est_size_mb)}"
         )
 
-        if existing_exists:
-            actual_size_mb = os.path.getsize(output_name) / 1024 / 1024
+        if existing_size is not None:
+            actual_size_mb = existing_size / 1024 / 1024
             target_info += f" (Actual: {format_size(actual_size_mb)})"
 
         dur_str = format_duration(self.media_file.duration)
@@ -646,7 +660,7 @@ class TrackEditor:
         self.app.stdscr.refresh()
 
         # Subtitle Preview Overlay
-        if self.previewing_subs and self.preview_lines:
+        if self.previewing_subs and self.preview_doc:
             mw = min(80, width - 4)
             mh = min(30, height - 4)
             my = (height - mh) // 2
@@ -657,24 +671,28 @@ class TrackEditor:
                 self.app.stdscr.addstr(my + r, mx, " " * mw, curses.color_pair(3))
 
             # Header
-            title = " Subtitle Preview (First 2000 lines) "
+            total = self.preview_doc.line_count
+            title = f" Subtitle Preview: {self.preview_label} ({total} lines) "[: mw - 2]
             self.app.stdscr.addstr(
                 my, mx + (mw - len(title)) // 2, title, curses.color_pair(3) | curses.A_BOLD
             )
 
-            # Content
+            # Content: only the visible page is read from disk (and only when it changes)
             content_h = mh - 2
-            for i in range(content_h):
-                line_idx = self.preview_scroll + i
-                if line_idx < len(self.preview_lines):
-                    line = self.preview_lines[line_idx]
-                    # truncation
-                    if len(line) > mw - 2:
-                        line = line[: mw - 5] + "..."
-                    self.app.stdscr.addstr(my + 1 + i, mx + 2, line, curses.color_pair(3))
+            scroll, page_h, lines = self._preview_page
+            if scroll != self.preview_scroll or page_h != content_h:
+                lines = self.preview_doc.lines(self.preview_scroll, content_h)
+                self._preview_page = (self.preview_scroll, content_h, lines)
+            for i, line in enumerate(lines):
+                # truncation
+                if len(line) > mw - 2:
+                    line = line[: mw - 5] + "..."
+                self.app.stdscr.addstr(my + 1 + i, mx + 2, line, curses.color_pair(3))
 
             # Footer
-            footer = " [UP/DOWN] Scroll | [ESC/ENTER] Close "
+            pos = f" {min(self.preview_scroll + 1, total)}/{total} "
+            self.app.stdscr.addstr(my + mh - 1, mx + mw - len(pos) - 1, pos, curses.color_pair(3))
+            footer = " [UP/DOWN/PGUP/PGDN/HOME/END] Scroll | [ESC/ENTER] Close "
             self.app.stdscr.addstr(
                 my + mh - 1, mx + (mw - len(footer)) // 2, footer, curses.color_pair(3)
             )
@@ -684,21 +702,26 @@ class TrackEditor:
 
         # Subtitle Preview Handling
         if self.previewing_subs:
+            last = max(0, self.preview_doc.line_count - 1) if self.preview_doc else 0
+            page = max(1, min(30, height - 4) - 2)
             if key in (KEY_ESC, KEY_ENTER, ord("q"), ord("Q")):
                 self.previewing_subs = False
-                self.preview_lines = []
+                self.preview_doc = None
+                self._preview_page = (None, 0, [])
             elif key == curses.KEY_UP:
                 if self.preview_scroll > 0:
                     self.preview_scroll -= 1
             elif key == curses.KEY_DOWN:
-                if self.preview_scroll < len(self.preview_lines) - 1:
+                if self.preview_scroll < last:
                     self.preview_scroll += 1
             elif key == curses.KEY_PPAGE:
-                self.preview_scroll = max(0, self.preview_scroll - 10)
+                self.preview_scroll = max(0, self.preview_scroll - page)
             elif key == curses.KEY_NPAGE:
-                self.preview_scroll = max(
-                    0, min(len(self.preview_lines) - 1, self.preview_scroll + 10)
-                )
+                self.preview_scroll = min(last, self.preview_scroll + page)
+            elif key == curses.KEY_HOME:
+                self.preview_scroll = 0
+            elif key == curses.KEY_END:
+                self.preview_scroll = max(0, last - page + 1)
             return
 
         # Overlay dispatch: output mode dialog
@@ -1006,6 +1029,12 @@ class TrackEditor:
             track = self.media_file.tracks[self.selected_idx]
             if track.codec_type != "audio":
                 self.status_message = " Select an audio track to use Donor import. "
+            elif self.batch_group:
+                from .season_donor import SeasonDonorView
+
+                view = SeasonDonorView.open(self.app, self)
+                if view:
+                    self.app.switch_view(view)
             else:
                 self._open_donor_overlay()
 
@@ -1021,54 +1050,14 @@ class TrackEditor:
         self.commit_changes()
 
         from ..core.queue import QueueManager
-        import copy
         qm = self.app.queue_manager
         
         if self.batch_group:
-            template_media = self.media_file
             added_count = 0
             for f in self.batch_group.files:
                 if qm.has_pending_task(f.path):
                     continue
-                f_clone = copy.deepcopy(f)
-                
-                template_by_type = {
-                    "video": [t for t in template_media.tracks if t.codec_type == "video"],
-                    "audio": [t for t in template_media.tracks if t.codec_type == "audio"],
-                    "subtitle": [t for t in template_media.tracks if t.codec_type == "subtitle"],
-                }
-                target_by_type = {
-                    "video": [t for t in f_clone.tracks if t.codec_type == "video"],
-                    "audio": [t for t in f_clone.tracks if t.codec_type == "audio"],
-                    "subtitle": [t for t in f_clone.tracks if t.codec_type == "subtitle"],
-                }
-
-                tmpl_logical_pos = {}
-                for ctype, tracks in template_by_type.items():
-                    for i, t in enumerate(tracks):
-                        tmpl_logical_pos[id(t)] = (ctype, i)
-
-                new_tracks = []
-                for tmpl in template_media.tracks:
-                    ctype, pos = tmpl_logical_pos[id(tmpl)]
-                    target_typed_list = target_by_type.get(ctype, [])
-                    if pos < len(target_typed_list):
-                        t_track = target_typed_list[pos]
-                        t_track.enabled = tmpl.enabled
-                        t_track.language = tmpl.language
-                        t_track.tags = dict(tmpl.tags)
-                        new_tracks.append(t_track)
-
-                if len(new_tracks) == len(f_clone.tracks):
-                    f_clone.tracks = new_tracks
-                else:
-                    for i, t_track in enumerate(f_clone.tracks):
-                        if i < len(template_media.tracks):
-                            tmpl = template_media.tracks[i]
-                            t_track.enabled = tmpl.enabled
-                            t_track.language = tmpl.language
-                            t_track.tags = dict(tmpl.tags)
-
+                f_clone = self._apply_template(f)
                 qm.add_task(f_clone, self.app.settings.output_mode, self.app.settings.convert_audio)
                 added_count += 1
             
@@ -1092,6 +1081,51 @@ class TrackEditor:
         # Clear state and drop back to explorer
         self.app.switch_view(self.back_view)
 
+    def _apply_template(self, f):
+        """Copy of batch file f with the track selection, order and metadata of the edited file."""
+        import copy
+
+        template_media = self.media_file
+        f_clone = copy.deepcopy(f)
+
+        template_by_type = {
+            "video": [t for t in template_media.tracks if t.codec_type == "video"],
+            "audio": [t for t in template_media.tracks if t.codec_type == "audio"],
+            "subtitle": [t for t in template_media.tracks if t.codec_type == "subtitle"],
+        }
+        target_by_type = {
+            "video": [t for t in f_clone.tracks if t.codec_type == "video"],
+            "audio": [t for t in f_clone.tracks if t.codec_type == "audio"],
+            "subtitle": [t for t in f_clone.tracks if t.codec_type == "subtitle"],
+        }
+
+        tmpl_logical_pos = {}
+        for ctype, tracks in template_by_type.items():
+            for i, t in enumerate(tracks):
+                tmpl_logical_pos[id(t)] = (ctype, i)
+
+        new_tracks = []
+        for tmpl in template_media.tracks:
+            ctype, pos = tmpl_logical_pos[id(tmpl)]
+            target_typed_list = target_by_type.get(ctype, [])
+            if pos < len(target_typed_list):
+                t_track = target_typed_list[pos]
+                t_track.enabled = tmpl.enabled
+                t_track.language = tmpl.language
+                t_track.tags = dict(tmpl.tags)
+                new_tracks.append(t_track)
+
+        if len(new_tracks) == len(f_clone.tracks):
+            f_clone.tracks = new_tracks
+        else:
+            for i, t_track in enumerate(f_clone.tracks):
+                if i < len(template_media.tracks):
+                    tmpl = template_media.tracks[i]
+                    t_track.enabled = tmpl.enabled
+                    t_track.language = tmpl.language
+                    t_track.tags = dict(tmpl.tags)
+        return f_clone
+
     def _draw_output_dialog(self, height, width):
         """Draw the output-mode selection overlay with contextual output preview."""
         source_dir = os.path.dirname(os.path.abspath(self.media_file.path))
@@ -1183,15 +1217,9 @@ class TrackEditor:
                 f"{base_name}.mkv",
             )
 
-            self.residual_file_to_delete = None
-            if os.path.exists(local_out):
-                self.residual_file_to_delete = local_out
-            elif os.path.exists(remote_out):
-                self.residual_file_to_delete = remote_out
-            elif os.path.exists(batch_local):
-                self.residual_file_to_delete = batch_local
-            elif os.path.exists(batch_remote):
-                self.residual_file_to_delete = batch_remote
+            self.residual_file_to_delete = dir_snapshots.first_existing(
+                [local_out, remote_out, batch_local, batch_remote]
+            )
 
             if self.residual_file_to_delete:
                 self.showing_output_dialog = False
@@ -1476,7 +1504,7 @@ class TrackEditor:
 
         curses.noecho()
         curses.curs_set(0)
-        self.app.stdscr.timeout(APP_TIMEOUT_MS)  # Restore application timeout
+        self.app.stdscr.timeout(0)  # Restore non-blocking input (the app loop waits in select)
 
         if user_input and len(user_input.strip()) == 3:
             track.language = user_input.strip().lower()
@@ -1484,38 +1512,60 @@ class TrackEditor:
         else:
             self.status_message = " Invalid language code or cancelled. "
 
-    def _show_subtitle_preview(self, path):
-        """Reads the first few lines of a subtitle file and enables preview mode."""
+    def _show_subtitle_preview(self, path, label=None):
+        """Indexes a subtitle file for lazy paging and enables preview mode."""
         try:
-            self.preview_lines = []
-            with open(path, "rb") as f:
-                # Read binary to check for null bytes
-                content = f.read(4096)
-                if b"\0" in content:
-                    self.status_message = " Cannot preview binary file. "
-                    return
-
-                # Decode
-                text = ""
-                try:
-                    text = content.decode("utf-8")
-                except UnicodeDecodeError:
-                    try:
-                        text = content.decode("latin-1")
-                    except:
-                        pass
+            doc = PagedText.open(path)
+        except ValueError:
+            self.status_message = " Cannot preview binary file. "
+            return
+        except Exception as e:
+            self.status_message = f" Error reading file: {e} "
+            return
+        if not doc.line_count:
+            self.status_message = " Empty or unreadable file. "
+            return
+        self.preview_doc = doc
+        self.preview_label = label or os.path.basename(path)
+        self.preview_scroll = 0
+        self._preview_page = (None, 0, [])
+        self.previewing_subs = True
+        self.status_message = f" Previewing {self.preview_label} "
 
-                if not text:
-                    self.status_message = " Empty or unreadable file. "
-                    return
+    def _preview_internal_subtitle(self, track):
+        """
+        Preview a subtitle stream of the file itself. All text subtitle streams are
+        extracted together in one background pass into the subtitle cache, so the
+        other streams of this file open instantly afterwards.
+        """
+        label = f"#{track.index} {track.display_language} {track.codec_name}"
+        if not SubtitleCache.is_text(track.codec_name):
+            self.status_message = f" {track.codec_name} is a bitmap subtitle format and cannot be previewed as text. "
+            return
+        cached = subtitle_cache.get(self.file_path, track.index, track.codec_name)
+        if cached:
+            self._show_subtitle_preview(cached, label)
+            return
 
-                self.preview_lines = text.splitlines()[:2000]  # Limit to 2000 lines
-                self.previewing_subs = True
-                self.preview_scroll = 0
-                self.status_message = f" Previewing {os.path.basename(path)} "
+        streams = [
+            (t.index, t.codec_name)
+            for t in self.media_file.tracks
+            if t.codec_type == "subtitle" and not t.source_path
+        ]
+        self.status_message = " Extracting subtitles (all text streams in one pass)… "
+
+        def _extract():
+            ok = subtitle_cache.extract(self.file_path, streams)
+            path = subtitle_cache.get(self.file_path, track.index, track.codec_name) if ok else None
+            if self.media_file.tracks[self.selected_idx] is not track:
+                self.status_message = " Subtitles extracted. " if path else " Subtitle extraction failed. "
+            elif path:
+                self._show_subtitle_preview(path, label)
+            else:
+                self.status_message = " Subtitle extraction failed. "
+            self.app.request_redraw()
 
-        except Exception as e:
-            self.status_message = f" Error reading file: {e} "
+        background.submit(_extract, priority=PRIORITY_INTERACTIVE, key=("subtitles", self.file_path), owner=self)
 
     def _play_current_track(self):
         height, width = self.app.stdscr.getmaxyx()
@@ -1526,37 +1576,53 @@ class TrackEditor:
             if track.source_path:
                 self._show_subtitle_preview(track.source_path)
             else:
-                self.status_message = " Preview not supported for internal subtitles yet. "
+                self._preview_internal_subtitle(track)
             return
 
         if track.codec_type != "audio":
             return
 
-        # Visual feedback
         time_str = (
             f"{int(self.current_preview_time // 60):02d}:{int(self.current_preview_time % 60):02d}"
         )
-        self.status_message = f" Extracting snippet for track #{track.index} at {time_str}... "
-        self.draw()  # Force redraw to show status
 
+        # Streams without blocking the UI; seeks inside the decoded range reuse the running decoder
+        path, type_idx = self._preview_source(track)
+        mode = MediaPreview.play(
+            path,
+            type_idx,
+            start_time=self.current_preview_time,
+            duration=PREVIEW_DURATION_SECONDS,
+        )
+        if mode == "extract":
+            self.status_message = f" Extracting snippet for track #{track.index} at {time_str}... "
+        elif mode:
+            self.status_message = f" Playing Track #{track.index} at {time_str} ({PREVIEW_DURATION_SECONDS}s preview) "
+        else:
+            self.status_message = " Preview failed! "
+            return
+
+        # While this plays, decode what is likely next: the next seek position and the
+        # neighbouring audio tracks at the same time, so flipping between dubs is instant
+        upcoming = []
+        if self.current_preview_time + SEEK_STEP_SECONDS < self.media_file.duration:
+            upcoming.append((path, type_idx, self.current_preview_time + SEEK_STEP_SECONDS))
+        audio = [i for i, t in enumerate(self.media_file.tracks) if t.codec_type == "audio"]
+        pos = audio.index(self.selected_idx)
+        for neighbour in audio[pos + 1:pos + 2] + audio[max(0, pos - 1):pos]:
+            n_path, n_idx = self._preview_source(self.media_file.tracks[neighbour])
+            upcoming.append((n_path, n_idx, self.current_preview_time))
+        MediaPreview.prefetch(upcoming)
+
+    def _preview_source(self, track):
+        """(file path, audio index within that file) used to preview a track."""
         type_idx = 0
         for t in self.media_file.tracks:
-            if t == track:
+            if t is track:
                 break
             if t.source_path == track.source_path and t.codec_type == track.codec_type:
                 type_idx += 1
-
-        wav_path = MediaPreview.extract_snippet(
-            track.source_path or self.file_path,
-            "audio",
-            type_idx,
-            start_time=self.current_preview_time,
-        )
-        if wav_path:
-            MediaPreview.play_snippet(wav_path)
-            self.status_message = f" Playing Track #{track.index} at {time_str} ({PREVIEW_DURATION_SECONDS}s snippet) "
-        else:
-            self.status_message = " Extraction failed! "
+        return track.source_path or self.file_path, type_idx
 
     # ------------------------------------------------------------------
     # Donor overlay
@@ -1570,22 +1636,80 @@ class TrackEditor:
             return
 
         donors = cache.get_donors(self.file_path, self.media_file.duration)
-        if not donors:
+        self._donor_target_idx = self.selected_idx
+        # List of [path, len_pct, sync_confidence, sync_offset, analysis_seconds, tempo_ratio, fingerprint_similarity]
+        self._donor_all = [[d[0], d[1], None, 0.0, None, 1.0, None] for d in donors]
+        # Position in the DonorCache ranking (combined duration/title/year score)
+        self._donor_rank = {d[0]: i for i, d in enumerate(donors)}
+        self._donor_show_unrelated = True
+        self._apply_donor_fingerprints()
+        if not self._donor_all:
             self.status_message = " No matching donor files found in this directory. "
             return
-
-        self._donor_target_idx = self.selected_idx
-        # List of [path, len_pct, sync_confidence, sync_offset]
-        self._donor_list = [[d[0], d[1], None, 0.0] for d in donors]
         self._donor_sel = 0
         self._donor_scroll = 0
         self._donor_computing = False
         self._donor_bulk_computing = False
         self._donor_bulk_progress = (0, 0)
+        self._donor_bulk = None
+        self._donor_bulk_started = 0.0
+        self._donor_bulk_note = self._donor_filter_note()
         self._donor_offset = 0.0
         self._donor_confidence = 0.0
+        self._donor_tempo = 1.0
         self.showing_donor_overlay = True
 
+    def _apply_donor_fingerprints(self):
+        """
+        Rank the donor candidates with the library audio fingerprint index: content
+        matches move to the top, files whose fingerprint shows no shared content stay
+        listed but go last and are marked (a fingerprint can miss, e.g. on a differently
+        mastered track; [F] hides them), and content matches outside the duration
+        window (e.g. extended cuts) are added. Files not fingerprinted yet stay listed
+        and are fingerprinted next.
+        """
+        fp = getattr(self.app, "fingerprints", None)
+        if fp is None:
+            self._donor_list = list(self._donor_all)
+            return
+        known = {item[0] for item in self._donor_all}
+        for path, sim in fp.similar(self.file_path).items():
+            if path in known or not dir_snapshots.isfile(path):
+                continue
+            duration = self.app.donor_cache.duration_of(path)
+            pct = (1.0 - abs(1.0 - duration / self.media_file.duration)) * 100.0 if duration else 0.0
+            self._donor_all.append([path, round(max(pct, 0.0), 1), None, 0.0, None, 1.0, sim])
+            self._donor_rank.setdefault(path, len(self._donor_rank))
+        sims = fp.compare(self.file_path, [item[0] for item in self._donor_all])
+        for item in self._donor_all:
+            item[6] = sims.get(item[0])
+
+        missing = [item[0] for item in self._donor_all if item[6] is None]
+        indexer = getattr(self.app, "fingerprint_indexer", None)
+        if indexer is not None and missing:
+            indexer.prioritize([self.file_path] + missing)
+
+        def related(item):
+            return item[6] is None or item[6] >= MIN_SIMILARITY
+
+        self._donor_unrelated = sum(1 for item in self._donor_all if not related(item))
+        self._donor_list = [item for item in self._donor_all if self._donor_show_unrelated or related(item)]
+        self._donor_list.sort(key=self._donor_order)
+
+    def _donor_order(self, item):
+        """Confirmed content matches first, then unknown, then fingerprint-negative; DonorCache rank within each."""
+        sim = item[6]
+        fp_class = 1 if sim is None else 0 if sim >= MIN_SIMILARITY else 2
+        return (fp_class, self._donor_rank.get(item[0], len(self._donor_rank)))
+
+    def _donor_filter_note(self) -> str:
+        unrelated = getattr(self, "_donor_unrelated", 0)
+        if not unrelated:
+            return ""
+        if self._donor_show_unrelated:
+            return f"  {unrelated} candidate(s) with a different audio fingerprint listed last (≠)  ([F] hide)"
+        return f"  {unrelated} candidate(s) hidden: audio fingerprint shares no content  ([F] show)"
+
     def _draw_donor_overlay(self, height, width):
         """Donor File Picker overlay."""
         mw = min(width - 4, 80)
@@ -1601,14 +1725,19 @@ class TrackEditor:
         title += "─" * max(0, mw - len(title) - 2)
         self.app.stdscr.addstr(my, mx + 1, title[: mw - 2], curses.color_pair(3) | curses.A_BOLD)
 
-        hint = "  [↑↓] Nav  [P] Prev  [A] Deep Analysis  [ENTER] Select  [ESC] Cancel"
+        hint = "  [↑↓] Nav  [P] Prev  [a] Deep Analysis  [A] Exhaustive  [F] Unrelated  [ENTER] Select  [ESC] Cancel"
         self.app.stdscr.addstr(my + 1, mx, hint[: mw], curses.A_DIM)
 
         if getattr(self, "_donor_bulk_computing", False):
-            spin = ["|" , "/", "-", "\\"][int(__import__("time").time() * 4) % 4]
+            now = __import__("time").time()
+            spin = ["|" , "/", "-", "\\"][int(now * 4) % 4]
             done, total = self._donor_bulk_progress
-            computing = f"  {spin} Analyzing donors {done}/{total}… (this may take a while)"
+            workers = self._donor_bulk.workers if self._donor_bulk else 1
+            elapsed = now - self._donor_bulk_started
+            computing = f"  {spin} Analyzing donors {done}/{total} on {workers} workers… {elapsed:.0f}s"
             self.app.stdscr.addstr(my + 2, mx, computing[: mw], curses.color_pair(5))
+        elif getattr(self, "_donor_bulk_note", ""):
+            self.app.stdscr.addstr(my + 2, mx, self._donor_bulk_note[: mw], curses.color_pair(5))
         elif self._donor_computing:
             spin = ["|" , "/", "-", "\\"][int(__import__("time").time() * 4) % 4]
             computing = f"  {spin} Computing sync offset… (this takes ~5s)"
@@ -1617,6 +1746,8 @@ class TrackEditor:
             sign = "+" if self._donor_offset >= 0 else ""
             conf_pct = int(self._donor_confidence * 100)
             result = f"  ✓ Offset: {sign}{self._donor_offset:.2f}s  Confidence: {conf_pct}%"
+            if self._donor_tempo != 1.0:
+                result += f"  Tempo: ×{self._donor_tempo:.4f}"
             self.app.stdscr.addstr(my + 2, mx, result[: mw], curses.color_pair(5))
         else:
             self.app.stdscr.addstr(my + 2, mx, " " * mw, curses.color_pair(3))
@@ -1635,6 +1766,9 @@ class TrackEditor:
             item = self._donor_list[idx]
             dpath, dpct = item[0], item[1]
             conf = item[2] if len(item) > 2 else None
+            secs = item[4] if len(item) > 4 else None
+            tempo = item[5] if len(item) > 5 else 1.0
+            sim = item[6] if len(item) > 6 else None
             
             fname = os.path.basename(dpath)
             is_sel = idx == self._donor_sel
@@ -1642,12 +1776,21 @@ class TrackEditor:
             prefix = "> " if is_sel else "  "
             
             length_tag = f"[Len: {dpct:.1f}%]"
+            fp_tag = f"[FP:{int(sim * 100):>3}%]" if sim is not None else "[FP:  ? ]"
+            if sim is not None and sim < MIN_SIMILARITY:
+                # Fingerprint says different content: kept selectable, but marked
+                fp_tag = fp_tag[:-1] + "≠]"
+                if not is_sel:
+                    attr |= curses.A_DIM
             if conf is None:
                 sync_tag = "[Sync:   ? ]"
             else:
                 sync_tag = f"[Sync: {int(conf*100):>3}%]"
-                
-            line = f"{prefix}{length_tag} {sync_tag}  {fname}"
+            time_tag = f"{secs:5.1f}s " if secs is not None else ""
+            if tempo != 1.0:
+                time_tag += f"[×{tempo:.3f}] "
+
+            line = f"{prefix}{length_tag} {fp_tag} {sync_tag} {time_tag} {fname}"
             self.app.stdscr.addstr(my + 3 + i, mx, line[: mw], attr)
 
         footer = "  [ENTER] Confirm donor  [P] Preview  [Q/ESC] Cancel"
@@ -1656,6 +1799,8 @@ class TrackEditor:
     def _handle_donor_overlay(self, key):
         """Key handler for Donor File Picker."""
         if key in (KEY_ESC, KEY_Q_LOWER, KEY_Q_UPPER):
+            if getattr(self, "_donor_bulk", None):
+                self._donor_bulk.cancel()
             self.showing_donor_overlay = False
             return
         elif key == curses.KEY_UP and self._donor_sel > 0:
@@ -1667,58 +1812,80 @@ class TrackEditor:
             if not self._donor_list:
                 return
             donor_path = self._donor_list[self._donor_sel][0]
-            self.status_message = f" Extracting donor preview… "
-            self.draw()
-            wav = MediaPreview.extract_snippet(donor_path, "audio", 0, start_time=0.0)
-            if wav:
-                MediaPreview.play_snippet(wav)
+            if MediaPreview.play(donor_path, 0, start_time=0.0, duration=PREVIEW_DURATION_SECONDS):
                 self.status_message = f" Previewing: {os.path.basename(donor_path)} "
             else:
-                self.status_message = " Preview extraction failed. "
+                self.status_message = " Preview failed. "
                 
+        elif key in (KEY_F_LOWER, KEY_F_UPPER):
+            # Hide/show candidates whose audio fingerprint shares no content (also picks up new fingerprints)
+            if getattr(self, "_donor_bulk_computing", False):
+                return
+            self._donor_show_unrelated = not self._donor_show_unrelated
+            self._apply_donor_fingerprints()
+            self._donor_sel = 0
+            self._donor_scroll = 0
+            self._donor_bulk_note = self._donor_filter_note()
         elif key in (KEY_A_LOWER, KEY_A_UPPER):
             if not self._donor_list or getattr(self, "_donor_bulk_computing", False) or self._donor_computing:
                 return
+            # [a] stops at the first confident match, [A] (Shift) analyzes every candidate
+            exhaustive = key == KEY_A_UPPER
+            # Fingerprint-negative candidates are only aligned by [A] while they are listed
+            include_unrelated = exhaustive and self._donor_show_unrelated
+            pending = [
+                item for item in self._donor_list
+                if item[2] is None and (include_unrelated or self._donor_order(item)[0] < 2)
+            ]
+            # Best ranked first: likeliest donors get the first workers
+            pending.sort(key=self._donor_order)
+            by_path = {item[0]: item for item in pending}
+            bulk = BulkDonorAnalysis(
+                self.media_file.path,
+                self.media_file.tracks[self._donor_target_idx].index,
+                self.media_file.duration,
+                [item[0] for item in pending],
+                workers=self.app.config.donor_workers,
+                stop_confidence=self.app.config.donor_stop_confidence,
+                exhaustive=exhaustive,
+            )
+            self._donor_bulk = bulk
             self._donor_bulk_computing = True
-            total = len(self._donor_list)
-            self._donor_bulk_progress = (0, total)
-            
+            self._donor_bulk_started = __import__("time").time()
+            self._donor_bulk_note = ""
+            self._donor_bulk_progress = (0, bulk.total)
+
+            def _on_result(path, alignment, secs):
+                item = by_path[path]
+                item[2] = alignment.confidence
+                item[3] = alignment.offset
+                item[4] = secs
+                item[5] = alignment.tempo_ratio
+                self._donor_bulk_progress = (bulk.done, bulk.total)
+
             def _run_bulk_analysis():
                 try:
-                    from ..core.probe import MediaProbe
-                    from ..core.donor import DonorAligner
-                    media_a = self.media_file
-                    target_stream = media_a.tracks[self._donor_target_idx].index
-                    
-                    # Pre-extract the audio envelope for our target track once
-                    env_a = DonorAligner._extract_envelope(media_a.path, target_stream)
-                    
-                    for i, item in enumerate(self._donor_list):
-                        dpath, dpct, conf, off = self._donor_list[i]
-                        if conf is not None:
-                            self._donor_bulk_progress = (i + 1, total)
-                            continue
-                            
-                        try:
-                            media_b = MediaProbe.probe(dpath)
-                            o, c = DonorAligner.align_best_track(
-                                media_a.path, target_stream, dpath, media_b.tracks, env_a=env_a
-                            )
-                            self._donor_list[i][2] = c
-                            self._donor_list[i][3] = o
-                        except Exception:
-                            self._donor_list[i][2] = 0.0
-                            
-                        self._donor_bulk_progress = (i + 1, total)
-
+                    bulk.run(_on_result)
+                except Exception as e:
+                    self._donor_bulk_note = f"  ✗ Analysis failed: {e}"
+                else:
+                    elapsed = __import__("time").time() - self._donor_bulk_started
+                    if bulk.stopped_by:
+                        self._donor_bulk_note = (
+                            f"  ✓ Match found after {bulk.done}/{bulk.total} in {elapsed:.0f}s"
+                            f"  ([A] to analyze all)"
+                        )
+                    else:
+                        self._donor_bulk_note = f"  ✓ Analyzed {bulk.done}/{bulk.total} donors in {elapsed:.0f}s"
                     # Sort by confidence descending, then by duration match descending
                     self._donor_list.sort(key=lambda x: (x[2] if x[2] is not None else -1.0, x[1]), reverse=True)
                     self._donor_sel = 0
                     self._donor_scroll = 0
                 finally:
                     self._donor_bulk_computing = False
+                    self._donor_bulk = None
+                    self.app.request_redraw()
 
-            import threading
             threading.Thread(target=_run_bulk_analysis, daemon=True).start()
 
         elif key == KEY_ENTER:
@@ -1729,6 +1896,7 @@ class TrackEditor:
             dpct = item[1]
             cached_conf = item[2]
             cached_offset = item[3]
+            cached_tempo = item[5] if len(item) > 5 else 1.0
             
             self._donor_chosen_path = donor_path
             # Start alignment in background (or skip if cached)
@@ -1737,9 +1905,11 @@ class TrackEditor:
             if cached_conf is not None:
                 self._donor_offset = cached_offset
                 self._donor_confidence = cached_conf
+                self._donor_tempo = cached_tempo
             else:
                 self._donor_offset = 0.0
                 self._donor_confidence = 0.0
+                self._donor_tempo = 1.0
 
             def _run_alignment():
                 try:
@@ -1750,14 +1920,16 @@ class TrackEditor:
                     
                     if cached_conf is None:
                         target_stream = media_a.tracks[self._donor_target_idx].index
-                        off, conf = DonorAligner.align_best_track(
-                            media_a.path, target_stream, donor_path, media_b.tracks
+                        alignment = DonorAligner.align(
+                            media_a.path, target_stream, media_a.duration, media_b
                         )
-                        self._donor_offset = off
-                        self._donor_confidence = conf
+                        self._donor_offset = alignment.offset
+                        self._donor_confidence = alignment.confidence
+                        self._donor_tempo = alignment.tempo_ratio
                         # Cache it on the fly
-                        self._donor_list[self._donor_sel][2] = conf
-                        self._donor_list[self._donor_sel][3] = off
+                        self._donor_list[self._donor_sel][2] = alignment.confidence
+                        self._donor_list[self._donor_sel][3] = alignment.offset
+                        self._donor_list[self._donor_sel][5] = alignment.tempo_ratio
                     
                     # Populate track picker
                     self._donor_track_list = [t for t in media_b.tracks if t.codec_type == "audio"]
@@ -1767,9 +1939,9 @@ class TrackEditor:
                     self._donor_computing = False
                     self.showing_donor_overlay = False
                     self.showing_donor_track_picker = True
+                    self.app.request_redraw()
 
-            import threading
-            threading.Thread(target=_run_alignment, daemon=True).start()
+            background.submit(_run_alignment, priority=PRIORITY_INTERACTIVE, owner=self)
 
     def _draw_donor_track_picker(self, height, width):
         """Second overlay: pick which tracks to import from the donor."""
@@ -1796,6 +1968,9 @@ class TrackEditor:
             conf_pct = int(self._donor_confidence * 100)
             warn = " ⚠ Low confidence" if self._donor_confidence < 0.6 else ""
             sync_str = f"  Sync offset: {sign}{self._donor_offset:.2f}s  Confidence: {conf_pct}%{warn}"
+            if self._donor_tempo != 1.0:
+                drift = (self._donor_tempo - 1.0) * 3600.0
+                sync_str += f"  Tempo ×{self._donor_tempo:.4f} ({drift:+.0f}s/h, re-encoded with atempo)"
             attr = curses.color_pair(4) if self._donor_confidence < 0.6 else curses.color_pair(5)
             self.app.stdscr.addstr(my + 1, mx, sync_str[:mw], attr)
 
@@ -1851,6 +2026,7 @@ class TrackEditor:
                 src_track = self._donor_track_list[i]
                 src_track.source_path = self._donor_chosen_path
                 src_track.offset_seconds = self._donor_offset
+                src_track.tempo_ratio = self._donor_tempo
                 src_track.enabled = True
                 # Give a fresh ID for the output metadata so it doesn't clash with existing tracks
                 # but keep the original src_track.index intact for accurate FFmpeg mapping
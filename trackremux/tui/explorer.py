@@ -1,14 +1,20 @@
+import collections
 import curses
+import heapq
 import os
 import threading
 import time
 import unicodedata
 
+from ..core.background import PRIORITY_BACKGROUND, PRIORITY_VISIBLE, background
 from ..core.batch import BatchDetector
 from ..core.converter import MediaConverter
+from ..core.dir_snapshot import dir_snapshots
 from ..core.probe import MediaProbe
 from .batch_selector import BatchSelectorView
+from .file_filter import FileFlags, FileSearchIndex, SearchQuery
 from .help import HelpView
+from .sort_index import SortedFileIndex
 from .constants import (
     FILE_LIST_Y_OFFSET,
     KEY_HELP,
@@ -40,11 +46,28 @@ from .constants import (
     KEY_V_LOWER,
     KEY_V_UPPER,
     KEY_CTRL_C,
+    KEY_SLASH,
+    KEY_BACKSPACE_KEYS,
     MARGIN,
 )
 from .editor import TrackEditor
 from .formatters import format_size
 
+MEDIA_EXTENSIONS = (".mkv", ".mp4", ".avi", ".mov", ".m4v")
+# Background probes handed to the scanner at a time; the rest wait in the Explorer's backlog
+SCAN_WINDOW = 32
+SCAN_PACE_SECS = 0.1
+
+
+class _UnprobedFile:
+    """Stand-in for a MediaFile until the file is probed (size comes from the listing)."""
+
+    def __init__(self, filename, size_bytes):
+        self.filename = filename
+        self.size_bytes = size_bytes
+        self.probed = False
+        self.tracks = []
+
 
 def get_display_name(name, width):
     """Normalize and truncate name to fit visual width."""
@@ -83,11 +106,31 @@ class FileExplorer:
         # Cache for expensive DTS>AC3 probe checks: { filename: bool }
         self.dts_badge_cache = {}
 
-        self.dts_filter = False  # [F] toggle: show only files with DTS audio
+        self.dts_filter = False  # [D] toggle: show only files with DTS audio
+
+        # Search bar ([/]): filename words and structured filters over per-file flags
+        self.searching = False  # the search bar has the keyboard
+        self.search_text = ""
+        self._query = SearchQuery("")
+        self._search_index = None  # FileSearchIndex, built on the first search
+        self._search_matches = None  # names matching the query's words (None: all)
+        self._flags = {}  # filename -> FileFlags, computed once per probe
 
         # Track priority requests to avoid spamming the scanner queue
         self.priority_requested = set()
 
+        # Files waiting to be handed to the scanner: (filename, force), fed as it catches up
+        self._scan_backlog = collections.deque()
+        self._scan_feeding = False
+
+        # Sorted file list, maintained incrementally as metadata arrives (guarded by metadata_lock)
+        self._sort_index = SortedFileIndex()
+        self._sort_state = None  # (mode, reverse, filter, search, files list) the index was built for
+        self._sorted_files = []  # dirs + sorted files, rebuilt when the index changes
+        self._sorted_version = None
+        # Formatted rows of probed files: filename -> (media, stamp, row)
+        self._row_cache = {}
+
         # Start async loading
         self.load_start_time = time.time()
         threading.Thread(target=self._async_load, daemon=True).start()
@@ -156,52 +199,104 @@ class FileExplorer:
         return result
 
     def _async_load(self):
-        """Load directory contents in background to allow immediate UI render."""
+        """
+        Stream the directory listing in the background: rows appear chunk by chunk
+        while a huge folder is still being read, and each chunk's files join the
+        probe backlog right away.
+        """
         try:
-            self.dirs, self.files = self._get_items_separated()
-            self.filenames = self.dirs + self.files
-            self.total_count = len(self.files)
-
-            # Quick size check immediately
-            self._quick_size_check()
-
-            # Submit probing tasks to global scanner (Background default for everything)
-            self._submit_scan_tasks()
-        except:
+            # Only media files need a size (rows sort by it before probing)
+            for chunk in dir_snapshots.stream(self.path, sized=lambda n: n.lower().endswith(MEDIA_EXTENSIONS)):
+                dirs, files = [], []
+                for name, entry in chunk:
+                    if name.startswith(".") or name.startswith("temp_") or name.startswith("converted_"):
+                        continue
+                    if entry.is_dir:
+                        dirs.append(name)
+                    elif name.lower().endswith(MEDIA_EXTENSIONS):
+                        files.append((name, entry.size or 0))
+                if dirs or files:
+                    self._merge_listing(dirs, files)
+                    self.app.request_redraw()
+        except Exception:
             pass
         finally:
             self.loading = False
-            # Force refresh if possible?
-            # The app loop handles it via timeout, so it will appear on next tick.
+            self.app.request_redraw()
 
-    def _quick_size_check(self):
-        """Fast pass to get file sizes before probing."""
-        for f in self.files:
-            try:
-                full_path = os.path.join(self.path, f)
-                # No need to check isdir here, self.files only contains files
-                size = os.path.getsize(full_path)
-                with self.metadata_lock:
-                    if f not in self.metadata:
-                        self.metadata[f] = type(
-                            "obj",
-                            (object,),
-                            {"size_bytes": size, "probed": False, "tracks": [], "filename": f},
-                        )
-            except:
-                pass
+    def _merge_listing(self, new_dirs, new_files):
+        """
+        Merge a chunk of the listing into the sorted dirs/files lists and the sort index.
+        new_files: [(filename, size)]; sizes come from the listing, so rows sort by size before probing.
+        """
+        new_dirs.sort()
+        new_files.sort()
+        names = [f for f, _ in new_files]
+        with self.metadata_lock:
+            for f, size in new_files:
+                if f not in self.metadata:
+                    self.metadata[f] = _UnprobedFile(f, size)
+            # New lists rather than in-place inserts: draw() may be iterating the old ones
+            self.dirs = list(heapq.merge(self.dirs, new_dirs))
+            self.files = list(heapq.merge(self.files, names))
+            self.filenames = self.dirs + self.files
+            self.total_count = len(self.files)
+            if self._search_index is not None:
+                for f in names:
+                    self._search_index.add(f)
+            if self._search_matches is not None:
+                self._search_matches.update(f for f in names if self._search_index.matches_name(self._query, f))
+            if self._sort_state is not None:
+                # Insert into the existing order instead of re-sorting everything per chunk
+                for f in names:
+                    self._sort_index.update(f)
+                self._sort_state = self._sort_state[:-1] + (self.files,)
+            self._scan_backlog.extend((f, False) for f in names)
+        self._start_scan_feeder()
 
     def _submit_scan_tasks(self, force=False):
-        """Submit files to the global scanner background queue."""
-        tasks = []
-        for f in self.files:
-            full_path = os.path.join(self.path, f)
-            # No isdir check needed
+        """Queue every file for probing; the backlog is handed to the scanner as it catches up."""
+        with self.metadata_lock:
+            self._scan_backlog.clear()
+            self._scan_backlog.extend((f, force) for f in self.files)
+        self._start_scan_feeder()
 
-            # We pass the filename as context to the callback so we know which entry to update
-            tasks.append((full_path, lambda p, m, fname=f: self._on_probe_complete(fname, m)))
+    def _start_scan_feeder(self):
+        with self.metadata_lock:
+            if self._scan_feeding or not self._scan_backlog:
+                return
+            self._scan_feeding = True
+        threading.Thread(target=self._feed_scanner, daemon=True).start()
 
-        self.app.scanner.add_background_items(tasks, force=force)
+    def _feed_scanner(self):
+        """
+        Keep up to SCAN_WINDOW of this folder's files in the scanner's background queue,
+        so a huge folder does not flood it (and visible-row priority requests stay cheap).
+        Stops when the backlog is empty or the Explorer was left for good.
+        """
+        while True:
+            if not self.app.is_live_view(self):
+                with self.metadata_lock:
+                    self._scan_backlog.clear()
+                    self._scan_feeding = False
+                return
+            room = SCAN_WINDOW - self.app.scanner.background_depth()
+            batches = {False: [], True: []}
+            with self.metadata_lock:
+                while room > 0 and self._scan_backlog:
+                    f, force = self._scan_backlog.popleft()
+                    full_path = os.path.join(self.path, f)
+                    # We pass the filename as context to the callback so we know which entry to update
+                    batches[force].append((full_path, lambda p, m, fname=f: self._on_probe_complete(fname, m)))
+                    room -= 1
+                if not self._scan_backlog and not batches[False] and not batches[True]:
+                    # Decided under the lock, so a concurrent _start_scan_feeder() starts a new feeder
+                    self._scan_feeding = False
+                    return
+            for force, tasks in batches.items():
+                if tasks:
+                    self.app.scanner.add_background_items(tasks, force=force)
+            time.sleep(SCAN_PACE_SECS)
 
     def _detect_batches(self):
         """Run batch detection on the current set of probed files."""
@@ -226,6 +321,8 @@ class FileExplorer:
 
     def refresh_metadata(self, filenames):
         """Forces a re-probe of specifically named files."""
+        # Outputs were just written: re-list directories on the next lookup
+        dir_snapshots.invalidate()
         tasks = []
         for f in filenames:
             with self.metadata_lock:
@@ -233,40 +330,58 @@ class FileExplorer:
                     if getattr(self.metadata[f], "probed", False):
                         self.probed_count -= 1
                     self.metadata[f].probed = False
+                    self._sort_index.update(f)
             full_path = os.path.join(self.path, f)
             tasks.append((full_path, lambda p, m, fname=f: self._on_probe_complete(fname, m)))
         
         if tasks:
             self.app.scanner.add_priority_items(tasks, force=True)
 
+    @staticmethod
+    def _content_stamp(media):
+        """What the row and the sort keys read from the tracks (cheap to compare every frame)."""
+        return len(media.tracks), tuple(
+            (t.language, t.codec_name, t.bit_rate, t.enabled) for t in media.tracks if t.codec_type == "audio"
+        )
+
+    def _refresh_edited(self, filename, media):
+        """Re-file a MediaFile whose tracks changed in place (languages, donor or external tracks)."""
+        with self.metadata_lock:
+            self._flags[filename] = FileFlags(media)
+            self._sort_index.update(filename)
+        self.app.request_redraw()
+
     def _on_probe_complete(self, filename, media):
         """Callback from global scanner when probing is done."""
         with self.metadata_lock:
+            # Count incrementally; recounting the whole directory per file is quadratic
+            if not getattr(self.metadata.get(filename), "probed", False):
+                self.probed_count += 1
             self.metadata[filename] = media
             media.probed = True
-            # Update counts?
-            # We don't strictly track probed_count vs total_count reliably for "Scanner"
-            # because the scanner is global. But we can just count how many in our metadata have probed=True.
-            self.probed_count = sum(
-                1 for m in self.metadata.values() if getattr(m, "probed", False)
-            )
+            self._flags[filename] = FileFlags(media)
+            self._sort_index.update(filename)
 
         # Seed donors cache with this file's path and duration
         donor_cache = getattr(self.app, "donor_cache", None)
         if donor_cache is not None:
             donor_cache.register(media.path, media.duration)
+        fingerprint_indexer = getattr(self.app, "fingerprint_indexer", None)
+        if fingerprint_indexer is not None:
+            fingerprint_indexer.submit(media)
 
         # Check for converted counterpart in background
-        threading.Thread(target=self._check_converted_status, args=(filename,), daemon=True).start()
+        background.submit(
+            self._check_converted_status, filename,
+            priority=PRIORITY_BACKGROUND, key=("converted", self.path, filename), owner=self,
+        )
 
         # Run detection occasionally?
         # Every 5 files or if done?
         if self.probed_count % 5 == 0 or self.probed_count == self.total_count:
             self._detect_batches()
+        self.app.request_redraw()
 
-        # Trigger redraw if this is the active view?
-        # The main loop redraws constantly on input, but if idle, we rely on timeout.
-        # APP_TIMEOUT_MS handles the refresh rate.
 
     def _check_converted_status(self, filename):
         """Check if a converted version of the file exists on disk (async)."""
@@ -285,38 +400,13 @@ class FileExplorer:
             ),
         ]
 
-        output_path = None
-        for path in candidates:
-            if os.path.exists(path):
-                output_path = path
-                break
-
+        # Answered from directory snapshots: one listing per directory, not four stats per file
+        output_path = dir_snapshots.first_existing(candidates)
         if output_path:
             with self.metadata_lock:
                 self.metadata[f"{filename}_has_converted"] = True
                 self.metadata[f"{filename}_output_path"] = output_path
-
-
-    def _get_items_separated(self):
-        extensions = (".mkv", ".mp4", ".avi", ".mov", ".m4v")
-        dirs, files = [], []
-        try:
-            with os.scandir(self.path) as it:
-                for entry in it:
-                    if entry.name.startswith(".") or entry.name.startswith("temp_"):
-                        continue
-                    if entry.is_dir():
-                        if not entry.name.startswith("converted_"):
-                            dirs.append(entry.name)
-                    elif entry.is_file():
-                        if entry.name.lower().endswith(extensions) and not entry.name.startswith(
-                            "converted_"
-                        ):
-                            files.append(entry.name)
-
-            return sorted(dirs), sorted(files)
-        except Exception:
-            return [], []
+            self.app.request_redraw()
 
 
     def _prioritize_visible(self, force=False):
@@ -357,60 +447,85 @@ class FileExplorer:
                 tasks_to_prioritize, clear_priority=True, force=force
             )
 
-    def _get_sorted_files(self):
-        # Use cached dirs and files list to avoid repeated os.path.isdir calls
-        dirs = self.dirs
-        files = list(self.files)  # Copy to avoid mutating original
-
-        with self.metadata_lock:
-            rev = self.sort_reverse
-            if self.sort_mode == "name":
-                files = sorted(files, reverse=rev)
-            elif self.sort_mode == "size":
-                files = sorted(
-                    files,
-                    key=lambda f: self.metadata.get(f).size_bytes if f in self.metadata else 0,
-                    reverse=rev,
-                )
+    def _sort_key(self, filename):
+        """Sort key of one file under the current mode (caller holds metadata_lock)."""
+        if self.sort_mode == "name":
+            return (filename,)
+        media = self.metadata.get(filename)
+        value = 0
+        if media is not None:
+            if self.sort_mode == "size":
+                value = media.size_bytes
             elif self.sort_mode == "tracks":
-                files = sorted(
-                    files,
-                    key=lambda f: (
-                        len([t for t in self.metadata.get(f).tracks if t.codec_type == "audio"])
-                        if f in self.metadata and hasattr(self.metadata[f], "tracks")
-                        else 0
-                    ),
-                    reverse=rev,
-                )
+                value = len([t for t in media.tracks if t.codec_type == "audio"])
             elif self.sort_mode == "audio_size":
-                files = sorted(
-                    files,
-                    key=lambda f: (
-                        sum(
-                            (t.bit_rate * getattr(self.metadata[f], "duration", 0)) / 8
-                            for t in self.metadata.get(f).tracks
-                            if t.codec_type == "audio" and t.bit_rate
-                        )
-                        if f in self.metadata and hasattr(self.metadata[f], "tracks")
-                        else 0
-                    ),
-                    reverse=rev,
-                )
+                duration = getattr(media, "duration", 0)
+                value = sum((t.bit_rate * duration) / 8 for t in media.tracks if t.codec_type == "audio" and t.bit_rate)
+        # Descending numeric sorts keep ties in name order
+        return (-value if self.sort_reverse else value, filename)
+
+    def _passes_filter(self, filename):
+        """[D] toggle and search bar (caller holds metadata_lock); compares precomputed flags only."""
+        flags = self._flags.get(filename)
+        if self.dts_filter and not (flags is not None and flags.dts):
+            return False
+        if self._search_matches is not None and filename not in self._search_matches:
+            return False
+        return self._query.matches_flags(flags)
+
+    def _set_search(self, text):
+        """Apply the search bar text; the list is re-filtered on the next draw."""
+        with self.metadata_lock:
+            self.search_text = text
+            self._query = SearchQuery(text)
+            if self._query.words or self._query.excluded:
+                if self._search_index is None:
+                    self._search_index = FileSearchIndex(self.files)
+                self._search_matches = self._search_index.search(self._query)
+            else:
+                self._search_matches = None
+        self.selected_idx = 0
+        self.scroll_idx = 0
 
-            # DTS filter: drop files that have no DTS audio track (only when filter on)
-            if self.dts_filter:
-                files = [
-                    f
-                    for f in files
-                    if f in self.metadata
-                    and getattr(self.metadata[f], "probed", False)
-                    and any(
-                        t.codec_type == "audio" and t.codec_name.lower() in {"dts", "dts-hd"}
-                        for t in self.metadata[f].tracks
-                    )
-                ]
+    def _handle_search_key(self, key):
+        """Keys while the search bar is open. Returns False for keys the list should handle."""
+        if key == KEY_ESC:
+            self.searching = False
+            self._set_search("")
+        elif key == KEY_ENTER:
+            self.searching = False  # keep the filter, give the keys back to the list
+        elif key in KEY_BACKSPACE_KEYS:
+            if self.search_text:
+                self._set_search(self.search_text[:-1])
+        elif 32 <= key < 127:
+            self._set_search(self.search_text + chr(key))
+        elif key in (curses.KEY_UP, curses.KEY_DOWN, curses.KEY_PPAGE, curses.KEY_NPAGE):
+            return False
+        return True
+
+    def _get_sorted_files(self):
+        """dirs + files in display order, served from the incremental sort index."""
+        with self.metadata_lock:
+            state = (self.sort_mode, self.sort_reverse, self.dts_filter, self.search_text, self.files)
+            if self._sort_state is None or any(a is not b and a != b for a, b in zip(state, self._sort_state)):
+                filtered = self.dts_filter or bool(self._query)
+                self._sort_index.rebuild(
+                    # Only the word matches can pass, so only they are visited
+                    self._search_matches if self._search_matches is not None else self.files,
+                    self._sort_key,
+                    self._passes_filter if filtered else None,
+                    descending=self.sort_mode == "name" and self.sort_reverse,
+                )
+                self._sort_state = state
+            version = (self._sort_index.version, len(self.dirs))
+            if version != self._sorted_version:
+                self._sorted_files = self.dirs + self._sort_index.names
+                self._sorted_version = version
+            return self._sorted_files
 
-        return dirs + files
+    def redraw_interval(self):
+        """Seconds between unprompted redraws; probe results and queue progress post wakeups."""
+        return 0.1 if self.loading else None
 
     def draw(self):
         self.app.stdscr.erase()
@@ -473,7 +588,13 @@ class FileExplorer:
 
         # Batch Indicator in Header
 
-        if t_count > 0:
+        if self.loading and t_count > 0:
+            # Listing still streaming in: rows are shown as they arrive
+            progress_text = f" Listing: {t_count} files... "
+            start_col = header_end + 2
+            if width > start_col + len(progress_text):
+                self.app.stdscr.addstr(0, start_col, progress_text, curses.color_pair(2))
+        elif t_count > 0:
             if p_count < t_count:
                 # Progress bar (10 chars wide)
                 bar_len = 10
@@ -528,7 +649,7 @@ class FileExplorer:
         # File List
         list_height = height - 5
 
-        if self.loading:
+        if self.loading and not sorted_files:
             # Debounce: Only show loading if it takes longer than 200ms
             if time.time() - self.load_start_time < 0.2:
                 self._draw_footer(height, width)
@@ -599,133 +720,33 @@ class FileExplorer:
                 media = self.metadata.get(filename)
 
             if media and getattr(media, "probed", False):
-                audio_tracks = [t for t in media.tracks if t.codec_type == "audio"]
-                audio_size_mb = 0
-                any_estimated = False
-                for t in audio_tracks:
-                    if t.bit_rate:
-                        audio_size_mb += (t.bit_rate * media.duration) / 8 / 1024 / 1024
-                        if getattr(t, "bit_rate_is_estimated", False):
-                            any_estimated = True
-                
-                langs = ",".join([t.display_language for t in audio_tracks if t.display_language]) or "und"
-                size_mb = media.size_bytes / 1024 / 1024
-
-                size_str = format_size(size_mb, precision=1)
-                
-                # Format audio size with ~ if any track size is estimated
-                a_size_val = format_size(audio_size_mb, precision=1).replace(" ", "")
-                if any_estimated:
-                    a_size_str = f"~{a_size_val}"
-                else:
-                    a_size_str = a_size_val
-
-                # Set HD Audio badge logic
-                highest_hd_audio = None
-                for t in audio_tracks:
-                    if t.codec_type == "audio":
-                        c_name = t.codec_name.lower()
-                        if c_name == "truehd":
-                            highest_hd_audio = "THD"
-                        elif c_name in ("pcm_bluray", "pcm_s16le", "pcm_s24le", "pcm_s32le"):
-                            if highest_hd_audio != "THD":
-                                highest_hd_audio = "PCM"
-                        elif c_name in ("dts", "dts-hd"):
-                            if highest_hd_audio not in ("THD", "PCM"):
-                                highest_hd_audio = "DTS"
-
-                has_dts = highest_hd_audio is not None
-
-                # Check for converted counterpart or temp status early for badge logic
-                is_converted = filename.startswith("converted_")
-                is_temp = filename.startswith("temp_")
+                full_path = os.path.join(self.path, filename)
+                q_status = queued_paths.get(full_path)
+                pct_str = ""
+                if q_status == "running" and hasattr(self.app, "queue_worker") and self.app.queue_worker.current_task and self.app.queue_worker.current_task.media_file_dict.get('path') == full_path:
+                    pct_str = f" {self.app.queue_worker.percent}%"
 
                 # Badge logic moved to background check to avoid UI lag on remote mounts
                 has_converted = self.metadata.get(f"{filename}_has_converted", False)
                 output_path = self.metadata.get(f"{filename}_output_path")
 
-                dts_tag = "    "
-                if has_dts:
-                    dts_tag = f" {highest_hd_audio}"
-
-                    # If this file was already processed, peek into cache or probe it once
-                    if has_converted:
-                        if filename in self.dts_badge_cache:
-                            if self.dts_badge_cache[filename]:
-                                dts_tag = f"{highest_hd_audio}>AC3"
-                        else:
-                            # Not in cache, probe it asynchronously to prevent UI freeze
-                            self.dts_badge_cache[filename] = False  # Default to false while probing
-
-                            def _probe_badge(path=output_path, name=filename, tracks=audio_tracks):
-                                if not path or not os.path.exists(path):
-                                    return
-
-                                try:
-                                    from ..core.converter import MediaConverter
-                                    from ..core.probe import MediaProbe
-
-                                    ex_media = MediaProbe.probe(path)
-                                    is_t = False
-                                    for ex_track in ex_media.tracks:
-                                        lower_tags = {
-                                            k.lower(): v for k, v in ex_track.tags.items()
-                                        }
-                                        if (
-                                            "trackremux_id" in lower_tags
-                                            and ex_track.codec_type == "audio"
-                                            and ex_track.codec_name.lower() == "ac3"
-                                        ):
-                                            src_idx = int(lower_tags["trackremux_id"])
-                                            if any(
-                                                t.index == src_idx
-                                                and t.codec_name.lower()
-                                                in MediaConverter.HD_CODECS
-                                                for t in tracks
-                                            ):
-                                                is_t = True
-                                                break
-                                    if is_t:
-                                        self.dts_badge_cache[name] = True
-                                except Exception:
-                                    pass
-
-                            import threading
-
-                            threading.Thread(target=_probe_badge, daemon=True).start()
-
-                # Format appropriately: DTS is 4 chars, DTS>AC3 is 7 chars.
-                f_dts_tag = dts_tag.ljust(7)
-
-                full_path = os.path.join(self.path, filename)
-                q_status = queued_paths.get(full_path)
-                
-                attr_override = None
-                if q_status == "running":
-                    pct_str = ""
-                    if hasattr(self.app, "queue_worker") and self.app.queue_worker.current_task and self.app.queue_worker.current_task.media_file_dict.get('path') == full_path:
-                        pct_str = f" {self.app.queue_worker.percent}%"
-                    track_info = f"[ {('RUNNING' + pct_str):^23} ]"
-                    attr_override = curses.color_pair(3) | curses.A_BOLD
-                elif q_status == "pending":
-                    track_info = f"[ {'PENDING':^23} ]"
-                    attr_override = curses.color_pair(3) | curses.A_DIM
+                # Rows are only re-formatted when something they show changed. The Editor
+                # edits the same MediaFile in place, so its tracks are part of the stamp.
+                content = self._content_stamp(media)
+                stamp = (name_col_width, q_status, pct_str, has_converted, content, self.dts_badge_cache.get(filename))
+                cached = self._row_cache.get(filename)
+                if cached and cached[0] is media and cached[1][4] != content:
+                    self._refresh_edited(filename, media)
+                if cached and cached[0] is media and cached[1] == stamp:
+                    line, attr_override, sz_str, size_attr = cached[2]
                 else:
-                    # Ensure the total size of track_info is exactly 27 characters
-                    track_info = f"[{len(audio_tracks):>2} aud: {f_dts_tag} {a_size_str:>8} ]"
-                # Truncate and pad filename to exactly name_col_width
-                display_filename = get_display_name(filename, name_col_width).ljust(name_col_width)
-
-                # Language column exactly 15 chars
-                lang_str = f"({langs[:13]})".ljust(15)
-
-                # Size column exactly 10 chars
-                sz_str = f"{size_str:>10}"
-
-                # Compose line with exact spacing
-                # 1(space) + 26(track) + 1(space) + name_col_width + 1(space) + 15(lang) + 2(space) + 10(size)
-                # Note: `track_info` is exactly 26 chars long due to `DTS>AC3` (7 chars) + strict padding
-                line = f" {track_info} {display_filename} {lang_str}  {sz_str}"
+                    line, attr_override, sz_str, size_attr = self._format_file_row(
+                        filename, media, name_col_width, q_status, pct_str, has_converted, output_path
+                    )
+                    if len(self._row_cache) > 4 * max(list_height, 50):
+                        self._row_cache.clear()
+                    stamp = stamp[:-1] + (self.dts_badge_cache.get(filename),)
+                    self._row_cache[filename] = (media, stamp, (line, attr_override, sz_str, size_attr))
 
                 # Draw the base line
                 if idx == self.selected_idx:
@@ -741,29 +762,12 @@ class FileExplorer:
                 )
 
                 # Overwrite size with color if interesting
-                if idx != self.selected_idx:
+                if idx != self.selected_idx and size_attr is not None:
                     # Size starts 10 chars from the end of the composed line (before trailing spaces if width > len(line))
                     # But if the window is too small, we shouldn't draw out of bounds
                     size_x = max(0, len(line) - 10)
                     if size_x + 10 <= width - 1:
-                        if is_converted:
-                            self.app.stdscr.addstr(
-                                i + FILE_LIST_Y_OFFSET,
-                                size_x,
-                                sz_str,
-                                curses.color_pair(2) | curses.A_BOLD,
-                            )
-                        elif is_temp:
-                            self.app.stdscr.addstr(
-                                i + FILE_LIST_Y_OFFSET,
-                                size_x,
-                                sz_str,
-                                curses.color_pair(3) | curses.A_DIM,
-                            )
-                        elif has_converted:
-                            self.app.stdscr.addstr(
-                                i + FILE_LIST_Y_OFFSET, size_x, sz_str, curses.color_pair(1)
-                            )
+                        self.app.stdscr.addstr(i + FILE_LIST_Y_OFFSET, size_x, sz_str, size_attr)
                 continue  # Skip the default addstr below
             elif media:
                 size_mb = media.size_bytes / 1024 / 1024
@@ -781,6 +785,7 @@ class FileExplorer:
                 i + FILE_LIST_Y_OFFSET, 0, line[: width - 1].ljust(width - 1), attr
             )
 
+        self._draw_search_bar(height, width, len(sorted_files) - len(self.dirs))
         self._draw_footer(height, width)
 
         if self.confirming_quit:
@@ -809,6 +814,154 @@ class FileExplorer:
         # Trigger prioritization for current view
         self._prioritize_visible()
 
+    def _format_file_row(self, filename, media, name_col_width, q_status, pct_str, has_converted, output_path):
+        """
+        Format the row of a probed file: (line, attr_override, size_str, size_attr).
+        Only called for visible rows whose cached rendering is stale.
+        """
+        audio_tracks = [t for t in media.tracks if t.codec_type == "audio"]
+        audio_size_mb = 0
+        any_estimated = False
+        for t in audio_tracks:
+            if t.bit_rate:
+                audio_size_mb += (t.bit_rate * media.duration) / 8 / 1024 / 1024
+                if getattr(t, "bit_rate_is_estimated", False):
+                    any_estimated = True
+
+        langs = ",".join([t.display_language for t in audio_tracks if t.display_language]) or "und"
+        size_mb = media.size_bytes / 1024 / 1024
+
+        size_str = format_size(size_mb, precision=1)
+
+        # Format audio size with ~ if any track size is estimated
+        a_size_val = format_size(audio_size_mb, precision=1).replace(" ", "")
+        if any_estimated:
+            a_size_str = f"~{a_size_val}"
+        else:
+            a_size_str = a_size_val
+
+        # Set HD Audio badge logic
+        highest_hd_audio = None
+        for t in audio_tracks:
+            if t.codec_type == "audio":
+                c_name = t.codec_name.lower()
+                if c_name == "truehd":
+                    highest_hd_audio = "THD"
+                elif c_name in ("pcm_bluray", "pcm_s16le", "pcm_s24le", "pcm_s32le"):
+                    if highest_hd_audio != "THD":
+                        highest_hd_audio = "PCM"
+                elif c_name in ("dts", "dts-hd"):
+                    if highest_hd_audio not in ("THD", "PCM"):
+                        highest_hd_audio = "DTS"
+
+        has_dts = highest_hd_audio is not None
+
+        # Check for converted counterpart or temp status early for badge logic
+        is_converted = filename.startswith("converted_")
+        is_temp = filename.startswith("temp_")
+
+        dts_tag = "    "
+        if has_dts:
+            dts_tag = f" {highest_hd_audio}"
+
+            # If this file was already processed, peek into cache or probe it once
+            if has_converted:
+                if filename in self.dts_badge_cache:
+                    if self.dts_badge_cache[filename]:
+                        dts_tag = f"{highest_hd_audio}>AC3"
+                else:
+                    # Not in cache, probe it asynchronously to prevent UI freeze
+                    self.dts_badge_cache[filename] = False  # Default to false while probing
+
+                    def _probe_badge(path=output_path, name=filename, tracks=audio_tracks):
+                        if not path or not dir_snapshots.isfile(path):
+                            return
+
+                        try:
+                            from ..core.converter import MediaConverter
+                            from ..core.probe import MediaProbe
+
+                            ex_media = MediaProbe.probe(path)
+                            is_t = False
+                            for ex_track in ex_media.tracks:
+                                lower_tags = {
+                                    k.lower(): v for k, v in ex_track.tags.items()
+                                }
+                                if (
+                                    "trackremux_id" in lower_tags
+                                    and ex_track.codec_type == "audio"
+                                    and ex_track.codec_name.lower() == "ac3"
+                                ):
+                                    src_idx = int(lower_tags["trackremux_id"])
+                                    if any(
+                                        t.index == src_idx
+                                        and t.codec_name.lower()
+                                        in MediaConverter.HD_CODECS
+                                        for t in tracks
+                                    ):
+                                        is_t = True
+                                        break
+                            if is_t:
+                                self.dts_badge_cache[name] = True
+                                self.app.request_redraw()
+                        except Exception:
+                            pass
+
+                    job = background.submit(
+                        _probe_badge, priority=PRIORITY_VISIBLE, key=("badge", output_path), owner=self
+                    )
+                    if job is None:
+                        # Queue full of more urgent work: try again on a later draw
+                        self.dts_badge_cache.pop(filename, None)
+
+        # Format appropriately: DTS is 4 chars, DTS>AC3 is 7 chars.
+        f_dts_tag = dts_tag.ljust(7)
+
+        attr_override = None
+        if q_status == "running":
+            track_info = f"[ {('RUNNING' + pct_str):^23} ]"
+            attr_override = curses.color_pair(3) | curses.A_BOLD
+        elif q_status == "pending":
+            track_info = f"[ {'PENDING':^23} ]"
+            attr_override = curses.color_pair(3) | curses.A_DIM
+        else:
+            # Ensure the total size of track_info is exactly 27 characters
+            track_info = f"[{len(audio_tracks):>2} aud: {f_dts_tag} {a_size_str:>8} ]"
+        # Truncate and pad filename to exactly name_col_width
+        display_filename = get_display_name(filename, name_col_width).ljust(name_col_width)
+
+        # Language column exactly 15 chars
+        lang_str = f"({langs[:13]})".ljust(15)
+
+        # Size column exactly 10 chars
+        sz_str = f"{size_str:>10}"
+
+        # Compose line with exact spacing
+        # 1(space) + 26(track) + 1(space) + name_col_width + 1(space) + 15(lang) + 2(space) + 10(size)
+        # Note: `track_info` is exactly 26 chars long due to `DTS>AC3` (7 chars) + strict padding
+        line = f" {track_info} {display_filename} {lang_str}  {sz_str}"
+
+        size_attr = None
+        if is_converted:
+            size_attr = curses.color_pair(2) | curses.A_BOLD
+        elif is_temp:
+            size_attr = curses.color_pair(3) | curses.A_DIM
+        elif has_converted:
+            size_attr = curses.color_pair(1)
+        return line, attr_override, sz_str, size_attr
+
+    def _draw_search_bar(self, height, width, match_count):
+        """Search bar above the footer while it is open or a search filter is active."""
+        if not (self.searching or self.search_text) or height < 6:
+            return
+        cursor = "_" if self.searching else ""
+        hint = "[ENTER] Keep  [ESC] Clear" if self.searching else "[/] Edit  [ESC] Clear"
+        bar = f" Search: {self.search_text}{cursor}"
+        info = f" {match_count} match{'es' if match_count != 1 else ''}  {hint} "
+        line = bar.ljust(max(len(bar) + 2, width - 1 - len(info))) + info
+        attr = curses.color_pair(5) | curses.A_BOLD if self.searching else curses.color_pair(2)
+        self.app.stdscr.addstr(height - 2, 0, line[: width - 1].ljust(width - 1), attr)
+
     def _draw_footer(self, height, width):
         # Footer - split into left and right sections
         mouse_status = "APP" if self.app.mouse_enabled else "TERM"
@@ -818,7 +971,7 @@ class FileExplorer:
         quit_label = "Back" if self.back_view else "Quit"
         mouse_footer = f"[M] Mouse: {mouse_status}"
         batch_opt = "[B]atch | " if self.batches else ""
-        action_footer = f"[?] Help | [ENTER] Open | {batch_opt}[V] Queue | [R]escan | [Q/ESC] {quit_label} "
+        action_footer = f"[?] Help | [/] Search | [ENTER] Open | {batch_opt}[V] Queue | [R]escan | [Q/ESC] {quit_label} "
 
         # Draw left-aligned sort section
         left_text = sort_footer[: width - 1]
@@ -854,7 +1007,15 @@ class FileExplorer:
                 self.confirming_quit = False
             return
 
-        if key in (KEY_Q_LOWER, KEY_Q_UPPER, KEY_ESC, KEY_CTRL_C):
+        if self.searching and self._handle_search_key(key):
+            return
+
+        if key == KEY_SLASH:
+            self.searching = True
+        elif key == KEY_ESC and self.search_text:
+            # First ESC drops the search filter, the next one leaves the view
+            self._set_search("")
+        elif key in (KEY_Q_LOWER, KEY_Q_UPPER, KEY_ESC, KEY_CTRL_C):
             if self.back_view:
                 self.app.switch_view(self.back_view)
             else:
@@ -871,6 +1032,7 @@ class FileExplorer:
             self.app.toggle_mouse()
         elif key in (KEY_R_LOWER, KEY_R_UPPER):
             # Re-scan current directory
+            dir_snapshots.invalidate()
             with self.metadata_lock:
                 # Reset metadata to unprobed state so UI shows update
                 for f in self.files:
@@ -879,9 +1041,8 @@ class FileExplorer:
                         # but we want scanning text to appear.
                         self.metadata[f].probed = False
                 self.probed_count = 0
+                self._sort_state = None
 
-            self._submit_scan_tasks(force=True)
-            # Also prioritize visible immediately
             self._submit_scan_tasks(force=True)
             # Also prioritize visible immediately
             self._prioritize_visible(force=True)
@@ -0,0 +1,185 @@
+"""
+Incremental filename search and structured filters for the Explorer.
+
+The search bar ([/]) filters the file list on every keystroke, so a lookup must
+not walk 5,000 names or their track lists:
+
+- FileSearchIndex keeps every name lowercased plus a trigram index
+  (trigram -> names). A word of three or more characters is answered by
+  intersecting its trigram sets and confirming the substring on the few
+  candidates; shorter words filter the current result. Typing more characters
+  into the last word narrows the previous result instead of searching again.
+- FileFlags are computed once per probe from the track list (audio codecs,
+  languages, channel count, commentary, HD audio, DTS), so structured filters
+  and the [D] toggle compare a few precomputed values per file.
+
+Query syntax: words match anywhere in the filename (all must match); structured
+terms filter on probed metadata, and a leading "-" negates any term:
+
+    codec:dts     an audio track whose codec starts with "dts"
+    lang:ger      an audio or subtitle track in that language (prefix)
+    ch:6          an audio track with at least 6 channels
+    has:hd        HD audio (DTS-HD, TrueHD, PCM)
+    has:dts       DTS audio
+    has:commentary  a commentary track
+"""
+
+from collections import defaultdict
+from typing import Callable, Iterable, Optional
+
+from ..core.converter import MediaConverter
+
+DTS_CODECS = {"dts", "dts-hd"}
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class FileFlags:
+    """Per-file facts the filters look at, computed once when the file is probed."""
+
+    __slots__ = ("audio_codecs", "languages", "max_channels", "commentary", "hd_audio", "dts")
+
+    def __init__(self, media):
+        audio = [t for t in media.tracks if t.codec_type == "audio"]
+        self.audio_codecs = frozenset(t.codec_name.lower() for t in audio)
+        self.languages = frozenset(
+            t.language.lower() for t in media.tracks
+            if t.codec_type in ("audio", "subtitle") and t.language
+        )
+        self.max_channels = max((t.channels or 0 for t in audio), default=0)
+        self.commentary = any(t.is_commentary for t in media.tracks if t.codec_type in ("audio", "subtitle"))
+        self.hd_audio = bool(self.audio_codecs & MediaConverter.HD_CODECS)
+        self.dts = bool(self.audio_codecs & DTS_CODECS)
+
+
+def _term(key: str, value: str) -> Optional[Callable[[FileFlags], bool]]:
+    """Predicate for one structured term, or None when the term is not understood."""
+    if key == "codec":
+        return lambda f: any(c.startswith(value) for c in f.audio_codecs)
+    if key == "lang":
+        return lambda f: any(lang.startswith(value) for lang in f.languages)
+    if key == "ch":
+        try:
+            channels = int(value.rstrip("+"))
+        except ValueError:
+            return None
+        return lambda f: f.max_channels >= channels
+    if key in ("has", "is"):
+        attr = {"hd": "hd_audio", "dts": "dts", "commentary": "commentary", "comm": "commentary"}.get(value)
+        if attr is None:
+            return None
+        return lambda f: getattr(f, attr)
+    return None
+
+
+class SearchQuery:
+    """A parsed search bar text: filename words plus structured predicates."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.words: list[str] = []          # lowercased, must all occur in the name
+        self.excluded: list[str] = []       # lowercased, must not occur
+        self.terms: list[tuple[bool, Callable[[FileFlags], bool]]] = []  # (negated, predicate)
+        for raw in text.lower().split():
+            negated = raw.startswith("-") and len(raw) > 1
+            token = raw[1:] if negated else raw
+            key, sep, value = token.partition(":")
+            if sep and value:
+                predicate = _term(key, value)
+                if predicate is not None:
+                    self.terms.append((negated, predicate))
+                    continue
+            (self.excluded if negated else self.words).append(token)
+
+    def __bool__(self) -> bool:
+        return bool(self.words or self.excluded or self.terms)
+
+    def matches_flags(self, flags: Optional[FileFlags]) -> bool:
+        """Structured terms; files that are not probed yet match none."""
+        if not self.terms:
+            return True
+        if flags is None:
+            return False
+        return all(predicate(flags) != negated for negated, predicate in self.terms)
+
+
+class FileSearchIndex:
+    """Lowercased names and a trigram index over them. Not thread-safe: the Explorer holds metadata_lock."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._lower: dict[str, str] = {}
+        self._grams: dict[str, set[str]] = defaultdict(set)
+        self._last: Optional[tuple[tuple[str, ...], tuple[str, ...], set[str]]] = None  # (words, excluded, result)
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        if name in self._lower:
+            return
+        lower = name.lower()
+        self._lower[name] = lower
+        for gram in _trigrams(lower):
+            self._grams[gram].add(name)
+        self._last = None
+
+    def remove(self, name: str) -> None:
+        lower = self._lower.pop(name, None)
+        if lower is None:
+            return
+        for gram in _trigrams(lower):
+            names = self._grams.get(gram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._grams[gram]
+        self._last = None
+
+    def _word(self, word: str, within: Optional[set[str]]) -> set[str]:
+        """Names containing word, limited to within when given."""
+        if len(word) >= 3:
+            sets = sorted((self._grams.get(g, set()) for g in _trigrams(word)), key=len)
+            if within is not None and len(within) < len(sets[0]):
+                candidates = within
+            else:
+                # Set intersections run in C; only the survivors get a substring check
+                candidates = sets[0].intersection(*sets[1:])
+                if within is not None:
+                    candidates &= within
+                if len(word) == 3:
+                    return candidates
+            return {n for n in candidates if word in self._lower[n]}
+        if within is not None:
+            return {n for n in within if word in self._lower[n]}
+        return {n for n, lower in self._lower.items() if word in lower}
+
+    def search(self, query: SearchQuery) -> Optional[set[str]]:
+        """Names matching the query's words, or None when it has none (everything matches)."""
+        if not query.words and not query.excluded:
+            return None
+        words, excluded = tuple(query.words), tuple(query.excluded)
+        last = self._last
+        if (
+            last is not None and words and excluded == last[1]
+            and len(words) == len(last[0]) and words[:-1] == last[0][:-1]
+            and words[-1].startswith(last[0][-1])
+        ):
+            # Typing on: the new result is a subset of the previous one
+            result = self._word(words[-1], last[2])
+        else:
+            matched: Optional[set[str]] = None
+            for word in words:
+                matched = self._word(word, matched)
+                if not matched:
+                    break
+            result = set(self._lower) if matched is None else matched
+            for word in excluded:
+                result -= self._word(word, result)
+        self._last = (words, excluded, result)
+        return result
+
+    def matches_name(self, query: SearchQuery, name: str) -> bool:
+        """Check one name (e.g. a file that just showed up) without the index."""
+        lower = name.lower()
+        return all(w in lower for w in query.words) and not any(w in lower for w in query.excluded)
@@ -30,6 +30,10 @@ or incompatible audio formats.
 - PgUp / PgDn:  Scroll by page.
 - ENTER:        Open the selected file or directory.
 - D:            Toggle filter (Show All vs. HD Audio only).
+- /:            Search as you type. Words match file names; filters match
+                probed tracks: codec:dts lang:ger ch:6 has:hd has:dts
+                has:commentary (prefix any term with - to exclude).
+                ENTER keeps the filter, ESC clears it.
 - B:            Open Batch Selector (if groups are detected).
 - V:            Open Background Queue View.
 - R:            Rescan current directory (clear cache).
@@ -68,12 +72,18 @@ lossless (no quality loss), extremely fast, and saves space.
 - SPACE:        Toggle selected track (Keep vs. Discard).
 - UP / DOWN:    Navigate tracks.
 - Shift+UP/DN:  Move (reorder) the selected track.
-- ENTER:        Preview the selected audio track (30s seekable).
+- ENTER:        Preview the selected audio track (30s seekable) or text subtitle
+                (internal or external; PGUP/PGDN/HOME/END to page).
 - L:            Set language code for the selected track (e.g., 'eng').
 - C:            Toggle HD Audio Conditioning (EAC3/AC3 fallback chain).
 - P:            Open Profile Manager (set auto-rules for languages).
 - A:            Apply your Profile to the current file instantly.
 - D:            Open Donor File Picker to import external audio.
+                (in the picker: a = Deep Analysis, stops at the first confident match;
+                 A = exhaustive analysis of every candidate;
+                 F = show/hide candidates whose audio fingerprint shares no content)
+                In batch mode D opens Season Donor Import: every episode is paired
+                with the same episode of another release and aligned in one go.
 - S:            Start remuxing (opens Output Mode dialog).
 - ?:            Show this Help screen.
 - ESC / Q:      Back to Media Browser.
@@ -131,6 +141,10 @@ class HelpView:
         # Split into lines for scrolling
         self.lines = [line.rstrip() for line in raw_text.strip().split("\n")]
 
+    def redraw_interval(self):
+        """Seconds between unprompted redraws (None: only on input or wakeups)."""
+        return None
+
     def draw(self):
         self.app.stdscr.erase()
         height, width = self.app.stdscr.getmaxyx()
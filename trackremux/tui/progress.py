@@ -5,8 +5,10 @@ import threading
 import time
 
 from ..core.converter import MediaConverter
+from ..core.encoders import encoder_capabilities, hd_audio_chains
 from ..core.history import copy_to_clipboard, save_command
 from ..core.models import OutputMode
+from ..core.throughput import ThroughputModel
 from .constants import KEY_ESC, KEY_Q_LOWER, KEY_Q_UPPER, KEY_HELP, KEY_H_LOWER, KEY_H_UPPER
 from .formatters import format_duration, format_size
 from .help import HelpView
@@ -161,7 +163,7 @@ class ProgressView:
         self.status = "Starting conversion..."
         self.frame_status = ""
         self.process = None
-        self._current_seconds = 0.0  # tracks out_time for ETA
+        self.last_event = None  # latest ProgressEvent (speed / ETA)
         self._copy_status = ""  # clipboard feedback
         self.codec_attempts = []  # list of str like ["TrueHD 7.1 → OK"] for display
         self.current_codec_label = ""  # what we're trying right now
@@ -176,18 +178,10 @@ class ProgressView:
         self.output_name = os.path.basename(self.output_path)
 
         # Build per-audio fallback chains if convert_audio
-        # dts_tracks map: audio_output_index -> (track, fallback_chain)
-        self._dts_fallback_chains: dict = {}  # a_idx -> [chain entries]
-        if convert_audio:
-            a_out_idx = 0
-            for t in media_file.tracks:
-                if not t.enabled:
-                    continue
-                if t.codec_type == "audio":
-                    if t.codec_name.lower() in MediaConverter.HD_CODECS:
-                        chain = MediaConverter.get_audio_fallback_chain(t)
-                        self._dts_fallback_chains[a_out_idx] = chain
-                    a_out_idx += 1
+        self._hd_chains = hd_audio_chains(media_file, convert_audio)  # a_idx -> (track, chain)
+        self._dts_fallback_chains: dict = {  # a_idx -> [chain entries]
+            idx: chain for idx, (_track, chain) in self._hd_chains.items()
+        }
 
         # Initial codec overrides: use first entry (preferred) from each chain
         self._codec_overrides = {
@@ -201,11 +195,10 @@ class ProgressView:
         self.estimated_size_mb = MediaConverter.estimate_output_size(media_file, convert_audio) / 1024 / 1024
         self.actual_size_mb = 0.0
 
-        # Get total frames for progress tracking
-        self.total_frames = 0
-        for t in self.media_file.tracks:
-            if t.codec_type == "video" and t.nb_frames:
-                self.total_frames = max(self.total_frames, t.nb_frames)
+        # Duration forecast from past runs on the same devices / job type (None without history)
+        self.predicted_seconds = ThroughputModel().predict_seconds(
+            media_file, self.output_path, convert_audio, self._codec_overrides
+        )
 
         # Save command to history log
         save_command(self.ffmpeg_cmd, self.media_file.path, self.output_path)
@@ -223,8 +216,19 @@ class ProgressView:
 
     def _run_conversion(self):
         try:
-            # Build per-track fallback state: a_idx -> current chain position
+            # Build per-track fallback state: a_idx -> current chain position.
+            # Short trial encodes pick a working entry before the full-length run.
             chain_pos = {idx: 0 for idx in self._dts_fallback_chains}
+            if chain_pos:
+                self.status = "Testing audio encoders..."
+                chain_pos = encoder_capabilities.choose(
+                    self.media_file, self._hd_chains, self.output_path, on_log=self._add_log
+                )
+                for idx, pos in chain_pos.items():
+                    for skipped in self._dts_fallback_chains[idx][:pos]:
+                        self.codec_attempts.append(f"{skipped['label']} ✘ (trial)")
+                if self.cancelled:
+                    return
 
             while True:  # retry loop for codec fallbacks
                 # Build codec_overrides from current chain positions
@@ -247,21 +251,23 @@ class ProgressView:
 
                 # Reset per-attempt state
                 self.percent = 0
-                self._current_seconds = 0.0
+                self.last_event = None
                 self.frame_status = ""
                 self.actual_size_mb = 0.0
 
+                attempt_start = time.time()
                 self.process = MediaConverter.convert(
                     self.media_file, self.staging_path,
                     convert_audio=self.convert_audio,
-                    codec_overrides=codec_overrides
+                    codec_overrides=codec_overrides,
+                    on_log=self._add_log,
                 )
 
-                # Read output in real-time
-                for line in self.process.stdout:
+                # Consume progress events in real-time
+                for event in self.process.events():
                     if self.cancelled:
                         break
-                    self._update_status(line)
+                    self._update_status(event)
 
                 if self.cancelled:
                     break
@@ -271,6 +277,10 @@ class ProgressView:
 
                 if returncode == 0:
                     # Success!
+                    ThroughputModel().record(
+                        self.media_file, self.output_path, self.convert_audio,
+                        time.time() - attempt_start, codec_overrides=codec_overrides
+                    )
                     attempt_label = self.current_codec_label or "copy"
                     self.codec_attempts.append(f"{attempt_label} ✔")
                     break
@@ -344,7 +354,11 @@ class ProgressView:
             self.done = True
 
     def cancel(self):
-        if self.process and self.process.poll() is None:
+        if self.process is None and not self.done:
+            # Still in the trial encodes; stop before the full run starts
+            self.cancelled = True
+            self.status = "Cancelling..."
+        elif self.process and self.process.poll() is None:
             self.cancelled = True
             try:
                 self.process.terminate()
@@ -352,89 +366,21 @@ class ProgressView:
                 pass
             self.status = "Cancelling..."
 
-    def _update_status(self, line):
-        line = line.strip()
-        if not line:
-            return
+    def _update_status(self, event):
+        self.last_event = event
+        self.percent = event.percent  # 100 is set in _run_conversion after process.wait()
+        self.actual_size_mb = event.size_mb
+        self.frame_status = event.status_line()
 
-        is_progress_internal = False
-        if "=" in line:
-            parts = line.split("=", 1)
-            if len(parts) == 2:
-                key, value = [p.strip() for p in parts]
-
-                progress_keys = (
-                    "frame",
-                    "fps",
-                    "bitrate",
-                    "total_size",
-                    "out_time_ms",
-                    "out_time_us",
-                    "out_time",
-                    "dup_frames",
-                    "drop_frames",
-                    "speed",
-                    "progress",
-                )
+    def _add_log(self, line):
+        with self.logs_lock:
+            self.logs.append(line)
+            if len(self.logs) > 500:
+                self.logs = self.logs[-500:]
 
-                if key in progress_keys or key.startswith("stream_"):
-                    is_progress_internal = True
-                    if key == "frame" and value.isdigit():
-                        current_frame = int(value)
-                        if self.total_frames > 0:
-                            frame_pct = int((current_frame / self.total_frames) * 100)
-                            if frame_pct > self.percent:
-                                self.percent = min(98, frame_pct)  # cap at 98, time-based takes priority
-                            # Derive current media time from frame for ETA.
-                            # out_time_us (below) will overwrite this with higher precision when available.
-                            if self.media_file.duration > 0:
-                                self._current_seconds = (current_frame / self.total_frames) * self.media_file.duration
-                    elif key in ("out_time_ms", "out_time_us"):
-                        try:
-                            # ffmpeg -progress outputs time in MICROSECONDS for both
-                            # out_time_ms and out_time_us (the _ms name is misleading)
-                            current_seconds = float(value) / 1_000_000.0
-                            self._current_seconds = max(0.0, current_seconds)
-                            if self.media_file.duration > 0:
-                                time_pct = int((current_seconds / self.media_file.duration) * 100)
-                                # Use time-based progress, clip to 99 until process finishes
-                                self.percent = min(99, max(self.percent, time_pct))
-                        except Exception:
-                            pass
-                    elif key == "total_size" and value.isdigit():
-                        self.actual_size_mb = int(value) / 1024 / 1024
-                        if self.estimated_size_mb > 0:
-                            size_pct = int((self.actual_size_mb / self.estimated_size_mb) * 100)
-                            if size_pct > self.percent:
-                                self.percent = min(99, size_pct)
-                            if self.media_file.duration > 0:
-                                est_sec = (self.actual_size_mb / self.estimated_size_mb) * self.media_file.duration
-                                self._current_seconds = max(self._current_seconds, est_sec)
-                    elif key == "progress" and value == "end":
-                        self.percent = 99  # signal end; 100 is set in _run_conversion after process.wait()
-
-        if line.startswith("frame="):
-            self.frame_status = line
-            if self.media_file.duration > 0 and "time=" in line:
-                try:
-                    time_str = line.split("time=")[1].split()[0]
-                    if time_str != "N/A":
-                        h, m, s = time_str.split(":")
-                        current_seconds = float(h) * 3600 + float(m) * 60 + float(s)
-                        time_pct = int((current_seconds / self.media_file.duration) * 100)
-                        if time_pct > self.percent:
-                            self.percent = min(99, time_pct)
-                            self._current_seconds = max(self._current_seconds, current_seconds)
-                except Exception:
-                    pass
-        elif not is_progress_internal:
-            with self.logs_lock:
-                for part in line.split("\r"):
-                    part = part.strip()
-                    if part:
-                        self.logs.append(part)
-                if len(self.logs) > 500:
-                    self.logs = self.logs[-500:]
+    def redraw_interval(self):
+        """Seconds between unprompted redraws: the elapsed timer runs and the finished job returns by itself."""
+        return 0.25
 
     def draw(self):
         self.app.stdscr.erase()
@@ -492,16 +438,17 @@ class ProgressView:
         elapsed = time.time() - self.start_time
         if self.done and self.end_time:
             elapsed = self.end_time - self.start_time
-        if self.percent > 0 and not self.done:
-            cur_sec = self._current_seconds
-            dur = self.media_file.duration
-            if cur_sec > 0 and elapsed > 0 and dur > 0:
-                media_speed = cur_sec / elapsed
-                remaining_media = max(0.0, dur - cur_sec)
-                if media_speed > 0:
-                    remaining_real = remaining_media / media_speed
-                    eta_str = f" ETA: {format_duration(remaining_real)} | Speed: {media_speed:.2f}x "
-                    self.app.stdscr.addstr(row, 0, eta_str.center(width), curses.color_pair(3))
+        event = self.last_event
+        if event and event.eta is not None and not self.done:
+            eta_str = (
+                f" ETA: {format_duration(event.eta)} | Speed: {event.smoothed_rate:.2f}x"
+                f" (now {event.rate:.2f}x) | {format_size(event.smoothed_byte_rate / 1024 / 1024)}/s "
+            )
+            self.app.stdscr.addstr(row, 0, eta_str.center(width)[:width - 1], curses.color_pair(3))
+        elif self.predicted_seconds and not self.done:
+            remaining = max(0.0, self.predicted_seconds - elapsed)
+            eta_str = f" ETA: ~{format_duration(remaining)} (from past jobs) "
+            self.app.stdscr.addstr(row, 0, eta_str.center(width)[:width - 1], curses.color_pair(3))
         row += 1
 
         # Status line
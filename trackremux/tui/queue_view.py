@@ -1,7 +1,12 @@
 import curses
 import os
+import time
 from .constants import KEY_ESC, KEY_Q_LOWER, KEY_Q_UPPER, KEY_ENTER, FILE_LIST_Y_OFFSET
+from .formatters import format_duration
+from .progress import resolve_output_path
+from ..core.background import background
 from ..core.queue import QueueManager
+from ..core.resources import ResourceUsage, operation_totals
 
 class QueueView:
     def __init__(self, app, back_view):
@@ -12,6 +17,9 @@ class QueueView:
         self.tasks = []
         self.selected_idx = 0
         self.scroll_idx = 0
+        # task id -> predicted seconds (None when unknown); rebuilt when history grows
+        self._forecasts = {}
+        self._forecast_samples = -1
         self._refresh_tasks()
 
     def _refresh_tasks(self):
@@ -21,6 +29,89 @@ class QueueView:
         if self.selected_idx >= len(self.tasks) and len(self.tasks) > 0:
             self.selected_idx = len(self.tasks) - 1
 
+    def _list_height(self):
+        return self.app.stdscr.getmaxyx()[0] - 8
+
+    def _draw_details(self, y, width):
+        """Resource usage of the selected task and of recent operations per kind."""
+        lines = []
+        if self.tasks and self.selected_idx < len(self.tasks):
+            task = self.tasks[self.selected_idx]
+            if task.resources:
+                usage = ResourceUsage.from_dict(task.resources)
+                runs = f" ({usage.runs} runs)" if usage.runs > 1 else ""
+                lines.append(f" Task resources{runs}: {usage.summary()} ")
+            else:
+                lines.append(" Task resources: not recorded yet ")
+        totals = operation_totals()
+        if totals:
+            parts = []
+            for kind in ("convert", "probe", "envelope", "snippet", "concat"):
+                if kind in totals:
+                    u = totals[kind]
+                    parts.append(f"{kind} {u.runs}x {u.wall_seconds / u.runs:.1f}s {u.bottleneck()}")
+            lines.append(" Session: " + " | ".join(parts) + " ")
+        bg = background.stats()
+        if bg["submitted"]:
+            bg_line = (f" Background jobs: {bg['running']} running, {bg['pending']} queued"
+                       f" (peak {bg['peak_pending']}), {bg['completed']} done")
+            if bg["cancelled"] or bg["dropped"]:
+                bg_line += f", {bg['cancelled']} cancelled, {bg['dropped']} dropped"
+            if bg["deduplicated"]:
+                bg_line += f", {bg['deduplicated']} duplicates skipped"
+            lines.append(bg_line + " ")
+        if len(lines) > 2:
+            # Background line shares the session line when both are shown
+            lines[1:] = [lines[1] + "|" + lines[2]]
+        for i, line in enumerate(lines[:2]):
+            self.app.stdscr.addstr(y + i, 0, line[:width - 1], curses.A_DIM)
+
+    def _predicted_seconds(self, task):
+        model = self.worker.throughput
+        samples = model.sample_count
+        if samples != self._forecast_samples:
+            self._forecasts = {}
+            self._forecast_samples = samples
+        if task.id not in self._forecasts:
+            try:
+                media_file = task.get_media_file()
+                output_path = resolve_output_path(media_file, task.get_output_mode())
+                self._forecasts[task.id] = model.predict_seconds(media_file, output_path, task.convert_audio)
+            except Exception:
+                self._forecasts[task.id] = None
+        return self._forecasts[task.id]
+
+    def _remaining_seconds(self, task):
+        """Remaining wall time of a task: live ETA while running, history-based otherwise."""
+        if task.status == "running" and self.worker.current_task and self.worker.current_task.id == task.id:
+            event = self.worker.last_event
+            if event and event.eta is not None:
+                return event.eta
+            predicted = self._predicted_seconds(task)
+            if predicted is not None and event:
+                return max(0.0, predicted - event.elapsed)
+            return predicted
+        return self._predicted_seconds(task)
+
+    def _queue_forecast(self):
+        """(total remaining seconds, tasks counted, tasks without a prediction)."""
+        total = 0.0
+        counted = unknown = 0
+        for task in self.tasks:
+            if task.status not in ("pending", "running"):
+                continue
+            remaining = self._remaining_seconds(task)
+            if remaining is None:
+                unknown += 1
+            else:
+                total += remaining
+                counted += 1
+        return total, counted, unknown
+
+    def redraw_interval(self):
+        """Seconds between unprompted redraws: live stats while a task runs, back-off countdowns otherwise."""
+        return 0.5 if self.worker.current_task else 1.0
+
     def draw(self):
         self.app.stdscr.erase()
         height, width = self.app.stdscr.getmaxyx()
@@ -53,8 +144,16 @@ class QueueView:
                 bar = "[" + "=" * filled + " " * (bar_width - filled) + "]"
                 self.app.stdscr.addstr(2, 25, f" {bar} {pct}% ", curses.color_pair(3))
 
-        # List
-        list_height = height - 6
+            event = self.worker.last_event
+            if event:
+                eta = f"ETA {format_duration(event.eta)} | " if event.eta is not None else ""
+                info = f" {eta}{event.smoothed_rate:.2f}x | {event.status_line()} "
+            else:
+                info = f" {self.worker.status_line} "
+            self.app.stdscr.addstr(3, 1, info[:width - 2], curses.A_DIM)
+
+        # List (rows below it: two task-detail lines, the forecast and the footer)
+        list_height = self._list_height()
         if list_height > 0:
             if not self.tasks:
                 self.app.stdscr.addstr(4, 2, "Queue is empty.", curses.A_DIM)
@@ -72,6 +171,10 @@ class QueueView:
                         my_pid = os.getpid()
                         if task.owner_pid and task.owner_pid != my_pid:
                             owner_str = f" [PID:{task.owner_pid}]"
+                        if task.stall_count:
+                            owner_str += f" [stalled x{task.stall_count}]"
+                        if task.status == "pending" and task.retry_at and task.retry_at > time.time():
+                            owner_str += f" [retry in {format_duration(task.retry_at - time.time())}]"
                         
                         # Generate stats
                         try:
@@ -90,6 +193,10 @@ class QueueView:
                             cond = "AC3" if task.convert_audio else "RAW"
                             
                             stats = f"[{mode}|{cond}] v:{kept_v} a:{kept_a}({lang_str}) s:{kept_s}"
+                            if task.status in ("pending", "running"):
+                                remaining = self._remaining_seconds(task)
+                                if remaining is not None:
+                                    stats = f"~{format_duration(remaining)} {stats}"
                         except Exception:
                             stats = ""
                         
@@ -128,6 +235,21 @@ class QueueView:
                             if len(line.split(" [")[0]) + len(err) < width:  # Try to fit before stats
                                 self.app.stdscr.addstr(y, width - stats_len - len(err) - 2, err, curses.color_pair(4))
 
+        if height > 10:
+            self._draw_details(height - 4, width)
+
+        # Whole-queue completion forecast
+        total, counted, unknown = self._queue_forecast()
+        if counted or unknown:
+            if counted:
+                done_at = time.strftime("%H:%M", time.localtime(time.time() + total))
+                forecast = f" Queue forecast: {format_duration(total)} for {counted} task(s), done ~{done_at} "
+            else:
+                forecast = " Queue forecast: no history yet "
+            if unknown and counted:
+                forecast += f"| {unknown} task(s) without history "
+            self.app.stdscr.addstr(height - 2, 0, forecast[:width - 1], curses.color_pair(2))
+
         # Footer
         footer = " [SPACE] Pause/Resume Queue | [D] Delete | [C] Clear Completed | [UP/DOWN] Select | [Q/ESC] Back "
         self.app.stdscr.addstr(height - 1, 0, footer.center(width)[:width-1], curses.color_pair(3))
@@ -144,15 +266,15 @@ class QueueView:
         elif key == curses.KEY_DOWN:
             if self.selected_idx < len(self.tasks) - 1:
                 self.selected_idx += 1
-                list_height = self.app.stdscr.getmaxyx()[0] - 6
+                list_height = self._list_height()
                 if self.selected_idx >= self.scroll_idx + list_height:
                     self.scroll_idx += 1
         elif key == curses.KEY_PPAGE:
-            list_height = self.app.stdscr.getmaxyx()[0] - 6
+            list_height = self._list_height()
             self.selected_idx = max(0, self.selected_idx - list_height)
             self.scroll_idx = max(0, self.scroll_idx - list_height)
         elif key == curses.KEY_NPAGE:
-            list_height = self.app.stdscr.getmaxyx()[0] - 6
+            list_height = self._list_height()
             self.selected_idx = min(len(self.tasks) - 1, self.selected_idx + list_height)
             self.scroll_idx = min(max(0, len(self.tasks) - list_height), self.scroll_idx + list_height)
         elif key == ord(' '):
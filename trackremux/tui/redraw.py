@@ -0,0 +1,104 @@
+"""
+Event-driven redraw scheduling for the main loop.
+
+The loop used to redraw the current view after every getch(), including a
+timeout every APP_TIMEOUT_MS, so an idle session kept repainting the whole
+screen five times a second. Now the loop sleeps in select() on stdin and a
+self-pipe, and a frame is drawn only when something asked for it:
+
+- input was handled (the view may have changed),
+- a background thread called request() (a probe finished, ffmpeg progress),
+- the terminal was resized,
+- the view's own redraw_interval() elapsed (spinners, running timers).
+
+Views without time-dependent content return None from redraw_interval(), so
+an idle screen costs nothing until a key or a wakeup arrives. Wakeups are
+coalesced (one byte in the pipe at most) and frames are capped at MAX_FPS.
+"""
+
+import os
+import select
+import threading
+import time
+from typing import Optional
+
+MAX_FPS = 30
+
+
+class RedrawScheduler:
+    """Dirty flag plus a self-pipe that lets any thread wake the input loop."""
+
+    def __init__(self, input_fd: int):
+        self.input_fd = input_fd
+        self._rfd, self._wfd = os.pipe()
+        os.set_blocking(self._rfd, False)
+        os.set_blocking(self._wfd, False)
+        self._lock = threading.Lock()
+        self._dirty = True
+        self._posted = False      # a wakeup byte is in the pipe
+        self.resized = False
+        self.last_frame = 0.0
+
+    def request(self) -> None:
+        """Ask for a redraw; safe from any thread."""
+        self._dirty = True
+        with self._lock:
+            if self._posted:
+                return
+            self._posted = True
+        try:
+            os.write(self._wfd, b"\0")
+        except OSError:
+            pass  # pipe full: a wakeup is pending anyway
+
+    def on_resize(self, *_args) -> None:
+        """SIGWINCH handler."""
+        self.resized = True
+        self._dirty = True
+        try:
+            os.write(self._wfd, b"\0")
+        except OSError:
+            pass
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def take_frame(self) -> bool:
+        """True when a frame should be drawn now (clears the flag and stamps the frame time)."""
+        if not self._dirty or time.monotonic() - self.last_frame < 1.0 / MAX_FPS:
+            return False
+        self._dirty = False
+        self.last_frame = time.monotonic()
+        return True
+
+    def wait(self, interval: Optional[float]) -> tuple[bool, bool]:
+        """
+        Sleep until input, a wakeup or interval seconds (None: no limit).
+        Returns (input_ready, woken); both False means the interval elapsed.
+        A pending frame held back by the frame cap shortens the wait.
+        """
+        timeout = interval
+        if self._dirty:
+            remaining = max(0.0, 1.0 / MAX_FPS - (time.monotonic() - self.last_frame))
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        try:
+            ready, _, _ = select.select([self.input_fd, self._rfd], [], [], timeout)
+        except (OSError, ValueError):
+            ready = [self.input_fd]  # let getch() find out
+        woken = self._rfd in ready
+        if woken:
+            with self._lock:
+                try:
+                    while os.read(self._rfd, 512):
+                        pass
+                except OSError:
+                    pass
+                self._posted = False
+        return self.input_fd in ready, woken
+
+    def close(self) -> None:
+        for fd in (self._rfd, self._wfd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
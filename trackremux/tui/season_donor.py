@@ -0,0 +1,292 @@
+import curses
+import os
+import threading
+import time
+
+from ..core.season_donor import SeasonDonorAlignment, attach_donor_tracks, find_releases
+from .constants import (
+    KEY_ENTER,
+    KEY_ESC,
+    KEY_Q_LOWER,
+    KEY_Q_UPPER,
+    KEY_R_LOWER,
+    KEY_R_UPPER,
+    KEY_S_LOWER,
+    KEY_S_UPPER,
+    KEY_SPACE,
+    KEY_T_LOWER,
+    KEY_T_UPPER,
+)
+
+FLAG_LABELS = {
+    "outlier": "⚠ offset",
+    "tempo": "⚠ tempo",
+    "low": "⚠ low",
+    "failed": "✗ failed",
+}
+
+
+class SeasonDonorView:
+    """
+    Batch donor import: pairs every episode of the editor's batch with the same
+    episode of a donor release, aligns them all concurrently and queues the
+    hybrid remuxes (episode tracks per the editor template + chosen donor tracks).
+    """
+
+    def __init__(self, app, editor, releases, audio_ordinal: int):
+        self.app = app
+        self.editor = editor
+        self.back_view = editor
+        self.releases = releases
+        self.release_idx = 0
+        self.audio_ordinal = audio_ordinal
+        self.selected_idx = 0
+        self.scroll_idx = 0
+        self.status_message = ""
+        self.job = None
+        # Donor track picker (audio ordinals of the donor release)
+        self.showing_track_picker = False
+        self.track_cursor = 0
+        self.donor_ordinals: set[int] = set()
+        self._start_alignment()
+
+    @classmethod
+    def open(cls, app, editor):
+        """Build the view for the editor's batch, or return None with a status message set."""
+        cache = getattr(app, "donor_cache", None)
+        if cache is None:
+            editor.status_message = " Donor cache not available. "
+            return None
+        releases = find_releases(editor.batch_group, cache)
+        if not releases:
+            editor.status_message = " No donor release with matching episodes found in the library. "
+            return None
+        audio = [t for t in editor.media_file.tracks if t.codec_type == "audio"]
+        selected = editor.media_file.tracks[editor.selected_idx]
+        ordinal = audio.index(selected) if selected in audio else 0
+        return cls(app, editor, releases, ordinal)
+
+    @property
+    def release(self):
+        return self.releases[self.release_idx]
+
+    def _start_alignment(self):
+        if self.job and self.job.running:
+            self.job.cancel()
+        self.donor_ordinals = set()
+        self.job = SeasonDonorAlignment(self.release, self.audio_ordinal, workers=self.app.config.donor_workers)
+        threading.Thread(target=self.job.run, daemon=True).start()
+
+    def _donor_audio_tracks(self):
+        """Audio tracks of the first aligned donor episode (the release's track layout)."""
+        for pair in self.release.pairs:
+            if pair.donor_media is not None:
+                return [t for t in pair.donor_media.tracks if t.codec_type == "audio"]
+        return []
+
+    # ------------------------------------------------------------------ #
+    # Drawing                                                              #
+    # ------------------------------------------------------------------ #
+
+    def redraw_interval(self):
+        """Seconds between unprompted redraws (spinner and results while aligning)."""
+        return 0.25 if self.job and self.job.running else None
+
+    def draw(self):
+        self.app.stdscr.erase()
+        height, width = self.app.stdscr.getmaxyx()
+
+        title = f" Season Donor Import: {self.editor.batch_group.name} "
+        self.app.stdscr.attron(curses.color_pair(1) | curses.A_BOLD)
+        self.app.stdscr.addstr(0, 0, " " * width)
+        self.app.stdscr.addstr(0, max(0, (width - len(title)) // 2), title[:width])
+        self.app.stdscr.attroff(curses.color_pair(1) | curses.A_BOLD)
+
+        release_line = f" Donor release ({self.release_idx + 1}/{len(self.releases)}): {self.release.name} "
+        release_line += f"— {len(self.release.pairs)}/{self.editor.batch_group.count} episodes paired"
+        self.app.stdscr.addstr(1, 0, release_line[: width - 1], curses.A_BOLD)
+
+        job = self.job
+        if job and job.running:
+            spin = ["|", "/", "-", "\\"][int(time.time() * 4) % 4]
+            elapsed = time.monotonic() - job.started
+            progress = f" {spin} Aligning {job.done}/{job.total} on {job.workers} workers… {elapsed:.0f}s"
+            self.app.stdscr.addstr(2, 0, progress[: width - 1], curses.color_pair(5))
+        else:
+            flagged = sum(1 for p in self.release.pairs if p.flag)
+            summary = f" Aligned {job.done if job else 0}/{len(self.release.pairs)}"
+            if flagged:
+                summary += f" — {flagged} flagged"
+            self.app.stdscr.addstr(2, 0, summary[: width - 1], curses.color_pair(2))
+
+        header = f"   {'Ep':<7} {'Offset':>9} {'Conf':>5} {'Tempo':>7} {'Time':>6}  {'Flag':<9} Episode → Donor"
+        self.app.stdscr.addstr(4, 0, header[: width - 1], curses.A_UNDERLINE)
+
+        list_h = height - 8
+        pairs = self.release.pairs
+        if self.selected_idx < self.scroll_idx:
+            self.scroll_idx = self.selected_idx
+        elif self.selected_idx >= self.scroll_idx + list_h:
+            self.scroll_idx = self.selected_idx - list_h + 1
+
+        for row in range(list_h):
+            i = self.scroll_idx + row
+            if i >= len(pairs):
+                break
+            pair = pairs[i]
+            season, episode = pair.episode
+            ep = f"S{season:02d}E{episode:02d}" if season else f"E{episode:02d}"
+            if pair.alignment is not None:
+                a = pair.alignment
+                offset = f"{a.offset:+.2f}s"
+                conf = f"{int(a.confidence * 100)}%"
+                tempo = f"×{a.tempo_ratio:.3f}" if a.tempo_ratio != 1.0 else "—"
+            else:
+                offset = conf = tempo = "…" if not pair.error else "—"
+            secs = f"{pair.seconds:.1f}s" if pair.seconds is not None else ""
+            flag = FLAG_LABELS.get(pair.flag, "")
+            mark = "[x]" if pair.included and pair.flag not in ("failed", "low") else "[ ]"
+            names = f"{pair.target.filename} → {os.path.basename(pair.donor_path)}"
+            line = f"{mark}{ep:<7} {offset:>9} {conf:>5} {tempo:>7} {secs:>6}  {flag:<9} {names}"
+
+            if i == self.selected_idx:
+                attr = curses.color_pair(5)
+            elif pair.flag in ("failed", "low"):
+                attr = curses.color_pair(4)
+            elif pair.flag:
+                attr = curses.color_pair(3)
+            else:
+                attr = curses.A_NORMAL
+            self.app.stdscr.addstr(5 + row, 0, line[: width - 1], attr)
+
+        if self.status_message:
+            self.app.stdscr.addstr(height - 2, 0, self.status_message[: width - 1], curses.color_pair(3))
+
+        chosen = len(self.donor_ordinals)
+        footer = (
+            f" [SPACE] Include/Exclude  [T] Donor tracks ({chosen})  [←→] Release  "
+            f"[R] Re-align  [S] Queue all  [Q/ESC] Back "
+        )
+        self.app.stdscr.addstr(height - 1, 0, footer.center(width)[: width - 1], curses.color_pair(3))
+
+        if self.showing_track_picker:
+            self._draw_track_picker(height, width)
+
+        self.app.stdscr.refresh()
+
+    def _draw_track_picker(self, height, width):
+        tracks = self._donor_audio_tracks()
+        mw = min(width - 4, 70)
+        mh = max(len(tracks), 1) + 4
+        my = max(0, (height - mh) // 2)
+        mx = max(0, (width - mw) // 2)
+        for r in range(mh):
+            self.app.stdscr.addstr(my + r, mx, " " * mw, curses.color_pair(3))
+        title = "─── Donor tracks to import (all episodes) "
+        title += "─" * max(0, mw - len(title) - 2)
+        self.app.stdscr.addstr(my, mx + 1, title[: mw - 2], curses.color_pair(3) | curses.A_BOLD)
+        if not tracks:
+            self.app.stdscr.addstr(my + 2, mx, "  Waiting for the first donor to be analyzed…"[:mw], curses.color_pair(3))
+        for i, t in enumerate(tracks):
+            check = "[x]" if i in self.donor_ordinals else "[ ]"
+            lang = t.language or "und"
+            ch = f"{t.channels}ch" if t.channels else ""
+            title_tag = t.tags.get("title", "")
+            line = f"  {check} {lang:<4} {t.codec_name:<7} {ch:<5} {title_tag}"
+            attr = curses.color_pair(5) if i == self.track_cursor else curses.color_pair(3)
+            self.app.stdscr.addstr(my + 2 + i, mx, line[:mw], attr)
+        self.app.stdscr.addstr(my + mh - 1, mx, "  [SPACE] Toggle  [ENTER/ESC] Done"[:mw], curses.A_DIM)
+
+    # ------------------------------------------------------------------ #
+    # Input                                                                #
+    # ------------------------------------------------------------------ #
+
+    def handle_input(self, key):
+        if self.showing_track_picker:
+            tracks = self._donor_audio_tracks()
+            if key in (KEY_ENTER, KEY_ESC, KEY_Q_LOWER, KEY_Q_UPPER):
+                self.showing_track_picker = False
+            elif key == curses.KEY_UP and self.track_cursor > 0:
+                self.track_cursor -= 1
+            elif key == curses.KEY_DOWN and self.track_cursor < len(tracks) - 1:
+                self.track_cursor += 1
+            elif key == KEY_SPACE and tracks:
+                self.donor_ordinals ^= {self.track_cursor}
+            return
+
+        pairs = self.release.pairs
+        if key in (KEY_ESC, KEY_Q_LOWER, KEY_Q_UPPER):
+            if self.job:
+                self.job.cancel()
+            self.app.switch_view(self.back_view)
+        elif key == curses.KEY_UP and self.selected_idx > 0:
+            self.selected_idx -= 1
+        elif key == curses.KEY_DOWN and self.selected_idx < len(pairs) - 1:
+            self.selected_idx += 1
+        elif key in (curses.KEY_LEFT, curses.KEY_RIGHT) and len(self.releases) > 1:
+            step = 1 if key == curses.KEY_RIGHT else -1
+            self.release_idx = (self.release_idx + step) % len(self.releases)
+            self.selected_idx = 0
+            self.scroll_idx = 0
+            self._start_alignment()
+        elif key == KEY_SPACE and pairs:
+            pair = pairs[self.selected_idx]
+            if pair.flag == "low":
+                if pair.alignment is not None:
+                    # A low-confidence pair is forced in by hand
+                    pair.forced = True
+                    pair.flag = ""
+                    pair.included = True
+            else:
+                pair.included = not pair.included
+        elif key in (KEY_T_LOWER, KEY_T_UPPER):
+            self.track_cursor = 0
+            self.showing_track_picker = True
+        elif key in (KEY_R_LOWER, KEY_R_UPPER):
+            if self.job and self.job.running:
+                return
+            for pair in pairs:
+                pair.alignment = None
+                pair.error = ""
+                pair.seconds = None
+                pair.flag = ""
+                pair.included = True
+                pair.forced = False
+            self._start_alignment()
+        elif key in (KEY_S_LOWER, KEY_S_UPPER):
+            self._queue_all()
+
+    def _queue_all(self):
+        """Queue one hybrid remux per included, aligned episode."""
+        if self.job and self.job.running:
+            self.status_message = " Alignment still running. "
+            return
+        if not self.donor_ordinals:
+            self.status_message = " Choose donor tracks first with [T]. "
+            return
+
+        self.editor.commit_changes()
+        qm = self.app.queue_manager
+        ordinals = sorted(self.donor_ordinals)
+        queued = skipped = 0
+        for pair in self.release.pairs:
+            if not pair.included or pair.alignment is None or pair.flag in ("failed", "low"):
+                skipped += 1
+                continue
+            if qm.has_pending_task(pair.target.path):
+                skipped += 1
+                continue
+            media = self.editor._apply_template(pair.target)
+            if attach_donor_tracks(media, pair, ordinals) == 0:
+                skipped += 1
+                continue
+            qm.add_task(media, self.app.settings.output_mode, self.app.settings.convert_audio)
+            queued += 1
+
+        if not queued:
+            self.status_message = " Nothing queued (no included, aligned episodes). "
+            return
+        if hasattr(self.app, "queue_worker") and not self.app.queue_worker.is_running():
+            self.app.queue_worker.start()
+        self.editor.status_message = f" Queued {queued} hybrid remux(es), skipped {skipped}. "
+        self.app.switch_view(self.back_view)
@@ -0,0 +1,77 @@
+"""
+Incrementally maintained sort order for the Explorer's file list.
+
+Re-sorting a directory of thousands of files on every redraw (and recomputing
+track counts or audio sizes inside the sort key) makes browsing stutter. The
+index keeps (key, name) pairs sorted and moves a single entry with bisect when
+its metadata changes; only a change of sort mode, direction or filter rebuilds it.
+"""
+
+import bisect
+from typing import Callable, Iterable, Optional
+
+
+class SortedFileIndex:
+    """
+    Names kept in sort order under a key function and an optional filter.
+    Not thread-safe: callers serialize access (the Explorer holds metadata_lock).
+
+    names is the display order (reversed when descending) and is updated in place;
+    version changes whenever it does, so callers can cache derived lists.
+    """
+
+    def __init__(self):
+        self.key_fn: Callable[[str], tuple] = lambda name: (name,)
+        self.filter_fn: Optional[Callable[[str], bool]] = None
+        self.descending = False
+        self.names: list[str] = []
+        self.version = 0
+        self._entries: list[tuple] = []       # ascending (key, name)
+        self._keys: dict[str, tuple] = {}     # name -> key of its entry, for names that are listed
+
+    def rebuild(self, names: Iterable[str], key_fn: Callable[[str], tuple],
+                filter_fn: Optional[Callable[[str], bool]] = None, descending: bool = False) -> None:
+        """Sort everything from scratch (new listing, sort mode, direction or filter)."""
+        self.key_fn = key_fn
+        self.filter_fn = filter_fn
+        self.descending = descending
+        self._keys = {n: key_fn(n) for n in names if filter_fn is None or filter_fn(n)}
+        self._entries = sorted((k, n) for n, k in self._keys.items())
+        self.names = [n for _, n in self._entries]
+        if descending:
+            self.names.reverse()
+        self.version += 1
+
+    def _position(self, pos: int) -> int:
+        """Position in names of the entry at pos in _entries."""
+        return len(self._entries) - 1 - pos if self.descending else pos
+
+    def _detach(self, name: str) -> None:
+        key = self._keys.pop(name, None)
+        if key is None:
+            return
+        pos = bisect.bisect_left(self._entries, (key, name))
+        del self.names[self._position(pos)]
+        del self._entries[pos]
+
+    def update(self, name: str) -> None:
+        """Re-place one name after its metadata changed (adds it when new)."""
+        listed = self.filter_fn is None or self.filter_fn(name)
+        key = self.key_fn(name) if listed else None
+        if self._keys.get(name) == key:
+            return  # unchanged (or still filtered out)
+        self._detach(name)
+        if key is not None:
+            pos = bisect.bisect_left(self._entries, (key, name))
+            self._entries.insert(pos, (key, name))
+            self._keys[name] = key
+            self.names.insert(self._position(pos), name)
+        self.version += 1
+
+    def remove(self, name: str) -> None:
+        if name in self._keys:
+            self._detach(name)
+            self.version += 1
+
+    def __len__(self) -> int:
+        return len(self.names)